@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark: orders per second, sync OrderManager vs AsyncOrderManager
+Both mocks simulate the same network round trip
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot.async_client import AsyncMockBinanceClient, AsyncOrderManager  # noqa: E402
+from bot.client import MockBinanceClient  # noqa: E402
+from bot.orders import OrderManager  # noqa: E402
+
+NUM_ORDERS = 200
+LATENCY = 0.02
+
+
+def run_sync():
+    mgr = OrderManager(MockBinanceClient(latency=LATENCY))
+    start = time.perf_counter()
+    for _ in range(NUM_ORDERS):
+        mgr.place_market_order('BTCUSDT', 'BUY', 0.001)
+    return time.perf_counter() - start
+
+
+def run_async(max_in_flight):
+    async def go():
+        mgr = AsyncOrderManager(AsyncMockBinanceClient(latency=LATENCY), max_in_flight=max_in_flight)
+        start = time.perf_counter()
+        await asyncio.gather(*(mgr.place_market_order('BTCUSDT', 'BUY', 0.001) for _ in range(NUM_ORDERS)))
+        return time.perf_counter() - start
+    return asyncio.run(go())
+
+
+def main():
+    logging.disable(logging.INFO)
+    print(f"{NUM_ORDERS} orders, {LATENCY * 1000:.0f} ms simulated round trip")
+    elapsed = run_sync()
+    print(f"sync:                    {elapsed:.3f}s  {NUM_ORDERS / elapsed:>8.0f} orders/s")
+    for limit in (10, 50, 200):
+        elapsed = run_async(limit)
+        print(f"async max_in_flight={limit:<4} {elapsed:.3f}s  {NUM_ORDERS / elapsed:>8.0f} orders/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: backtests over years of 1m bars
+Writes a synthetic random-walk history into a temporary KlineStore, then
+times one moving-average backtest and a parameter sweep run in-process
+against the same sweep on a process pool
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot.backtest import Backtest, MovingAverageCross, parameter_grid, sweep  # noqa: E402
+from bot.history import COLUMNS, KlineStore  # noqa: E402
+
+YEARS = 2
+BARS = YEARS * 365 * 1440
+START = 1577836800000
+GRID = {'fast': [10, 30, 60, 120], 'slow': [240, 720]}
+
+
+def synthetic_columns(bars, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.0008, bars)))
+    open_ = np.concatenate([[30000.0], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.0005, bars)) * close
+    volume = rng.gamma(2.0, 5.0, bars)
+    columns = {name: np.zeros(bars, dtype) for name, (dtype, _) in COLUMNS.items()}
+    columns.update(open_time=START + 60000 * np.arange(bars, dtype=np.int64), open=open_, close=close,
+                   high=np.maximum(open_, close) + spread, low=np.minimum(open_, close) - spread,
+                   volume=volume, quote_volume=volume * close)
+    return columns
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        store = KlineStore(root)
+        start = time.perf_counter()
+        store.write('BTCUSDT', '1m', synthetic_columns(BARS))
+        print(f"{BARS:,} 1m bars ({YEARS} years) written in {time.perf_counter() - start:.2f}s")
+
+        klines = store.load('BTCUSDT', '1m')
+        start = time.perf_counter()
+        result = Backtest(klines, 'BTCUSDT').run(MovingAverageCross(fast=30, slow=720))
+        elapsed = time.perf_counter() - start
+        print(f"single backtest: {elapsed:.2f}s ({BARS / elapsed / 1e6:.1f}M bars/s), {result.trades} fills, "
+              f"pnl {result.pnl:,.0f}")
+
+        runs = len(parameter_grid(GRID))
+        for workers in (1, os.cpu_count()):
+            start = time.perf_counter()
+            sweep(MovingAverageCross, GRID, root, 'BTCUSDT', '1m', max_workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"sweep of {runs} on {workers} process{'es' if workers != 1 else ''}: {elapsed:.2f}s "
+                  f"({runs * BARS / elapsed / 1e6:.1f}M bars/s)")
+
+
+if __name__ == '__main__':
+    main()
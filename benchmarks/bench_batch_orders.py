@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Benchmark: laddering limit orders one by one vs OrderManager.place_orders
+MockBinanceClient simulates the network round trip with a fixed latency
+"""
+
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot.client import MockBinanceClient  # noqa: E402
+from bot.orders import OrderManager  # noqa: E402
+
+NUM_ORDERS = 50
+LATENCY = 0.02
+
+
+def main():
+    logging.disable(logging.INFO)
+    order_mgr = OrderManager(MockBinanceClient(latency=LATENCY))
+    specs = [{'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT', 'quantity': 0.001, 'price': 90000 - i * 10}
+             for i in range(NUM_ORDERS)]
+
+    start = time.perf_counter()
+    for spec in specs:
+        order_mgr.place_limit_order(spec['symbol'], spec['side'], spec['quantity'], spec['price'])
+    sequential = time.perf_counter() - start
+
+    print(f"{NUM_ORDERS} orders, {LATENCY * 1000:.0f} ms simulated round trip")
+    print(f"sequential place_limit_order: {sequential:.3f}s  ({NUM_ORDERS / sequential:.0f} orders/s)")
+    for workers in (1, 4, 10):
+        start = time.perf_counter()
+        order_mgr.place_orders(specs, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"place_orders workers={workers:<2}:     {elapsed:.3f}s  ({NUM_ORDERS / elapsed:.0f} orders/s)")
+
+
+if __name__ == '__main__':
+    main()
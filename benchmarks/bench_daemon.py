@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: end-to-end latency per order, cold CLI runs vs the order daemon
+All runs use --dry-run so only process startup and the local order path are measured
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from bot.daemon import DaemonClient, is_running  # noqa: E402
+
+RUNS = 10
+ORDER = ['--symbol', 'BTCUSDT', '--side', 'BUY', '--type', 'MARKET', '--quantity', '0.001']
+
+
+def timed_runs(cmd, runs, cwd):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def report(label, times):
+    times = sorted(times)
+    print(f"{label:<34} median {times[len(times) // 2] * 1000:8.2f} ms   min {times[0] * 1000:8.2f} ms")
+
+
+def main():
+    cli = os.path.join(ROOT, 'cli.py')
+    with tempfile.TemporaryDirectory() as tmp:
+        report('cold: cli.py --dry-run', timed_runs([sys.executable, cli] + ORDER + ['--dry-run'], RUNS, tmp))
+
+        path = os.path.join(tmp, 'bot.sock')
+        server = subprocess.Popen([sys.executable, cli, 'serve', '--dry-run', '--socket', path],
+                                  cwd=tmp, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.time() + 30
+            while not is_running(path):
+                if time.time() > deadline:
+                    raise RuntimeError("daemon did not start")
+                time.sleep(0.05)
+
+            report('daemon: cli.py submit', timed_runs([sys.executable, cli, 'submit', '--socket', path] + ORDER,
+                                                       RUNS, tmp))
+
+            times = []
+            with DaemonClient(path) as client:
+                for _ in range(RUNS * 100):
+                    start = time.perf_counter()
+                    client.submit('BTCUSDT', 'BUY', 'MARKET', 0.001)
+                    times.append(time.perf_counter() - start)
+            report('daemon: in-process DaemonClient', times)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark: portfolio execution across accounts and symbols
+Each account is a MockBinanceClient with a 5 ms round trip; compares one
+order at a time (the old shell-loop way) with the parallel engine
+"""
+
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot.client import MockBinanceClient  # noqa: E402
+from bot.engine import ExecutionEngine  # noqa: E402
+from bot.orders import OrderManager  # noqa: E402
+
+ACCOUNTS = 24
+SYMBOLS = ('BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT')
+ORDERS_PER_LANE = 5
+LATENCY = 0.005
+
+
+def make_accounts():
+    return {f"sub{n:02d}": OrderManager(MockBinanceClient(latency=LATENCY)) for n in range(ACCOUNTS)}
+
+
+def make_intents():
+    return [{'account': f"sub{n:02d}", 'symbol': symbol, 'side': 'BUY', 'type': 'LIMIT',
+             'quantity': 0.01, 'price': 1000 + i}
+            for i in range(ORDERS_PER_LANE) for n in range(ACCOUNTS) for symbol in SYMBOLS]
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    intents = make_intents()
+    print(f"{len(intents)} orders, {ACCOUNTS} accounts x {len(SYMBOLS)} symbols, {LATENCY * 1000:.0f} ms round trip\n")
+
+    accounts = make_accounts()
+    start = time.perf_counter()
+    for intent in intents:
+        accounts[intent['account']].place_limit_order(intent['symbol'], intent['side'], intent['quantity'],
+                                                      intent['price'])
+    sequential = time.perf_counter() - start
+    print(f"{'sequential':<14} {sequential:7.2f}s  {len(intents) / sequential:8.0f} orders/s")
+
+    for workers in (8, 32, 96):
+        report = ExecutionEngine(make_accounts(), max_workers=workers).run(intents)
+        print(f"{f'{workers} workers':<14} {report['seconds']:7.2f}s  {report['orders_per_second']:8.0f} orders/s  "
+              f"({sequential / report['seconds']:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark: symbol lookups with and without the exchange info cache
+Uses MockBinanceClient with a 300-symbol payload, so no network is involved
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot.client import MockBinanceClient  # noqa: E402
+
+
+def uncached_lookup(client, symbol):
+    # what get_symbol_info used to do: full download + linear scan per call
+    info = client.futures_exchange_info()
+    for s in info['symbols']:
+        if s['symbol'] == symbol:
+            return s
+    return None
+
+
+def bench(label, func, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {iterations:>8} lookups  {elapsed * 1e6 / iterations:>10.2f} us/lookup")
+    return elapsed
+
+
+def main():
+    client = MockBinanceClient(num_symbols=300)
+    symbols = [f"C{i:03d}USDT" for i in range(300)]
+
+    slow = bench('uncached (fetch + scan)', lambda i: uncached_lookup(client, symbols[i % 300]), 500)
+    fast = bench('cached (dict index)', lambda i: client.get_symbol_info(symbols[i % 300]), 500000)
+
+    print(f"speedup: {(slow / 500) / (fast / 500000):.0f}x")
+    print(f"cache stats: {client.exchange_info.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: order journal write throughput and recovery time
+Appends submit + response pairs with different commit batch sizes, then
+replays a journal of 1M records
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot.journal import OrderJournal  # noqa: E402
+
+WRITE_RECORDS = 20000
+RECOVERY_RECORDS = 1000000
+
+PARAMS = {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT', 'timeInForce': 'GTC',
+          'quantity': '0.001', 'price': '30000.1'}
+
+
+def response(order_id):
+    return {'orderId': order_id, 'clientOrderId': f"c-{order_id}", 'symbol': 'BTCUSDT', 'side': 'BUY',
+            'type': 'LIMIT', 'status': 'NEW', 'origQty': '0.001', 'executedQty': '0', 'price': '30000.1'}
+
+
+def write(path, records, batch_size):
+    journal = OrderJournal(path, batch_size=batch_size, flush_interval=0)
+    start = time.perf_counter()
+    for i in range(records // 2):
+        ref = journal.record_submission(PARAMS)
+        journal.record_response(ref, response(i))
+    journal.close()
+    return time.perf_counter() - start
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    try:
+        print(f"Write throughput ({WRITE_RECORDS} records, fsync per commit)")
+        for batch_size in (1, 16, 256, 4096):
+            path = os.path.join(tmp, f'write-{batch_size}.db')
+            # one fsync per record is slow: fewer records for batch 1
+            records = WRITE_RECORDS if batch_size > 1 else WRITE_RECORDS // 10
+            elapsed = write(path, records, batch_size)
+            print(f"  batch {batch_size:>5}: {records / elapsed:>10,.0f} records/s "
+                  f"({elapsed / records * 1e6:.1f} us/record)")
+
+        path = os.path.join(tmp, 'recovery.db')
+        elapsed = write(path, RECOVERY_RECORDS, 4096)
+        size = os.path.getsize(path)
+        print(f"\nWrote {RECOVERY_RECORDS:,} records in {elapsed:.1f}s ({size / 1e6:.0f} MB)")
+
+        journal = OrderJournal(path, flush_interval=0)
+        start = time.perf_counter()
+        orders = journal.replay()
+        elapsed = time.perf_counter() - start
+        journal.close()
+        print(f"Replay: {orders:,} orders from {RECOVERY_RECORDS:,} records in {elapsed:.2f}s "
+              f"({RECOVERY_RECORDS / elapsed:,.0f} records/s)")
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
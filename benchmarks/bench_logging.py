@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: logging latency added to each order
+Places mock orders (no simulated network) with logging off, with the
+synchronous file + console handlers, and with the queued setup
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot.client import MockBinanceClient  # noqa: E402
+from bot.logging_config import LOG_FORMAT, attach_handlers, make_file_handler  # noqa: E402
+from bot.orders import OrderManager  # noqa: E402
+
+NUM_ORDERS = 20000
+
+
+def run(order_mgr):
+    latencies = []
+    for _ in range(NUM_ORDERS):
+        start = time.perf_counter()
+        order_mgr.place_market_order('BTCUSDT', 'BUY', 0.001)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return sum(latencies) / len(latencies), latencies[int(len(latencies) * 0.99)]
+
+
+def main():
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    order_mgr = OrderManager(MockBinanceClient())
+    tmp = tempfile.mkdtemp()
+    # console output goes to /dev/null so the terminal isn't the bottleneck
+    devnull = open(os.devnull, 'w')
+
+    results = {}
+    root.handlers = []
+    logging.disable(logging.INFO)
+    results['logging disabled'] = run(order_mgr)
+    logging.disable(logging.NOTSET)
+
+    for mode in ('sync', 'queued'):
+        fh = make_file_handler(os.path.join(tmp, f'{mode}.log'))
+        sh = logging.StreamHandler(devnull)
+        for h in (fh, sh):
+            h.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.handlers = []
+        listener = attach_handlers(root, [fh, sh], queued=(mode == 'queued'))
+        results[mode] = run(order_mgr)
+        start = time.perf_counter()
+        if listener is not None:
+            listener.stop()
+        drain = time.perf_counter() - start
+        fh.close()
+        if listener is not None:
+            print(f"(queued listener drained the backlog in {drain * 1000:.0f} ms after the run)")
+
+    root.handlers = []
+    print(f"{NUM_ORDERS} MARKET orders against MockBinanceClient, 2 log records per order")
+    base = results['logging disabled'][0]
+    for name, (mean, p99) in results.items():
+        print(f"{name:<17} mean {mean * 1e6:7.2f} us   p99 {p99 * 1e6:7.2f} us   "
+              f"logging adds {(mean - base) * 1e6:6.2f} us/order")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parse time and memory of 1M order responses
+Raw dicts from json.loads against OrderResults built by the models parser
+(orjson when installed), plus the cost of reading one numeric field
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot.models import OrderResult, loads, orjson  # noqa: E402
+
+COUNT = 1000000
+# tracemalloc is slow: memory is measured on a sample and scaled up
+MEMORY_SAMPLE = 100000
+
+
+def response(order_id):
+    return {'orderId': 4000000000 + order_id, 'symbol': 'BTCUSDT', 'status': 'FILLED',
+            'clientOrderId': f"tb1f2e18c1a2b3c4-{order_id}", 'price': '0', 'avgPrice': '30000.10',
+            'origQty': '0.001', 'executedQty': '0.001', 'cumQty': '0.001', 'cumQuote': '30.00010',
+            'timeInForce': 'GTC', 'type': 'MARKET', 'reduceOnly': False, 'closePosition': False,
+            'side': 'BUY', 'positionSide': 'BOTH', 'stopPrice': '0', 'workingType': 'CONTRACT_PRICE',
+            'priceProtect': False, 'origType': 'MARKET', 'updateTime': 1700000000000 + order_id}
+
+
+def timed(func, payloads):
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for raw in payloads:
+            func(raw)
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def retained(func, payloads):
+    """Bytes still allocated after parsing every payload and keeping the results"""
+    gc.collect()
+    tracemalloc.start()
+    result = [func(raw) for raw in payloads]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    payloads = [json.dumps(response(i)).encode() for i in range(COUNT)]
+    parser = 'orjson' if orjson is not None else 'json (orjson not installed)'
+    print(f"{COUNT:,} futures order responses, models parser: {parser}\n")
+
+    cases = [
+        ('dict (json.loads)', json.loads),
+        ('dict (models.loads)', loads),
+        ('OrderResult', lambda raw: OrderResult.from_response(loads(raw))),
+    ]
+    for name, func in cases:
+        elapsed = timed(func, payloads)
+        per_order = retained(func, payloads[:MEMORY_SAMPLE]) / MEMORY_SAMPLE
+        print(f"{name:<22} parse {elapsed:6.2f}s ({elapsed / COUNT * 1e6:5.2f} us/response)   "
+              f"memory {per_order * COUNT / 1e6:7.0f} MB ({per_order:4.0f} B/order)")
+
+    # what the lazy numeric fields cost when they are actually read
+    order = OrderResult.from_response(response(1))
+    raw = response(1)
+    number = 200000
+    start = time.perf_counter()
+    for _ in range(number):
+        order.executed_qty
+    lazy = (time.perf_counter() - start) / number
+    start = time.perf_counter()
+    for _ in range(number):
+        raw['executedQty']
+    plain = (time.perf_counter() - start) / number
+    print(f"\nexecutedQty read: dict string {plain * 1e9:.0f} ns, OrderResult Decimal {lazy * 1e9:.0f} ns")
+
+
+if __name__ == '__main__':
+    main()
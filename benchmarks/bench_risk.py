@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: what the pre-trade risk checks add to an order
+Times RiskEngine.check() with one limit at a time and with all of them,
+the update applied after each response, and place_market_order against
+the mock with and without a RiskEngine, next to the futures_account()
+round trip a naive check would make per order
+"""
+
+import itertools
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot.client import MockBinanceClient  # noqa: E402
+from bot.orders import OrderManager  # noqa: E402
+from bot.risk import RiskEngine, RiskLimits  # noqa: E402
+from bot.simulator import LatencyModel  # noqa: E402
+
+NUMBER = 100000
+SYMBOLS = 300
+ALL_LIMITS = {'max_order_qty': 1, 'max_order_notional': 1000, 'max_position': 1, 'max_notional': 1000,
+              'price_band': 0.05}
+
+
+def per_call(func, number=NUMBER):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+
+def engine(limits, max_account_notional=None):
+    risk = RiskEngine(RiskLimits(**limits), max_account_notional=max_account_notional)
+    # exposure spread over many symbols, as in a real account
+    for n in range(SYMBOLS):
+        risk.update_mark_price(f"S{n:03d}USDT", 100)
+        risk.set_position(f"S{n:03d}USDT", 0.5)
+    risk.update_mark_price('BTCUSDT', 100)
+    return risk
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print(f"RiskEngine.check() per order ({SYMBOLS} symbols held):")
+    cases = [('no limits', {}, None)]
+    cases += [(name, {name: value}, None) for name, value in ALL_LIMITS.items()]
+    cases += [('max_account_notional', {}, 100000), ('all limits', ALL_LIMITS, 100000)]
+    for name, limits, account in cases:
+        risk = engine(limits, account)
+        seconds = per_call(lambda: risk.check('BTCUSDT', 'BUY', 'LIMIT', '0.001', '100.5'))
+        print(f"  {name:<22} {seconds * 1e9:8.0f} ns")
+
+    risk = engine(ALL_LIMITS, 100000)
+    ids = itertools.count()
+    response = {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'status': 'FILLED', 'origQty': '0.001',
+                'executedQty': '0.001', 'avgPrice': '100'}
+
+    def check_and_fill():
+        client_order_id = f"b{next(ids)}"
+        risk.check('BTCUSDT', 'BUY', 'MARKET', '0.001', client_order_id=client_order_id)
+        risk.on_order(dict(response, clientOrderId=client_order_id))
+        risk.set_position('BTCUSDT', 0)
+    print(f"  {'check + on_order':<22} {per_call(check_and_fill) * 1e9:8.0f} ns")
+
+    print("\nplace_market_order against the mock:")
+    sides = itertools.cycle(['BUY', 'SELL'])
+    plain = OrderManager(MockBinanceClient())
+    guarded = OrderManager(MockBinanceClient(), risk=engine(ALL_LIMITS, 100000))
+    base = per_call(lambda: plain.place_market_order('BTCUSDT', next(sides), 0.001), NUMBER // 10)
+    checked = per_call(lambda: guarded.place_market_order('BTCUSDT', next(sides), 0.001), NUMBER // 10)
+    print(f"  without risk           {base * 1e6:8.2f} us")
+    print(f"  with all limits        {checked * 1e6:8.2f} us  (+{(checked - base) * 1e6:.2f} us)")
+
+    # the naive alternative: ask the exchange before every order (5ms round trip)
+    mock = MockBinanceClient(latency=LatencyModel(0.005))
+    print(f"  futures_account() call {per_call(mock.futures_account, 50) * 1e6:8.0f} us  (5 ms simulated RTT)")
+
+
+if __name__ == '__main__':
+    main()
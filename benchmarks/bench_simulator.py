@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark: orders per second through OrderManager against the simulated exchange
+Makers ladder LIMIT orders around a mid price and MARKET takers sweep them,
+so the book keeps a realistic depth and most takers get partial level fills
+"""
+
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot.client import MockBinanceClient  # noqa: E402
+from bot.orders import OrderManager  # noqa: E402
+
+NUM_ORDERS = 200000
+
+
+def main():
+    logging.disable(logging.INFO)
+    rng = random.Random(7)
+    client = MockBinanceClient()
+    order_mgr = OrderManager(client)
+
+    # pre-generate the flow so only order handling is timed
+    flow = []
+    for _ in range(NUM_ORDERS):
+        side = 'BUY' if rng.random() < 0.5 else 'SELL'
+        if rng.random() < 0.7:
+            offset = rng.randint(1, 50) * 0.1
+            price = round(30000 - offset if side == 'BUY' else 30000 + offset, 1)
+            flow.append((side, round(rng.uniform(0.001, 0.05), 3), price))
+        else:
+            flow.append((side, round(rng.uniform(0.001, 0.05), 3), None))
+
+    start = time.perf_counter()
+    for side, qty, price in flow:
+        if price is None:
+            order_mgr.place_market_order('BTCUSDT', side, qty)
+        else:
+            order_mgr.place_limit_order('BTCUSDT', side, qty, price)
+    elapsed = time.perf_counter() - start
+
+    exchange = client.exchange
+    book = exchange.book('BTCUSDT')
+    print(f"{NUM_ORDERS} orders through OrderManager in {elapsed:.2f}s: {NUM_ORDERS / elapsed:,.0f} orders/s")
+    print(f"taker matches: {exchange.trades}, resting orders: {len(exchange.open_orders('BTCUSDT'))}, "
+          f"levels: {len(book.bid_keys)} bids / {len(book.ask_keys)} asks")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the order path
+Runs every case, prints a table, optionally saves the results as JSON and
+compares them with a stored baseline; a case slower than the baseline by
+more than --threshold fails the run (exit status 1).
+
+    python benchmarks/run_benchmarks.py                       # run and compare with baseline.json
+    python benchmarks/run_benchmarks.py --save results.json
+    python benchmarks/run_benchmarks.py --update-baseline     # after an intended change
+    python benchmarks/run_benchmarks.py -k validate           # only matching cases
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from bot.async_client import AsyncMockBinanceClient, AsyncOrderManager  # noqa: E402
+from bot.client import MockBinanceClient  # noqa: E402
+from bot.models import OrderResult  # noqa: E402
+from bot.normalizer import OrderNormalizer  # noqa: E402
+from bot.orders import OrderManager, format_order_response  # noqa: E402
+from bot.retry import RetryPolicy  # noqa: E402
+from bot.risk import RiskEngine, RiskLimits  # noqa: E402
+from bot.validators import (  # noqa: E402
+    validate_order_type,
+    validate_price,
+    validate_quantity,
+    validate_side,
+    validate_symbol,
+)
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+ORDER = OrderResult.from_response({
+    'orderId': 4012345678, 'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT', 'status': 'NEW',
+    'origQty': '0.001', 'executedQty': '0', 'price': '30000.1', 'avgPrice': '0',
+})
+
+RULES = {'symbol': 'BTCUSDT', 'tickSize': '0.10', 'minPrice': '556.80', 'maxPrice': '4529764',
+         'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '1000', 'minNotional': '5'}
+
+CONCURRENT_ORDERS = 200
+CONCURRENT_LATENCY = 0.002
+
+
+def measure(func=None, min_time=0.2, repeat=5, setup=None):
+    """
+    Best-of-`repeat` seconds per call; each round runs for at least min_time
+    setup() returns a fresh callable per round (for cases that accumulate
+    state, like orders in the simulated exchange). GC is off while timing,
+    as in timeit.
+    """
+    make = setup or (lambda: func)
+    number = 1
+    while True:
+        elapsed = _timed(make(), number)
+        if elapsed >= min_time / 5:
+            break
+        number *= 10
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(_timed(make(), number) / number for _ in range(repeat))
+
+
+def _timed(func, number):
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def bench_validators():
+    def run():
+        validate_symbol('btcusdt')
+        validate_side('buy')
+        validate_order_type('limit')
+        validate_quantity('0.001')
+        validate_price('30000.1', 'LIMIT')
+    return measure(run)
+
+
+def bench_format_order_response():
+    return measure(lambda: format_order_response(ORDER))
+
+
+def bench_normalize():
+    normalizer = OrderNormalizer({'BTCUSDT': RULES}.get)
+    return measure(lambda: normalizer.normalize('BTCUSDT', 'BUY', 'LIMIT', 0.0012, 30000.05))
+
+
+def bench_place_market_order():
+    def setup():
+        order_mgr = OrderManager(MockBinanceClient())
+        return lambda: order_mgr.place_market_order('BTCUSDT', 'BUY', 0.001)
+    return measure(setup=setup)
+
+
+def bench_place_market_order_retry():
+    """Same as place_market_order with a RetryPolicy attached (nothing fails, so it should cost nothing)"""
+    def setup():
+        order_mgr = OrderManager(MockBinanceClient(), retry=RetryPolicy())
+        return lambda: order_mgr.place_market_order('BTCUSDT', 'BUY', 0.001)
+    return measure(setup=setup)
+
+
+def bench_place_market_order_risk():
+    """Same as place_market_order with every RiskEngine limit switched on"""
+    def setup():
+        risk = RiskEngine(RiskLimits(max_order_qty=1, max_order_notional=1000, max_position=1, max_notional=1000,
+                                     price_band=0.05), max_account_notional=10000)
+        risk.update_mark_price('BTCUSDT', 100)
+        order_mgr = OrderManager(MockBinanceClient(), risk=risk)
+        # alternate sides so the position stays inside the limits
+        sides = itertools.cycle(['BUY', 'SELL'])
+        return lambda: order_mgr.place_market_order('BTCUSDT', next(sides), 0.001)
+    return measure(setup=setup)
+
+
+def bench_place_limit_order():
+    def setup():
+        order_mgr = OrderManager(MockBinanceClient())
+        # alternate sides at the same price so the simulated book stays small
+        sides = itertools.cycle(['BUY', 'SELL'])
+        return lambda: order_mgr.place_limit_order('BTCUSDT', next(sides), 0.001, 30000.1)
+    return measure(setup=setup)
+
+
+def _specs():
+    return [{'symbol': 'BTCUSDT', 'side': 'BUY' if i % 2 else 'SELL', 'type': 'LIMIT',
+             'quantity': 0.001, 'price': 30000 + (i % 10) * 0.1} for i in range(CONCURRENT_ORDERS)]
+
+
+def bench_place_orders_threaded():
+    """Per order, with a simulated round trip, batches on 8 threads"""
+    order_mgr = OrderManager(MockBinanceClient(latency=CONCURRENT_LATENCY))
+    specs = _specs()
+    return measure(lambda: order_mgr.place_orders(specs, max_workers=8), min_time=0.5) / len(specs)
+
+
+def bench_place_orders_async():
+    """Per order, with a simulated round trip, single orders with 50 in flight"""
+    order_mgr = AsyncOrderManager(AsyncMockBinanceClient(latency=CONCURRENT_LATENCY), max_in_flight=50)
+    specs = _specs()
+
+    async def run():
+        await asyncio.gather(*(order_mgr.place_limit_order(s['symbol'], s['side'], s['quantity'], s['price'])
+                               for s in specs))
+
+    loop = asyncio.new_event_loop()
+    try:
+        return measure(lambda: loop.run_until_complete(run()), min_time=0.5) / len(specs)
+    finally:
+        loop.close()
+
+
+def bench_cli_cold_start():
+    """Median wall time of a full `cli.py --dry-run` process"""
+    cmd = [sys.executable, os.path.join(ROOT, 'cli.py'), '--symbol', 'BTCUSDT', '--side', 'BUY',
+           '--type', 'MARKET', '--quantity', '0.001', '--dry-run']
+    times = []
+    for _ in range(7):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+CASES = [
+    ('validators', bench_validators),
+    ('format_order_response', bench_format_order_response),
+    ('normalize_limit_order', bench_normalize),
+    ('place_market_order', bench_place_market_order),
+    ('place_market_order_retry', bench_place_market_order_retry),
+    ('place_market_order_risk', bench_place_market_order_risk),
+    ('place_limit_order', bench_place_limit_order),
+    ('place_orders_threaded_per_order', bench_place_orders_threaded),
+    ('place_orders_async_per_order', bench_place_orders_async),
+    ('cli_cold_start', bench_cli_cold_start),
+]
+
+
+def run_cases(pattern=None):
+    logging.disable(logging.CRITICAL)
+    results = {}
+    for name, func in CASES:
+        if pattern and pattern not in name:
+            continue
+        results[name] = func()
+        print(f"{name:<34} {_fmt(results[name])}")
+    logging.disable(logging.NOTSET)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Names of cases more than `threshold` (fraction) slower than the baseline"""
+    regressions = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        change = seconds / base - 1
+        mark = 'REGRESSION' if change > threshold else ''
+        print(f"{name:<34} {_fmt(base)} -> {_fmt(seconds)}  {change * 100:+6.1f}%  {mark}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def _fmt(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:10.2f} us"
+    return f"{seconds * 1e3:10.2f} ms"
+
+
+def _write(path, results):
+    payload = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Order path benchmarks')
+    parser.add_argument('-k', dest='pattern', help='Only run cases whose name contains this')
+    parser.add_argument('--save', metavar='FILE', help='Write results as JSON')
+    parser.add_argument('--baseline', default=BASELINE, help='Baseline JSON to compare against')
+    parser.add_argument('--no-compare', action='store_true', help='Skip the baseline comparison')
+    parser.add_argument('--update-baseline', action='store_true', help='Overwrite the baseline with this run')
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help='Allowed slowdown vs baseline as a fraction (default 0.5 = 50%%)')
+    args = parser.parse_args(argv)
+
+    results = run_cases(args.pattern)
+    if args.save:
+        _write(args.save, results)
+    if args.update_baseline:
+        _write(args.baseline, results)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if args.no_compare or not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    print(f"\nCompared with {args.baseline} (threshold {args.threshold * 100:.0f}%)")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,26 +1,73 @@
 """
 Trading bot package
+Names are imported from their submodules on first use, so e.g. importing the
+validators or running a dry run never loads python-binance
 """
 
-from .client import BinanceClient, MockBinanceClient
-from .orders import OrderManager
-from .validators import (
-    validate_symbol,
-    validate_side,
-    validate_order_type,
-    validate_quantity,
-    validate_price
-)
-from .logging_config import setup_logging
+import importlib
 
-__all__ = [
-    'BinanceClient',
-    'MockBinanceClient',
-    'OrderManager',
-    'validate_symbol',
-    'validate_side',
-    'validate_order_type',
-    'validate_quantity',
-    'validate_price',
-    'setup_logging'
-]
+# public name -> submodule that defines it
+_EXPORTS = {
+    'BinanceClient': 'client',
+    'MockBinanceClient': 'client',
+    'get_shared_client': 'client',
+    'SessionConfig': 'session',
+    'TimeSync': 'time_sync',
+    'RequestSigner': 'signing',
+    'Metrics': 'metrics',
+    'SimulatedExchange': 'simulator',
+    'LatencyModel': 'simulator',
+    'ExchangeInfoCache': 'exchange_info',
+    'RetryPolicy': 'retry',
+    'ClientOrderIds': 'retry',
+    'OrderRequest': 'models',
+    'OrderResult': 'models',
+    'SymbolRules': 'models',
+    'OrderManager': 'orders',
+    'RiskEngine': 'risk',
+    'RiskLimits': 'risk',
+    'RiskError': 'risk',
+    'ExecutionEngine': 'engine',
+    'TWAP': 'algo',
+    'VWAP': 'algo',
+    'Iceberg': 'algo',
+    'TimerWheel': 'scheduler',
+    'SimulatedClock': 'scheduler',
+    'KlineStore': 'history',
+    'Klines': 'history',
+    'Backtest': 'backtest',
+    'Strategy': 'backtest',
+    'OrderJournal': 'journal',
+    'OrderNormalizer': 'normalizer',
+    'MarketData': 'market_data',
+    'OrderBook': 'market_data',
+    'UserDataStore': 'user_data',
+    'UserDataStream': 'user_data',
+    'AsyncBinanceClient': 'async_client',
+    'AsyncOrderManager': 'async_client',
+    'AsyncMockBinanceClient': 'async_client',
+    'validate_symbol': 'validators',
+    'validate_side': 'validators',
+    'validate_order_type': 'validators',
+    'validate_quantity': 'validators',
+    'validate_price': 'validators',
+    'setup_logging': 'logging_config',
+    'OrderDaemon': 'daemon',
+    'DaemonClient': 'daemon',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    # cache it so the next lookup is a plain module attribute
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
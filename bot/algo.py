@@ -0,0 +1,375 @@
+"""
+Execution algorithms
+Split a parent order into child orders over time on a TimerWheel: TWAP,
+VWAP against a volume profile, and iceberg. Child quantities are exact
+multiples of the symbol's stepSize and always add up to the parent.
+"""
+
+import logging
+from decimal import ROUND_DOWN, Decimal
+
+from .models import OrderResult
+from .normalizer import to_decimal
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+
+
+def split_quantity(quantity, weights, step, min_qty=None):
+    """
+    Child quantities proportional to weights, as Decimals
+    Each child is a multiple of step and the children sum to quantity
+    exactly: the cumulative target is rounded down to the grid, so rounding
+    never drifts. A child below min_qty is carried into the next one (the
+    last carries back into the one before), which may leave zeros.
+    """
+    quantity = to_decimal(quantity)
+    step = to_decimal(step)
+    if quantity <= 0:
+        raise ValueError(f"quantity must be positive, got {quantity}")
+    if quantity % step:
+        raise ValueError(f"quantity {quantity} is not a multiple of stepSize {step}")
+    if min_qty is not None:
+        min_qty = to_decimal(min_qty)
+    weights = [to_decimal(w) for w in weights]
+    total = sum(weights)
+    if not weights or total <= 0 or any(w < 0 for w in weights):
+        raise ValueError("weights must be non-negative and not all zero")
+
+    children = []
+    sent = Decimal(0)
+    cumulative = Decimal(0)
+    for n, weight in enumerate(weights):
+        cumulative += weight
+        if n == len(weights) - 1:
+            target = quantity
+        else:
+            target = (quantity * cumulative / total / step).to_integral_value(ROUND_DOWN) * step
+        child = target - sent
+        if min_qty is not None and 0 < child < min_qty and n < len(weights) - 1:
+            child = Decimal(0)
+        children.append(child)
+        sent += child
+    if min_qty is not None and 0 < children[-1] < min_qty:
+        for n in range(len(children) - 2, -1, -1):
+            if children[n]:
+                children[n] += children[-1]
+                children[-1] = Decimal(0)
+                break
+    return children
+
+
+class ExecutionAlgo:
+    """
+    One parent order worked through child orders
+
+    The step size (and minimum) come from step_size/min_qty or else the
+    symbol's MARKET_LOT_SIZE/LOT_SIZE rules. on_progress(progress) is called
+    after every child update. After max_failures rejected children the
+    parent stops with status FAILED; a parent that ran out of children
+    before filling its quantity stops with status PARTIAL.
+    """
+
+    name = 'algo'
+
+    def __init__(self, order_mgr, symbol, side, quantity, step_size=None, min_qty=None, on_progress=None,
+                 max_failures=3, poll_interval=1.0):
+        self.order_mgr = order_mgr
+        self.symbol = symbol
+        self.side = side
+        self.quantity = to_decimal(quantity)
+        self.step_size, self.min_qty = self._lot_size(step_size, min_qty)
+        self.on_progress = on_progress
+        self.max_failures = max_failures
+        self.poll_interval = poll_interval
+        self.status = 'PENDING'
+        self.children = []
+        self.filled = Decimal(0)
+        self.quote = Decimal(0)
+        self.failures = 0
+        self.started_at = None
+        self.finished_at = None
+        self.wheel = None
+        self._timers = []
+
+    def _lot_size(self, step_size, min_qty):
+        if step_size is None:
+            rules = self.order_mgr.client.get_symbol_rules(self.symbol)
+            if rules is not None:
+                step_size = rules.get('marketStepSize') or rules.get('stepSize')
+                if min_qty is None:
+                    min_qty = rules.get('marketMinQty') or rules.get('minQty')
+        if step_size is None:
+            logger.error(f"{self.symbol}: stepSize unknown")
+            raise ValueError(f"{self.symbol}: stepSize unknown, pass step_size")
+        return to_decimal(step_size), (to_decimal(min_qty) if min_qty is not None else None)
+
+    @property
+    def done(self):
+        return self.status in ('DONE', 'PARTIAL', 'FAILED', 'CANCELLED')
+
+    def _start(self):
+        raise NotImplementedError
+
+    def start(self, wheel):
+        self.wheel = wheel
+        self.started_at = wheel.clock()
+        self.status = 'RUNNING'
+        logger.info(f"{self.name} {self.side} {self.quantity} {self.symbol} started")
+        self._start()
+        self._report()
+
+    def cancel(self):
+        """Stop scheduling children and cancel any child still resting on the book"""
+        if self.done:
+            return
+        for timer in self._timers:
+            timer.cancel()
+        for child in self.children:
+            order = child['order']
+            if order is not None and order.status in OPEN_STATUSES:
+                self._cancel_child(child)
+        self._finish('CANCELLED')
+
+    # -- children --------------------------------------------------------
+
+    def _schedule(self, when, callback, *args):
+        # keep only the timers that can still be cancelled
+        now = self.wheel.clock()
+        self._timers = [t for t in self._timers if t.when >= now and not t.cancelled]
+        self._timers.append(self.wheel.call_at(when, callback, *args))
+
+    def _send(self, quantity, price=None):
+        """Place one child order; returns the child record"""
+        child = {'at': self.wheel.clock(), 'quantity': quantity, 'price': price, 'order': None,
+                 'executed': Decimal(0), 'quote': Decimal(0), 'error': None}
+        self.children.append(child)
+        try:
+            if price is None:
+                order = self.order_mgr.place_market_order(self.symbol, self.side, format(quantity, 'f'))
+            else:
+                order = self.order_mgr.place_limit_order(self.symbol, self.side, format(quantity, 'f'),
+                                                         format(price, 'f'))
+        except Exception as e:
+            child['error'] = str(getattr(e, 'message', None) or e)
+            self.failures += 1
+            logger.error(f"{self.name} {self.symbol}: child {len(self.children)} failed: {child['error']}")
+            if self.failures >= self.max_failures:
+                for timer in self._timers:
+                    timer.cancel()
+                self._finish('FAILED')
+            return child
+        self._update(child, order)
+        return child
+
+    def _update(self, child, order):
+        order = OrderResult.from_response(order)
+        child['order'] = order
+        executed = order.executed_qty or Decimal(0)
+        quote = order.cum_quote
+        if quote is None:
+            quote = executed * (order.avg_price or Decimal(0))
+        self.filled += executed - child['executed']
+        self.quote += quote - child['quote']
+        child['executed'] = executed
+        child['quote'] = quote
+        if order.status in OPEN_STATUSES:
+            self._schedule(self.wheel.clock() + self.poll_interval, self._poll, child)
+
+    def _poll(self, child):
+        if self.done:
+            return
+        order = child['order']
+        try:
+            current = self.order_mgr.client.client.futures_get_order(symbol=self.symbol, orderId=order.order_id)
+        except Exception as e:
+            logger.warning(f"{self.name} {self.symbol}: order {order.order_id} status check failed: {e}")
+            self._schedule(self.wheel.clock() + self.poll_interval, self._poll, child)
+            return
+        self._update(child, current)
+        self._on_child_update(child)
+        if not self.done:
+            self._report()
+
+    def _cancel_child(self, child):
+        order = child['order']
+        try:
+            self._update(child, self.order_mgr.client.client.futures_cancel_order(symbol=self.symbol,
+                                                                                  orderId=order.order_id))
+        except Exception as e:
+            logger.warning(f"{self.name} {self.symbol}: could not cancel order {order.order_id}: {e}")
+
+    def _on_child_update(self, child):
+        """A polled child changed; subclasses decide what comes next"""
+        self._check_done()
+
+    def _open_children(self):
+        return sum(1 for c in self.children if c['order'] is not None and c['order'].status in OPEN_STATUSES)
+
+    def _check_done(self):
+        pass
+
+    def _finish(self, status):
+        self.status = status
+        self.finished_at = self.wheel.clock()
+        logger.info(f"{self.name} {self.side} {self.quantity} {self.symbol} {status}: filled {self.filled} "
+                    f"in {len(self.children)} children")
+        self._report()
+
+    # -- progress --------------------------------------------------------
+
+    def progress(self):
+        if self.started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished_at if self.finished_at is not None else self.wheel.clock()) - self.started_at
+        return {
+            'algo': self.name,
+            'symbol': self.symbol,
+            'side': self.side,
+            'status': self.status,
+            'quantity': self.quantity,
+            'filled': self.filled,
+            'remaining': self.quantity - self.filled,
+            'percent': float(self.filled / self.quantity * 100),
+            'avg_price': self.quote / self.filled if self.filled else None,
+            'children': len(self.children),
+            'failed': self.failures,
+            'elapsed': elapsed,
+        }
+
+    def _report(self):
+        if self.on_progress is not None:
+            self.on_progress(self.progress())
+
+
+class SlicedAlgo(ExecutionAlgo):
+    """
+    Child MARKET orders at evenly spaced times over `duration` seconds, sized
+    by `weights` (one per slice); a failed child's quantity, or the unfilled
+    rest of one that expired, moves to the next slice
+    """
+
+    def __init__(self, order_mgr, symbol, side, quantity, duration, weights, **kwargs):
+        super().__init__(order_mgr, symbol, side, quantity, **kwargs)
+        self.duration = duration
+        self.slices = split_quantity(self.quantity, weights, self.step_size, self.min_qty)
+        self._carry = Decimal(0)
+        self._next = 0
+
+    def _start(self):
+        interval = self.duration / len(self.slices)
+        for n in range(len(self.slices)):
+            self._schedule(self.started_at + n * interval, self._slice, n)
+
+    def _slice(self, n):
+        if self.done:
+            return
+        quantity = self.slices[n] + self._carry
+        self._carry = Decimal(0)
+        self._next = n + 1
+        if quantity:
+            child = self._send(quantity)
+            if child['error'] is not None:
+                self._carry = quantity
+            else:
+                self._carry_unfilled(child)
+        self._check_done()
+        if not self.done:
+            self._report()
+
+    def _on_child_update(self, child):
+        self._carry_unfilled(child)
+        self._check_done()
+
+    def _carry_unfilled(self, child):
+        """A child that ended (e.g. EXPIRED) short of its quantity hands the rest to the next slice"""
+        if child['order'].status in OPEN_STATUSES or child.get('carried'):
+            return
+        child['carried'] = True
+        unfilled = child['quantity'] - child['executed']
+        if unfilled > 0:
+            logger.info(f"{self.name} {self.symbol}: order {child['order'].order_id} "
+                        f"{child['order'].status} with {unfilled} unfilled, carried to the next slice")
+            self._carry += unfilled
+
+    def _check_done(self):
+        if self.done or self._next < len(self.slices) or self._open_children():
+            return
+        self._finish('DONE' if self.filled >= self.quantity else 'PARTIAL')
+
+
+class TWAP(SlicedAlgo):
+    """Equal slices over duration seconds"""
+
+    name = 'twap'
+
+    def __init__(self, order_mgr, symbol, side, quantity, duration, slices, **kwargs):
+        super().__init__(order_mgr, symbol, side, quantity, duration, [1] * slices, **kwargs)
+
+
+class VWAP(SlicedAlgo):
+    """
+    Slices following a volume profile
+    profile holds the expected volume of each of the equal time buckets that
+    make up duration (e.g. historical volume per hour of day); each bucket
+    gets its share of the parent at its start.
+    """
+
+    name = 'vwap'
+
+    def __init__(self, order_mgr, symbol, side, quantity, duration, profile, **kwargs):
+        super().__init__(order_mgr, symbol, side, quantity, duration, profile, **kwargs)
+
+
+class Iceberg(ExecutionAlgo):
+    """
+    LIMIT child orders showing at most display_qty at a time
+    The next clip is posted once the resting one has filled (checked every
+    poll_interval seconds), until the parent quantity is done.
+    """
+
+    name = 'iceberg'
+
+    def __init__(self, order_mgr, symbol, side, quantity, price, display_qty, **kwargs):
+        super().__init__(order_mgr, symbol, side, quantity, **kwargs)
+        self.price = to_decimal(price)
+        self.display_qty = to_decimal(display_qty)
+        if self.display_qty <= 0 or self.display_qty % self.step_size:
+            raise ValueError(f"display_qty {self.display_qty} is not a positive multiple of stepSize "
+                             f"{self.step_size}")
+
+    def _start(self):
+        self._post()
+
+    def _post(self):
+        """Post the next clip: the unfilled quantity not already resting, at most display_qty"""
+        unplaced = self.quantity - self.filled - sum(c['quantity'] - c['executed'] for c in self.children
+                                                     if c['order'] is not None
+                                                     and c['order'].status in OPEN_STATUSES)
+        quantity = min(self.display_qty, unplaced)
+        if quantity <= 0 or self.done:
+            return
+        child = self._send(quantity, self.price)
+        if self.done:
+            return
+        if child['error'] is not None:
+            self._schedule(self.wheel.clock() + self.poll_interval, self._post)
+        elif child['order'].status not in OPEN_STATUSES:
+            # filled on arrival (or expired): the next clip goes out on this tick
+            self._check_done()
+            if not self.done:
+                self._schedule(self.wheel.clock(), self._post)
+        if not self.done:
+            self._report()
+
+    def _on_child_update(self, child):
+        if child['order'].status not in OPEN_STATUSES:
+            self._check_done()
+            if not self.done:
+                self._post()
+
+    def _check_done(self):
+        if not self.done and self.filled >= self.quantity:
+            self._finish('DONE')
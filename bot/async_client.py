@@ -0,0 +1,287 @@
+"""
+Asyncio versions of the client and order manager
+Many orders can be in flight at once over one pooled HTTP session
+"""
+
+import asyncio
+import logging
+import time
+
+from .client import MockBinanceClient
+from .errors import api_error, api_errors
+from .exchange_info import ExchangeInfoCache
+from .models import OrderResult
+from .orders import (
+    OrderManager,
+    batch_params,
+    batch_error_responses,
+    collect_batch_results,
+    log_batch_summary,
+    prepare_order,
+    prepare_specs,
+    split_batches,
+)
+from .rate_limit import RateLimitServer
+from .retry import ClientOrderIds
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBinanceClient:
+    """
+    Async counterpart of BinanceClient
+    Build it with `await AsyncBinanceClient.create(...)` and close it with
+    `await client.close()` (or use it as an async context manager).
+    """
+
+    def __init__(self, client, exchange_info_ttl=300, exchange_info_path=None):
+        self.client = client
+        self.exchange_info = ExchangeInfoCache(
+            None,
+            ttl=exchange_info_ttl,
+            cache_path=exchange_info_path
+        )
+        # one refresh at a time; concurrent lookups wait for it instead of downloading again
+        self._exchange_info_lock = asyncio.Lock()
+
+    @classmethod
+    async def create(cls, api_key, api_secret, pool_size=100, exchange_info_ttl=300, exchange_info_path=None):
+        """Connect to Binance Futures testnet with a shared connection pool of pool_size"""
+        import aiohttp
+        from binance.client import AsyncClient
+
+        try:
+            connector = aiohttp.TCPConnector(limit=pool_size, keepalive_timeout=60)
+            client = await AsyncClient.create(
+                api_key, api_secret, testnet=True,
+                session_params={'connector': connector}
+            )
+            # Set to futures URL
+            client.API_URL = 'https://testnet.binancefuture.com'
+            logger.info("Connected to Binance Futures Testnet (async)")
+        except Exception as e:
+            logger.error(f"Failed to initialize async client: {e}")
+            raise
+        return cls(client, exchange_info_ttl, exchange_info_path)
+
+    async def close(self):
+        await self.client.close_connection()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def get_account_info(self):
+        """Get account balance and info - useful for testing connection"""
+        try:
+            return await self.client.futures_account()
+        except api_errors() as e:
+            logger.error(f"API Error getting account info: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error getting account info: {e}")
+            raise
+
+    async def _ensure_exchange_info(self):
+        cache = self.exchange_info
+        if not cache.is_stale():
+            cache.hits += 1
+            return
+        async with self._exchange_info_lock:
+            # another task may have refreshed while we waited
+            if not cache.is_stale():
+                cache.hits += 1
+                return
+            cache.misses += 1
+            if cache.load_cached():
+                return
+            try:
+                cache.update(await self.client.futures_exchange_info())
+            except Exception as e:
+                cache.refresh_failed(e)
+
+    async def get_symbol_info(self, symbol):
+        """Get trading rules for a symbol (served from the exchange info cache)"""
+        try:
+            await self._ensure_exchange_info()
+            return self.exchange_info.lookup(symbol)
+        except Exception as e:
+            logger.error(f"Error getting symbol info: {e}")
+            return None
+
+    async def get_symbol_rules(self, symbol):
+        """Get parsed tickSize/stepSize/minQty/minNotional for a symbol"""
+        try:
+            await self._ensure_exchange_info()
+            return self.exchange_info.lookup_rules(symbol)
+        except Exception as e:
+            logger.error(f"Error getting symbol rules: {e}")
+            return None
+
+
+class AsyncOrderManager:
+    """
+    Async counterpart of OrderManager
+    At most max_in_flight requests are outstanding at any time; callers can
+    simply asyncio.gather() as many place_* calls as they like.
+
+    Orders are built by the same code as OrderManager's: every order gets a
+    newClientOrderId from client_ids, and a normalizer rounds/checks it
+    first. The normalizer's rules source must be synchronous (e.g.
+    client.exchange_info.lookup_rules); the symbol's rules are loaded with
+    client.get_symbol_rules() before it runs. Retries, the journal, risk
+    checks, market data and metrics are only supported by OrderManager.
+    """
+
+    def __init__(self, client, max_in_flight=20, normalizer=None, client_ids=None):
+        self.client = client
+        self.max_in_flight = max_in_flight
+        self.normalizer = normalizer
+        self.client_ids = client_ids or ClientOrderIds()
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+    async def _load_rules(self, symbols):
+        if self.normalizer is not None:
+            for symbol in set(symbols):
+                await self.client.get_symbol_rules(symbol)
+
+    async def place_market_order(self, symbol, side, quantity):
+        """Place a market order"""
+        logger.info("Placing MARKET order: %s %s %s", side, quantity, symbol)
+
+        try:
+            await self._load_rules([symbol])
+            request = prepare_order(self.normalizer, self.client_ids, symbol, side, 'MARKET', quantity)
+            async with self._slots:
+                order = await self.client.client.futures_create_order(**request.params())
+            order = OrderResult.from_response(order)
+            logger.info("Market order placed successfully: %s", order.order_id)
+            return order
+
+        except api_errors() as e:
+            logger.error("Binance API error: %s", e.message)
+            raise
+        except Exception as e:
+            logger.error("Error placing market order: %s", e)
+            raise
+
+    async def place_limit_order(self, symbol, side, quantity, price):
+        """Place a GTC limit order"""
+        logger.info("Placing LIMIT order: %s %s %s @ %s", side, quantity, symbol, price)
+
+        try:
+            await self._load_rules([symbol])
+            request = prepare_order(self.normalizer, self.client_ids, symbol, side, 'LIMIT', quantity, price)
+            async with self._slots:
+                order = await self.client.client.futures_create_order(**request.params())
+            order = OrderResult.from_response(order)
+            logger.info("Limit order placed successfully: %s", order.order_id)
+            return order
+
+        except api_errors() as e:
+            logger.error("Binance API error: %s", e.message)
+            raise
+        except Exception as e:
+            logger.error("Error placing limit order: %s", e)
+            raise
+
+    async def place_orders(self, specs):
+        """
+        Place many orders through the batchOrders endpoint
+        Same input and result shape as OrderManager.place_orders
+        """
+        specs = list(specs)
+        results = [None] * len(specs)
+        await self._load_rules(spec['symbol'] for spec in specs)
+        to_send, valid = prepare_specs(self.normalizer, specs, results)
+        batches = [valid[r.start:r.stop] for r in split_batches(len(valid))]
+        logger.info("Placing %d orders in %d batches", len(valid), len(batches))
+
+        async def submit(indexes):
+            batch = [batch_params(to_send[i]) for i in indexes]
+            for params in batch:
+                params['newClientOrderId'] = self.client_ids.next()
+            try:
+                async with self._slots:
+                    responses = await self.client.client.futures_place_batch_order(batchOrders=batch)
+            except Exception as e:
+                responses = batch_error_responses(e, len(batch))
+            collect_batch_results(specs, indexes, responses, results)
+
+        await asyncio.gather(*(submit(indexes) for indexes in batches))
+
+        log_batch_summary(results)
+        return results
+
+    format_order_response = OrderManager.format_order_response
+
+
+class AsyncMockBinanceClient:
+    """
+    Async mock for dry runs and benchmarks
+    Requests go through a MockBinanceClient (same matching engine, fault
+    injection and exchange info); the round trip is awaited instead:
+    latency is seconds or a LatencyModel, an optional governor is acquired
+    with acquire_async() and rate_limits enables the synthetic X-MBX-*
+    headers and 429s, like the sync mock.
+    """
+
+    def __init__(self, num_symbols=0, exchange_info_ttl=300, exchange_info_path=None, latency=0,
+                 governor=None, rate_limits=None, clock=time.monotonic, exchange=None):
+        self.client = self
+        self.latency = latency
+        self.governor = governor
+        self.rate_limit_server = None
+        if governor is not None or rate_limits is not None:
+            self.rate_limit_server = RateLimitServer(rate_limits, clock)
+        # Order logic is shared with the sync mock so both behave the same; its own
+        # round trip does nothing (no latency, no governor), this class does it
+        self._mock = MockBinanceClient(num_symbols, exchange_info_ttl, exchange_info_path, exchange=exchange)
+        self.exchange = self._mock.exchange
+        self.exchange_info = self._mock.exchange_info
+
+    def inject_fault(self, error, endpoint='futures_create_order', after=False, times=1):
+        """Same as MockBinanceClient.inject_fault"""
+        self._mock.inject_fault(error, endpoint, after, times)
+
+    async def _round_trip(self, weight=1, orders=0):
+        if self.governor is not None:
+            await self.governor.acquire_async(weight, orders)
+        if self.latency:
+            await asyncio.sleep(self.latency if isinstance(self.latency, (int, float)) else self.latency.sample())
+        if self.rate_limit_server is not None:
+            status, headers = self.rate_limit_server.record(weight, orders)
+            if self.governor is not None:
+                self.governor.update_from_headers(headers, status)
+            if status == 429:
+                raise api_error(-1003, 'Too many requests; current limit is exceeded.', status=429)
+
+    async def futures_create_order(self, **kwargs):
+        await self._round_trip(1, 1)
+        return self._mock.futures_create_order(**kwargs)
+
+    async def futures_place_batch_order(self, **params):
+        await self._round_trip(5, len(params['batchOrders']))
+        return self._mock.futures_place_batch_order(**params)
+
+    async def futures_account(self):
+        await self._round_trip(5)
+        return self._mock.futures_account()
+
+    async def futures_exchange_info(self):
+        await self._round_trip(1)
+        return self._mock.futures_exchange_info()
+
+    async def get_symbol_info(self, symbol):
+        return self._mock.get_symbol_info(symbol)
+
+    async def get_symbol_rules(self, symbol):
+        return self._mock.get_symbol_rules(symbol)
+
+    async def close(self):
+        pass
+
+    async def close_connection(self):
+        pass
@@ -0,0 +1,338 @@
+"""
+Backtesting
+Runs a strategy over cached klines. Signals are computed for every bar at
+once with NumPy; only the bars where the target position changes go through
+OrderManager, against a BacktestClient that fills at bar prices with fee and
+slippage models, so strategy code places orders exactly as it does live.
+Parameter sweeps run on a process pool.
+"""
+
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .errors import api_error
+from .history import KlineStore
+from .orders import OrderManager
+from .retry import ClientOrderIds
+from .simulator import format_number
+
+logger = logging.getLogger(__name__)
+
+
+class FeeModel:
+    """Commission as a fraction of notional: maker for resting LIMIT fills, taker otherwise"""
+
+    def __init__(self, maker=0.0002, taker=0.0004):
+        self.maker = maker
+        self.taker = taker
+
+    def fee(self, notional, maker):
+        return notional * (self.maker if maker else self.taker)
+
+
+class SlippageModel:
+    """
+    Price a taker fill gets: the reference price moved against the order by
+    bps basis points, plus impact * (quantity / bar volume) as a fraction
+    """
+
+    def __init__(self, bps=1.0, impact=0.0):
+        self.bps = bps
+        self.impact = impact
+
+    def price(self, side, reference, quantity, volume):
+        move = self.bps / 10000
+        if self.impact and volume > 0:
+            move += self.impact * quantity / volume
+        return reference * (1 + move) if side == 'BUY' else reference * (1 - move)
+
+
+class BacktestClient:
+    """
+    Exchange stand-in for OrderManager during a backtest
+
+    `bar` is the bar whose close the strategy is deciding on. MARKET orders
+    (and LIMIT orders that cross) fill at the next bar's open plus slippage,
+    as takers. Resting LIMIT orders fill at their price on the first later
+    bar that trades through it (at the open if it gaps through), as makers,
+    once advance() reaches that bar.
+    """
+
+    def __init__(self, klines, symbol, fees=None, slippage=None):
+        # OrderManager calls .client.futures_create_order(...)
+        self.client = self
+        self.klines = klines
+        self.symbol = symbol
+        self.fees = fees or FeeModel()
+        self.slippage = slippage or SlippageModel()
+        self.bar = 0
+        self.position = 0.0
+        # (bar, signed quantity, price, fee) in fill order
+        self.fills = []
+        self._orders = {}
+        self._by_client_id = {}
+        self._resting = []
+        self._next_id = 1
+
+    def _fill(self, order, bar, price, maker):
+        quantity = order['quantity']
+        fee = self.fees.fee(quantity * price, maker)
+        self.fills.append((bar, quantity if order['side'] == 'BUY' else -quantity, price, fee))
+        self.position += quantity if order['side'] == 'BUY' else -quantity
+        order.update(status='FILLED', executed=quantity, avg_price=price, bar=bar)
+
+    def _response(self, order):
+        executed = order['executed']
+        return {
+            'orderId': order['order_id'],
+            'clientOrderId': order['client_order_id'],
+            'symbol': self.symbol,
+            'side': order['side'],
+            'type': order['type'],
+            'timeInForce': order['time_in_force'],
+            'status': order['status'],
+            'origQty': format_number(order['quantity']),
+            'executedQty': format_number(executed),
+            'price': format_number(order['price'] or 0),
+            'avgPrice': format_number(order['avg_price'] if executed else 0),
+            'cumQuote': format_number(executed * order['avg_price'] if executed else 0),
+            'updateTime': int(self.klines.open_time[order['bar']]),
+        }
+
+    def futures_create_order(self, **params):
+        if params.get('symbol') != self.symbol:
+            raise api_error(-1121, 'Invalid symbol.')
+        quantity = float(params.get('quantity') or 0)
+        if quantity <= 0:
+            raise api_error(-4003, 'Quantity less than or equal to zero.')
+        if params.get('newClientOrderId') in self._by_client_id:
+            raise api_error(-4116, 'ClientOrderId is duplicated.')
+        side = params['side']
+        price = float(params['price']) if params.get('type') == 'LIMIT' else None
+        order = {'order_id': self._next_id, 'client_order_id': params.get('newClientOrderId'), 'side': side,
+                 'type': params.get('type'), 'time_in_force': params.get('timeInForce'), 'quantity': quantity,
+                 'price': price, 'status': 'NEW', 'executed': 0.0, 'avg_price': 0.0, 'bar': self.bar}
+        self._next_id += 1
+        self._orders[order['order_id']] = order
+        if order['client_order_id'] is not None:
+            self._by_client_id[order['client_order_id']] = order
+
+        klines = self.klines
+        bar = self.bar + 1
+        if bar < len(klines):
+            reference = float(klines.open[bar])
+        else:
+            # deciding on the last bar: nothing after it, fill at its close
+            bar = self.bar
+            reference = float(klines.close[bar])
+        fill = self.slippage.price(side, reference, quantity, float(klines.volume[bar]))
+        if price is None:
+            self._fill(order, bar, fill, maker=False)
+        elif (side == 'BUY' and price >= reference) or (side == 'SELL' and price <= reference):
+            self._fill(order, bar, min(fill, price) if side == 'BUY' else max(fill, price), maker=False)
+        else:
+            order['from'] = bar
+            self._resting.append(order)
+        return self._response(order)
+
+    def advance(self, bar):
+        """Fill resting LIMIT orders that trade on any bar up to and including `bar`"""
+        if not self._resting:
+            return
+        klines = self.klines
+        resting = []
+        for order in self._resting:
+            start = order['from']
+            if start > bar:
+                resting.append(order)
+                continue
+            price = order['price']
+            if order['side'] == 'BUY':
+                touched = np.asarray(klines.low[start:bar + 1]) <= price
+            else:
+                touched = np.asarray(klines.high[start:bar + 1]) >= price
+            if not touched.any():
+                order['from'] = bar + 1
+                resting.append(order)
+                continue
+            at = start + int(touched.argmax())
+            opened = float(klines.open[at])
+            self._fill(order, at, min(opened, price) if order['side'] == 'BUY' else max(opened, price), maker=True)
+        self._resting = resting
+
+    def _find(self, params):
+        if params.get('orderId') is not None:
+            return self._orders.get(params['orderId'])
+        return self._by_client_id.get(params.get('origClientOrderId'))
+
+    def futures_cancel_order(self, **params):
+        order = self._find(params)
+        if order is None or order['status'] != 'NEW':
+            raise api_error(-2011, 'Unknown order sent.')
+        self._resting.remove(order)
+        order['status'] = 'CANCELED'
+        order['bar'] = self.bar
+        return self._response(order)
+
+    def futures_get_order(self, **params):
+        order = self._find(params)
+        if order is None:
+            raise api_error(-2013, 'Order does not exist.')
+        return self._response(order)
+
+    def futures_get_open_orders(self, **params):
+        return [self._response(order) for order in self._resting]
+
+    def get_symbol_rules(self, symbol):
+        return None
+
+
+class BacktestResult:
+    """Equity curve and totals of one run, built from the fills with array operations"""
+
+    def __init__(self, klines, fills, initial_cash):
+        self.initial_cash = initial_cash
+        self.trades = len(fills)
+        n = len(klines)
+        if fills:
+            bars, quantities, prices, fees = (np.array(column) for column in zip(*fills))
+        else:
+            bars = np.empty(0, np.int64)
+            quantities = prices = fees = np.empty(0)
+        self.fees = float(fees.sum())
+        position = np.zeros(n)
+        np.add.at(position, bars, quantities)
+        self.position = np.cumsum(position)
+        cash = np.zeros(n)
+        np.add.at(cash, bars, -quantities * prices - fees)
+        self.equity = initial_cash + np.cumsum(cash) + self.position * np.asarray(klines.close)
+
+    @property
+    def pnl(self):
+        return float(self.equity[-1] - self.initial_cash) if len(self.equity) else 0.0
+
+    @property
+    def max_drawdown(self):
+        """Largest fall from a running equity peak, as a fraction of that peak"""
+        if not len(self.equity):
+            return 0.0
+        peak = np.maximum.accumulate(self.equity)
+        return float(((peak - self.equity) / peak).max())
+
+    def summary(self):
+        return {
+            'pnl': self.pnl,
+            'return_pct': self.pnl / self.initial_cash * 100,
+            'trades': self.trades,
+            'fees': self.fees,
+            'max_drawdown_pct': self.max_drawdown * 100,
+            'final_position': float(self.position[-1]) if len(self.position) else 0.0,
+        }
+
+
+class Strategy:
+    """
+    Base strategy
+    signals(klines) returns the target position for every bar at once (a
+    NumPy array); rebalance() moves to a new target through the OrderManager
+    the same way it would live. Override rebalance() for limit orders etc.
+    """
+
+    def __init__(self, **params):
+        self.params = params
+
+    def signals(self, klines):
+        raise NotImplementedError
+
+    def rebalance(self, order_mgr, symbol, position, target):
+        delta = round(target - position, 8)
+        if delta:
+            order_mgr.place_market_order(symbol, 'BUY' if delta > 0 else 'SELL', format_number(abs(delta)))
+
+
+def moving_average(values, window):
+    """Trailing mean over `window` bars (NaN until the window is full)"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if window <= len(values):
+        sums = np.cumsum(values)
+        sums[window:] = sums[window:] - sums[:-window]
+        out[window - 1:] = sums[window - 1:] / window
+    return out
+
+
+class MovingAverageCross(Strategy):
+    """Long `size` while the fast average is above the slow one, short (or flat if long_only) below"""
+
+    def __init__(self, fast=20, slow=100, size=1.0, long_only=False):
+        super().__init__(fast=fast, slow=slow, size=size, long_only=long_only)
+        self.fast = fast
+        self.slow = slow
+        self.size = size
+        self.long_only = long_only
+
+    def signals(self, klines):
+        fast = moving_average(klines.close, self.fast)
+        slow = moving_average(klines.close, self.slow)
+        below = 0.0 if self.long_only else -self.size
+        target = np.where(fast > slow, self.size, below)
+        target[np.isnan(slow)] = 0.0
+        return target
+
+
+class Backtest:
+    """One symbol's klines, run through any number of strategies"""
+
+    def __init__(self, klines, symbol, fees=None, slippage=None, initial_cash=10000.0):
+        self.klines = klines
+        self.symbol = symbol
+        self.fees = fees
+        self.slippage = slippage
+        self.initial_cash = initial_cash
+
+    def run(self, strategy):
+        client = BacktestClient(self.klines, self.symbol, self.fees, self.slippage)
+        order_mgr = OrderManager(client, client_ids=ClientOrderIds('bt'))
+        targets = np.asarray(strategy.signals(self.klines), dtype=np.float64)
+        if len(targets) != len(self.klines):
+            raise ValueError(f"signals returned {len(targets)} targets for {len(self.klines)} bars")
+        # only the bars where the target changes need an order
+        for bar in np.flatnonzero(np.diff(targets, prepend=0.0)).tolist():
+            client.advance(bar)
+            client.bar = bar
+            strategy.rebalance(order_mgr, self.symbol, client.position, float(targets[bar]))
+        client.advance(len(self.klines) - 1)
+        logger.info(f"Backtest {type(strategy).__name__} {strategy.params} on {self.symbol}: "
+                    f"{len(client.fills)} fills over {len(self.klines)} bars")
+        return BacktestResult(self.klines, client.fills, self.initial_cash)
+
+
+def parameter_grid(grid):
+    """{'fast': [10, 20], 'slow': [100]} -> [{'fast': 10, 'slow': 100}, {'fast': 20, 'slow': 100}]"""
+    return [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+
+
+def _run_job(job):
+    root, symbol, interval, start, end, strategy_cls, params, options = job
+    # each process maps the cached files itself; nothing large is pickled
+    klines = KlineStore(root).range(symbol, interval, start, end)
+    summary = Backtest(klines, symbol, **options).run(strategy_cls(**params)).summary()
+    summary['params'] = params
+    return summary
+
+
+def sweep(strategy_cls, grid, root, symbol, interval, start=None, end=None, max_workers=None, **options):
+    """
+    Backtest strategy_cls for every combination in grid over klines cached
+    under root (a KlineStore directory), on max_workers processes (1 runs
+    in this process); returns one summary per combination, in grid order
+    options (fees, slippage, initial_cash) go to Backtest and must pickle.
+    """
+    jobs = [(root, symbol, interval, start, end, strategy_cls, params, options) for params in parameter_grid(grid)]
+    if max_workers == 1:
+        return [_run_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_run_job, jobs))
@@ -3,18 +3,40 @@ Binance Futures client wrapper
 Handles connection and basic API calls
 """
 
-from binance.client import Client
-from binance.exceptions import BinanceAPIException
+import json
 import logging
+import math
+import threading
+import time
+import zlib
+
+from .errors import api_error, api_errors
+from .exchange_info import ExchangeInfoCache
+from .models import OrderResult
+from .rate_limit import RateLimitGovernor, RateLimitServer
+from .simulator import SimulatedExchange
 
 logger = logging.getLogger(__name__)
 
 
 class BinanceClient:
-    def __init__(self, api_key, api_secret):
+    def __init__(self, api_key, api_secret, exchange_info_ttl=300, exchange_info_path=None,
+                 session_config=None, governor=None, metrics=None, time_sync_interval=60):
         """Initialize Binance Futures client for testnet"""
+        # python-binance and requests are only loaded when a real client is built
+        from .pooled_client import PooledClient
+        from .session import SessionConfig
+
+        self.session_config = session_config or SessionConfig()
+        # Every REST call goes through the governor so we stay under the weight/order limits
+        self.governor = governor or RateLimitGovernor()
+        # Optional Metrics registry: per-request sign/network/decode latency
+        self.metrics = metrics
         try:
-            self.client = Client(api_key, api_secret, testnet=True)
+            # The constructor pings the API, so DNS/TCP/TLS are set up once here
+            # and the pooled connection is reused by every later call
+            self.client = PooledClient(api_key, api_secret, self.session_config, self.governor, metrics,
+                                       testnet=True)
             # Set to futures URL
             self.client.API_URL = 'https://testnet.binancefuture.com'
             logger.info("Connected to Binance Futures Testnet")
@@ -22,61 +44,439 @@ class BinanceClient:
             logger.error(f"Failed to initialize client: {e}")
             raise
 
+        # Symbol rules are fetched once and served from memory until the TTL runs out
+        self.exchange_info = ExchangeInfoCache(
+            self.client.futures_exchange_info,
+            ttl=exchange_info_ttl,
+            cache_path=exchange_info_path
+        )
+        # Optional user-data stream; while it is synced, account/order queries are answered locally
+        self.user_data = None
+        # Server clock offset, refreshed in the background; signed requests use it for `timestamp`
+        self.time_sync = None
+        if time_sync_interval:
+            from .time_sync import TimeSync
+            self.time_sync = TimeSync(lambda: self.client.futures_time()['serverTime'], interval=time_sync_interval)
+            self.client.time_sync = self.time_sync
+            self.time_sync.start()
+
+    def start_user_data(self, **kwargs):
+        """Start the user-data stream (kwargs go to UserDataStream); returns its store"""
+        from .user_data import UserDataStream
+        if self.user_data is None:
+            self.user_data = UserDataStream(self.client, **kwargs)
+            self.user_data.start()
+        return self.user_data.store
+
+    def connection_stats(self):
+        """Connection reuse and per-request timing for this client's session"""
+        from .session import connection_report
+        return connection_report(self.client.adapter, self.client.session_stats)
+
+    def rate_limit_stats(self):
+        """Current rate limit budget per limit type"""
+        return self.governor.metrics()
+
+    def close(self):
+        """Stop the background threads and close pooled connections"""
+        if self.user_data is not None:
+            self.user_data.stop()
+            self.user_data = None
+        if self.time_sync is not None:
+            self.time_sync.stop()
+        self.client.close_connection()
+
+    def _local_store(self):
+        if self.user_data is not None and self.user_data.store.synced:
+            return self.user_data.store
+        return None
+
     def get_account_info(self):
         """Get account balance and info - useful for testing connection"""
+        store = self._local_store()
+        if store is not None:
+            return store.account_info()
         try:
             return self.client.futures_account()
-        except BinanceAPIException as e:
+        except api_errors() as e:
             logger.error(f"API Error getting account info: {e}")
             raise
         except Exception as e:
             logger.error(f"Error getting account info: {e}")
             raise
 
+    def get_order(self, symbol, order_id=None, client_order_id=None):
+        """Order status, from the user-data store when it knows the order, else from REST"""
+        store = self._local_store()
+        if store is not None:
+            order = store.get_order(order_id, client_order_id)
+            if order is not None:
+                return order
+        params = {'symbol': symbol}
+        if order_id is not None:
+            params['orderId'] = order_id
+        else:
+            params['origClientOrderId'] = client_order_id
+        try:
+            return OrderResult.from_response(self.client.futures_get_order(**params))
+        except api_errors() as e:
+            logger.error(f"API Error getting order: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error getting order: {e}")
+            raise
+
     def get_symbol_info(self, symbol):
-        """Get trading rules for a symbol"""
+        """Get trading rules for a symbol (served from the exchange info cache)"""
         try:
-            info = self.client.futures_exchange_info()
-            for s in info['symbols']:
-                if s['symbol'] == symbol:
-                    return s
-            return None
+            return self.exchange_info.get(symbol)
         except Exception as e:
             logger.error(f"Error getting symbol info: {e}")
             return None
 
+    def get_symbol_rules(self, symbol):
+        """Get parsed tickSize/stepSize/minQty/minNotional for a symbol"""
+        try:
+            return self.exchange_info.get_rules(symbol)
+        except Exception as e:
+            logger.error(f"Error getting symbol rules: {e}")
+            return None
+
+
+_shared_clients = {}
+_shared_lock = threading.Lock()
+
+
+def _settings(kwargs):
+    """Comparable form of the BinanceClient kwargs (SessionConfig compared by value)"""
+    from .session import SessionConfig
+    settings = {}
+    for name, value in kwargs.items():
+        if isinstance(value, SessionConfig):
+            value = tuple(sorted(vars(value).items()))
+        settings[name] = value
+    return settings
+
+
+def get_shared_client(api_key, api_secret, **kwargs):
+    """
+    Process-wide BinanceClient per API key
+    Long-running callers should use this so the pooled TLS connections are
+    negotiated once and then reused for the life of the process.
+    Asking for the same key with different settings raises ValueError.
+    """
+    key = (api_key, api_secret)
+    settings = _settings(kwargs)
+    with _shared_lock:
+        entry = _shared_clients.get(key)
+        if entry is None:
+            entry = (BinanceClient(api_key, api_secret, **kwargs), settings)
+            _shared_clients[key] = entry
+        elif entry[1] != settings:
+            raise ValueError("A shared client for this API key already exists with different settings")
+        return entry[0]
+
+
+def close_shared_clients():
+    with _shared_lock:
+        for client, _ in _shared_clients.values():
+            client.close()
+        _shared_clients.clear()
+
+
+def build_mock_exchange_info(num_symbols=300):
+    """
+    Build a futures exchangeInfo payload shaped like the real one
+    Used by the mock client and benchmarks
+    """
+    symbols = []
+    for i in range(num_symbols):
+        base = f"C{i:03d}"
+        price_precision = 1 + i % 5
+        qty_precision = i % 4
+        tick = format(10 ** -price_precision, f'.{price_precision}f')
+        step = '1' if qty_precision == 0 else format(10 ** -qty_precision, f'.{qty_precision}f')
+        symbols.append({
+            'symbol': f"{base}USDT",
+            'pair': f"{base}USDT",
+            'contractType': 'PERPETUAL',
+            'deliveryDate': 4133404800000,
+            'onboardDate': 1569398400000,
+            'status': 'TRADING',
+            'maintMarginPercent': '2.5000',
+            'requiredMarginPercent': '5.0000',
+            'baseAsset': base,
+            'quoteAsset': 'USDT',
+            'marginAsset': 'USDT',
+            'pricePrecision': price_precision,
+            'quantityPrecision': qty_precision,
+            'baseAssetPrecision': 8,
+            'quotePrecision': 8,
+            'underlyingType': 'COIN',
+            'underlyingSubType': [],
+            'settlePlan': 0,
+            'triggerProtect': '0.0500',
+            'liquidationFee': '0.020000',
+            'marketTakeBound': '0.30',
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'minPrice': tick, 'maxPrice': '1000000', 'tickSize': tick},
+                {'filterType': 'LOT_SIZE', 'minQty': step, 'maxQty': '10000000', 'stepSize': step},
+                {'filterType': 'MARKET_LOT_SIZE', 'minQty': step, 'maxQty': '1000000', 'stepSize': step},
+                {'filterType': 'MAX_NUM_ORDERS', 'limit': 200},
+                {'filterType': 'MAX_NUM_ALGO_ORDERS', 'limit': 10},
+                {'filterType': 'MIN_NOTIONAL', 'notional': '5'},
+                {'filterType': 'PERCENT_PRICE', 'multiplierUp': '1.0500',
+                 'multiplierDown': '0.9500', 'multiplierDecimal': '4'},
+            ],
+            'orderTypes': ['LIMIT', 'MARKET', 'STOP', 'STOP_MARKET', 'TAKE_PROFIT',
+                           'TAKE_PROFIT_MARKET', 'TRAILING_STOP_MARKET'],
+            'timeInForce': ['GTC', 'IOC', 'FOK', 'GTX'],
+        })
+    return {
+        'timezone': 'UTC',
+        'serverTime': 1700000000000,
+        'futuresType': 'U_MARGINED',
+        'rateLimits': [
+            {'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': 2400},
+            {'rateLimitType': 'ORDERS', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': 1200},
+            {'rateLimitType': 'ORDERS', 'interval': 'SECOND', 'intervalNum': 10, 'limit': 300},
+        ],
+        'exchangeFilters': [],
+        'assets': [],
+        'symbols': symbols,
+    }
+
+
+_INTERVAL_UNITS = {'m': 60000, 'h': 3600000, 'd': 86400000, 'w': 604800000}
+
+
+def mock_kline(symbol, interval, open_time):
+    """
+    Deterministic synthetic kline row for symbol at open_time
+    Prices follow a slow sine trend plus per-bar noise derived from a hash, so
+    the same bar always has the same values however it is paged.
+    """
+    step = int(interval[:-1]) * _INTERVAL_UNITS[interval[-1]]
+    seed = zlib.crc32(symbol.encode())
+    base = 100 + seed % 900
+
+    def price(t):
+        noise = zlib.crc32(f'{seed}:{t}'.encode()) / 0xFFFFFFFF - 0.5
+        return base * (1 + 0.2 * math.sin(t / 86400000 / 30) + 0.002 * noise)
+
+    open_, close = price(open_time), price(open_time + step)
+    wiggle = zlib.crc32(f'{seed}:{open_time}:v'.encode())
+    high = max(open_, close) * (1 + (wiggle % 100) / 100000)
+    low = min(open_, close) * (1 - (wiggle // 100 % 100) / 100000)
+    volume = 1 + wiggle % 1000 / 10
+    taker = volume * (wiggle // 10000 % 100) / 100
+    return [open_time, f'{open_:.2f}', f'{high:.2f}', f'{low:.2f}', f'{close:.2f}', f'{volume:.3f}',
+            open_time + step - 1, f'{volume * close:.4f}', 1 + wiggle % 500, f'{taker:.3f}',
+            f'{taker * close:.4f}', '0']
+
 
 class MockBinanceClient:
-    """Mock client for dry-run/testing without contacting Binance"""
+    """
+    Mock client for dry-run/testing without contacting Binance
+    Orders go through a SimulatedExchange matching engine (pass your own to
+    seed books or replay trades); latency is seconds or a LatencyModel.
+    inject_fault() makes an endpoint fail before or after it does its work.
+    """
 
-    def __init__(self):
+    def __init__(self, num_symbols=0, exchange_info_ttl=300, exchange_info_path=None, latency=0,
+                 governor=None, rate_limits=None, clock=time.monotonic, exchange=None):
         # OrderManager expects an object where .client.futures_create_order(...) exists
         # We'll set .client to self and implement the minimal methods used by the code.
         self.client = self
+        # Simulated round trip per request, in seconds (or a LatencyModel)
+        self.latency = latency
+        self.exchange = exchange or SimulatedExchange()
+        # Optional client-side governor, fed by synthetic X-MBX-* headers
+        self.governor = governor
+        self.rate_limit_server = None
+        if governor is not None or rate_limits is not None:
+            # clock drives the synthetic server windows; share it with the governor in tests
+            self.rate_limit_server = RateLimitServer(rate_limits, clock)
+        # Keep the payload serialized so every fetch pays the decode cost, like a real response
+        self._exchange_info_json = json.dumps(build_mock_exchange_info(num_symbols))
+        self.exchange_info_calls = 0
+        self.listen_keys = 0
+        # Synthetic klines start at this listing time (ms); kline_requests counts klines calls
+        self.kline_start = 1577836800000
+        self.kline_requests = 0
+        # Injected failures (see inject_fault), consumed in order per endpoint
+        self.faults = []
+        self.exchange_info = ExchangeInfoCache(
+            self.futures_exchange_info,
+            ttl=exchange_info_ttl,
+            cache_path=exchange_info_path
+        )
+
+    def _round_trip(self, weight=1, orders=0):
+        if self.governor is not None:
+            self.governor.acquire(weight, orders)
+        if self.latency:
+            time.sleep(self.latency if isinstance(self.latency, (int, float)) else self.latency.sample())
+        if self.rate_limit_server is not None:
+            status, headers = self.rate_limit_server.record(weight, orders)
+            if self.governor is not None:
+                self.governor.update_from_headers(headers, status)
+            if status == 429:
+                raise api_error(-1003, 'Too many requests; current limit is exceeded.', status=429)
+
+    def inject_fault(self, error, endpoint='futures_create_order', after=False, times=1):
+        """
+        Make the next `times` calls to `endpoint` raise `error`
+        after=False fails before the exchange sees the request; after=True
+        processes it first, like a response lost on the way back.
+        """
+        self.faults.extend([(endpoint, after, error)] * times)
+
+    def _fault(self, endpoint, after):
+        for i, (name, when, error) in enumerate(self.faults):
+            if name == endpoint:
+                if when == after:
+                    del self.faults[i]
+                    raise error
+                return
 
     def futures_create_order(self, **kwargs):
+        self._round_trip(1, 1)
+        if self.faults:
+            self._fault('futures_create_order', False)
+        order = self._fill(kwargs)
+        if self.faults:
+            self._fault('futures_create_order', True)
+        return order
+
+    def futures_place_batch_order(self, **params):
+        # Like the real endpoint: one request, one entry per order, errors inline
+        self._round_trip(5, len(params['batchOrders']))
+        if self.faults:
+            self._fault('futures_place_batch_order', False)
+        responses = []
+        for order in params['batchOrders']:
+            try:
+                responses.append(self._fill(order))
+            except api_errors() as e:
+                responses.append({'code': e.code, 'msg': e.message})
+        if self.faults:
+            self._fault('futures_place_batch_order', True)
+        return responses
+
+    def _fill(self, kwargs):
         # Return a synthetic order response that resembles Binance futures API
-        import time
-        order_type = kwargs.get('type')
-        qty = kwargs.get('quantity')
-        price = kwargs.get('price')
-        executed = str(qty) if order_type == 'MARKET' else '0'
-        avg_price = '100' if order_type == 'MARKET' else '0'
-
-        return {
-            'orderId': int(time.time()),
-            'symbol': kwargs.get('symbol'),
-            'side': kwargs.get('side'),
-            'type': order_type,
-            'status': 'FILLED' if order_type == 'MARKET' else 'NEW',
-            'origQty': str(qty),
-            'executedQty': executed,
-            'price': str(price) if price is not None else '0',
-            'avgPrice': avg_price
-        }
+        if float(kwargs.get('quantity') or 0) <= 0:
+            raise api_error(-4003, 'Quantity less than or equal to zero.')
+        if kwargs.get('type') == 'LIMIT' and kwargs.get('price') is None:
+            raise api_error(-1102, "Mandatory parameter 'price' was not sent, was empty/null, or malformed.")
+        try:
+            order = self.exchange.submit(kwargs.get('symbol'), kwargs.get('side'), kwargs.get('type'),
+                                         kwargs['quantity'], kwargs.get('price'), kwargs.get('timeInForce'),
+                                         kwargs.get('newClientOrderId'))
+        except ValueError:
+            raise api_error(-4116, 'ClientOrderId is duplicated.')
+        return order.to_response()
+
+    def futures_cancel_order(self, **params):
+        self._round_trip(1)
+        order = self.exchange.cancel(params.get('orderId'), params.get('origClientOrderId'))
+        if order is None:
+            raise api_error(-2011, 'Unknown order sent.')
+        return order.to_response()
+
+    def futures_cancel_orders(self, **params):
+        # Like the real endpoint: IDs as JSON lists, at most 10, errors inline
+        self._round_trip(1)
+        if self.faults:
+            self._fault('futures_cancel_orders', False)
+        by_client_id = 'origClientOrderIdList' in params
+        key = 'origClientOrderIdList' if by_client_id else 'orderIdList'
+        ids = params.get(key) or []
+        if isinstance(ids, str):
+            ids = json.loads(ids)
+        if not ids or len(ids) > 10:
+            raise api_error(-1130, f"Data sent for parameter '{key}' is not valid.")
+        responses = []
+        for order_id in ids:
+            order = self.exchange.find(*((None, order_id) if by_client_id else (order_id, None)))
+            if order is not None and order.symbol == params.get('symbol'):
+                order = self.exchange.cancel(order.order_id)
+            else:
+                order = None
+            if order is None:
+                responses.append({'code': -2011, 'msg': 'Unknown order sent.'})
+            else:
+                responses.append(order.to_response())
+        return responses
+
+    def futures_cancel_all_open_orders(self, **params):
+        self._round_trip(1)
+        if self.faults:
+            self._fault('futures_cancel_all_open_orders', False)
+        for order in self.exchange.open_orders(params['symbol']):
+            self.exchange.cancel(order.order_id)
+        return {'code': 200, 'msg': 'The operation of cancel all open order is done.'}
+
+    def futures_get_order(self, **params):
+        self._round_trip(1)
+        if self.faults:
+            self._fault('futures_get_order', False)
+        order = self.exchange.find(params.get('orderId'), params.get('origClientOrderId'))
+        if order is None:
+            raise api_error(-2013, 'Order does not exist.')
+        return order.to_response()
+
+    def futures_get_open_orders(self, **params):
+        self._round_trip(1 if params.get('symbol') else 40)
+        return [order.to_response() for order in self.exchange.open_orders(params.get('symbol'))]
+
+    def futures_order_book(self, **params):
+        self._round_trip(10)
+        return self.exchange.depth(params['symbol'], params.get('limit', 100))
+
+    def futures_klines(self, **params):
+        # Like the real endpoint: up to `limit` klines opening in [startTime, endTime], oldest first
+        limit = min(int(params.get('limit', 500)), 1500)
+        self._round_trip(1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10)
+        self.kline_requests += 1
+        interval = params['interval']
+        step = int(interval[:-1]) * _INTERVAL_UNITS[interval[-1]]
+        start = max(params.get('startTime', self.kline_start), self.kline_start)
+        open_time = -(-start // step) * step
+        end = params.get('endTime')
+        if end is None:
+            end = int(time.time() * 1000)
+        rows = []
+        while open_time <= end and len(rows) < limit:
+            rows.append(mock_kline(params['symbol'], interval, open_time))
+            open_time += step
+        return rows
 
     def futures_account(self):
-        return {'assets': []}
+        self._round_trip(5)
+        return {'assets': [], 'positions': []}
+
+    def futures_stream_get_listen_key(self):
+        self._round_trip(1)
+        self.listen_keys += 1
+        return f"mock-listen-key-{self.listen_keys}"
+
+    def futures_stream_keepalive(self, listenKey):
+        self._round_trip(1)
+        return {}
+
+    def futures_stream_close(self, listenKey):
+        self._round_trip(1)
+        return {}
 
     def futures_exchange_info(self):
-        return {'symbols': []}
+        self._round_trip(1)
+        self.exchange_info_calls += 1
+        return json.loads(self._exchange_info_json)
+
+    def get_symbol_info(self, symbol):
+        return self.exchange_info.get(symbol)
+
+    def get_symbol_rules(self, symbol):
+        return self.exchange_info.get_rules(symbol)
@@ -0,0 +1,196 @@
+"""
+Long-running order daemon
+Keeps one warm client/OrderManager and takes orders as JSON lines over a
+Unix socket or stdin, so each order skips interpreter and client startup
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+
+from .models import to_json
+from .validators import (
+    validate_symbol,
+    validate_side,
+    validate_order_type,
+    validate_quantity,
+    validate_price
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = os.getenv('TRADING_BOT_SOCKET', os.path.join(tempfile.gettempdir(), 'trading_bot.sock'))
+
+
+class OrderDaemon:
+    """
+    Turns one JSON request into one JSON response
+
+    Requests:  {"symbol", "side", "type", "quantity", "price"?}  place one order
+               {"orders": [...]}                                 place a batch
+               {"op": "ping"}                                    health check
+               {"op": "metrics"}                                 Prometheus text (if enabled)
+    Responses: {"ok": true, "order": {...}} / {"ok": true, "results": [...]}
+               {"ok": false, "error": "..."}
+    """
+
+    def __init__(self, order_mgr):
+        self.order_mgr = order_mgr
+        self.handled = 0
+
+    def handle(self, request):
+        self.handled += 1
+        try:
+            if request.get('op') == 'ping':
+                return {'ok': True, 'op': 'pong'}
+            if request.get('op') == 'metrics':
+                metrics = getattr(self.order_mgr, 'metrics', None)
+                if metrics is None:
+                    return {'ok': False, 'error': 'Metrics are not enabled (start the daemon with --stats)'}
+                return {'ok': True, 'metrics': metrics.prometheus()}
+            if 'orders' in request:
+                specs = [self._validate(spec) for spec in request['orders']]
+                return {'ok': True, 'results': self.order_mgr.place_orders(specs)}
+
+            spec = self._validate(request)
+            if spec['type'] == 'MARKET':
+                order = self.order_mgr.place_market_order(spec['symbol'], spec['side'], spec['quantity'])
+            else:
+                order = self.order_mgr.place_limit_order(spec['symbol'], spec['side'], spec['quantity'],
+                                                         spec['price'])
+            return {'ok': True, 'order': order}
+        except ValueError as e:
+            return {'ok': False, 'error': f"Validation error: {e}"}
+        except Exception as e:
+            logger.error(f"Daemon request failed: {e}")
+            return {'ok': False, 'error': str(e)}
+
+    def handle_line(self, line):
+        """One JSON line in, one JSON line out"""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return json.dumps({'ok': False, 'error': f"Invalid JSON: {e}"})
+        return json.dumps(self.handle(request), default=to_json)
+
+    @staticmethod
+    def _validate(spec):
+        order_type = validate_order_type(spec.get('type') or '')
+        result = {
+            'symbol': validate_symbol(spec.get('symbol')),
+            'side': validate_side(spec.get('side') or ''),
+            'type': order_type,
+            'quantity': validate_quantity(spec.get('quantity')),
+        }
+        price = validate_price(spec.get('price'), order_type)
+        if price is not None:
+            result['price'] = price
+        return result
+
+    def serve_stdio(self, stdin, stdout):
+        """Read requests from stdin until EOF, answer on stdout"""
+        for line in stdin:
+            if line.strip():
+                stdout.write(self.handle_line(line) + '\n')
+                stdout.flush()
+
+    def serve_unix(self, path=DEFAULT_SOCKET, ready=None):
+        """Serve on a Unix socket until shutdown() is called (or the process is stopped)"""
+        server = make_unix_server(self, path)
+        self._server = server
+        logger.info(f"Order daemon listening on {path}")
+        if ready is not None:
+            ready.set()
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def shutdown(self):
+        server = getattr(self, '_server', None)
+        if server is not None:
+            server.shutdown()
+
+
+class _LineHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # a connection may send any number of requests, one per line
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            reply = self.server.order_daemon.handle_line(line)
+            self.wfile.write(reply.encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_unix_server(daemon, path):
+    if os.path.exists(path):
+        if is_running(path):
+            raise RuntimeError(f"An order daemon is already listening on {path}")
+        # stale socket left behind by a crashed daemon
+        os.unlink(path)
+    server = _UnixServer(path, _LineHandler)
+    os.chmod(path, 0o600)
+    server.order_daemon = daemon
+    return server
+
+
+class DaemonClient:
+    """Thin client for a running daemon; one connection reused for every request"""
+
+    def __init__(self, path=DEFAULT_SOCKET, timeout=30):
+        self.path = path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(path)
+        self._file = self._sock.makefile('rb')
+        self._lock = threading.Lock()
+
+    def request(self, payload):
+        with self._lock:
+            self._sock.sendall(json.dumps(payload).encode('utf-8') + b'\n')
+            line = self._file.readline()
+        if not line:
+            raise ConnectionError("Order daemon closed the connection")
+        return json.loads(line)
+
+    def submit(self, symbol, side, order_type, quantity, price=None):
+        payload = {'symbol': symbol, 'side': side, 'type': order_type, 'quantity': quantity}
+        if price is not None:
+            payload['price'] = price
+        return self.request(payload)
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def is_running(path=DEFAULT_SOCKET):
+    """True if something is accepting connections on the daemon socket"""
+    if not os.path.exists(path):
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(1)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
@@ -0,0 +1,124 @@
+"""
+Multi-account execution engine
+Runs a portfolio of order intents across accounts and symbols in parallel,
+one OrderManager (and so one client, connection pool and rate limit budget)
+per account
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionEngine:
+    """
+    Parallel order execution for many accounts
+
+    accounts maps an account name to its OrderManager. Intents are order
+    specs as for OrderManager.place_orders plus an 'account' key (default
+    account if missing). Intents for the same (account, symbol) form a lane
+    and are sent one after another in input order; lanes run concurrently
+    on max_workers threads. A failing order only marks its own result, and
+    with halt_after=N an account stops sending after N failures (e.g. a
+    revoked key) while the other accounts carry on.
+    """
+
+    def __init__(self, accounts, max_workers=16, halt_after=None, default_account='default'):
+        self.accounts = dict(accounts)
+        self.max_workers = max_workers
+        self.halt_after = halt_after
+        self.default_account = default_account
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_credentials(cls, credentials, order_manager_factory=None, **kwargs):
+        """
+        Engine with one live client per account
+        credentials maps account name -> (api_key, api_secret); each client is
+        the process-wide shared client for that key. order_manager_factory(client)
+        builds the OrderManager (plain OrderManager by default).
+        """
+        from .client import get_shared_client
+        from .orders import OrderManager
+        factory = order_manager_factory or OrderManager
+        accounts = {name: factory(get_shared_client(key, secret)) for name, (key, secret) in credentials.items()}
+        return cls(accounts, **kwargs)
+
+    def lanes(self, intents):
+        """{(account, symbol): [intent index, ...]} in input order"""
+        lanes = {}
+        for i, intent in enumerate(intents):
+            account = intent.get('account') or self.default_account
+            lanes.setdefault((account, intent['symbol']), []).append(i)
+        return lanes
+
+    def run(self, intents):
+        """
+        Execute every intent; returns a report dict
+        'results' has one {'intent', 'order', 'error'} per intent in input
+        order; 'accounts' has placed/failed/halted per account; plus totals,
+        wall time and orders per second.
+        """
+        intents = list(intents)
+        results = [None] * len(intents)
+        self._failures = {}
+        lanes = self.lanes(intents)
+        logger.info(f"Executing {len(intents)} intents in {len(lanes)} lanes across "
+                    f"{len({account for account, _ in lanes})} accounts")
+
+        start = time.perf_counter()
+        if lanes:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(lanes))) as pool:
+                futures = [pool.submit(self._run_lane, account, indexes, intents, results)
+                           for (account, _), indexes in lanes.items()]
+                for future in futures:
+                    future.result()
+        elapsed = time.perf_counter() - start
+        return self._report(results, elapsed)
+
+    def _run_lane(self, account, indexes, intents, results):
+        order_mgr = self.accounts.get(account)
+        for i in indexes:
+            intent = intents[i]
+            if order_mgr is None:
+                results[i] = {'intent': intent, 'order': None, 'error': f"unknown account {account}"}
+                continue
+            if self.halt_after is not None and self._failures.get(account, 0) >= self.halt_after:
+                results[i] = {'intent': intent, 'order': None, 'error': f"account {account} halted"}
+                continue
+            try:
+                if intent['type'] == 'MARKET':
+                    order = order_mgr.place_market_order(intent['symbol'], intent['side'], intent['quantity'])
+                else:
+                    order = order_mgr.place_limit_order(intent['symbol'], intent['side'], intent['quantity'],
+                                                        intent['price'])
+                results[i] = {'intent': intent, 'order': order, 'error': None}
+            except Exception as e:
+                with self._lock:
+                    self._failures[account] = self._failures.get(account, 0) + 1
+                results[i] = {'intent': intent, 'order': None, 'error': str(getattr(e, 'message', None) or e)}
+
+    def _report(self, results, elapsed):
+        accounts = {}
+        for result in results:
+            account = result['intent'].get('account') or self.default_account
+            stats = accounts.setdefault(account, {'placed': 0, 'failed': 0, 'halted': False})
+            stats['placed' if result['error'] is None else 'failed'] += 1
+        for account, stats in accounts.items():
+            stats['halted'] = self.halt_after is not None and self._failures.get(account, 0) >= self.halt_after
+        placed = sum(stats['placed'] for stats in accounts.values())
+        report = {
+            'results': results,
+            'accounts': accounts,
+            'placed': placed,
+            'failed': len(results) - placed,
+            'seconds': elapsed,
+            'orders_per_second': placed / elapsed if elapsed > 0 else 0.0,
+        }
+        logger.info(f"Execution finished: {placed} placed, {len(results) - placed} failed in {elapsed:.3f}s "
+                    f"({report['orders_per_second']:.0f} orders/s)")
+        return report
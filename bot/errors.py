@@ -0,0 +1,28 @@
+"""
+Helpers for python-binance exceptions that don't import python-binance
+Importing binance.exceptions loads the whole client (requests, aiohttp,
+dateparser...), so dry runs and validation-only callers avoid it
+"""
+
+import json
+import sys
+
+
+def api_errors():
+    """
+    Exception types to catch as Binance API errors
+    A BinanceAPIException can only have been raised if python-binance is already
+    loaded, so when it isn't this is an empty tuple (which matches nothing).
+    Meant for `except api_errors() as e:` - the expression is only evaluated
+    when an exception is actually being handled.
+    """
+    module = sys.modules.get('binance.exceptions')
+    if module is None:
+        return ()
+    return (module.BinanceAPIException,)
+
+
+def api_error(code, msg, status=400):
+    """Build the same exception python-binance raises for an API error response"""
+    from binance.exceptions import BinanceAPIException
+    return BinanceAPIException(None, status, json.dumps({'code': code, 'msg': msg}))
@@ -0,0 +1,210 @@
+"""
+Exchange info cache
+Keeps symbol trading rules in memory so lookups don't hit the REST API every time
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from .models import SymbolRules, loads
+
+logger = logging.getLogger(__name__)
+
+
+def parse_symbol_rules(symbol_info):
+    """
+    Pull the filters we care about out of one exchangeInfo symbol entry
+    Values are kept as the exchange strings so no float rounding sneaks in
+    """
+    rules = {}
+    for f in symbol_info.get('filters', []):
+        filter_type = f.get('filterType')
+        if filter_type == 'PRICE_FILTER':
+            rules['tick_size'] = f.get('tickSize')
+            rules['min_price'] = f.get('minPrice')
+            rules['max_price'] = f.get('maxPrice')
+        elif filter_type == 'LOT_SIZE':
+            rules['step_size'] = f.get('stepSize')
+            rules['min_qty'] = f.get('minQty')
+            rules['max_qty'] = f.get('maxQty')
+        elif filter_type == 'MARKET_LOT_SIZE':
+            rules['market_step_size'] = f.get('stepSize')
+            rules['market_min_qty'] = f.get('minQty')
+            rules['market_max_qty'] = f.get('maxQty')
+        elif filter_type == 'MIN_NOTIONAL':
+            # futures uses 'notional', spot uses 'minNotional'
+            rules['min_notional'] = f.get('notional', f.get('minNotional'))
+    return SymbolRules(symbol_info['symbol'], **rules)
+
+
+class ExchangeInfoCache:
+    """
+    Symbol-indexed cache of futures exchange info
+
+    fetch is a callable returning the exchangeInfo payload (usually
+    client.futures_exchange_info). The payload is downloaded once, indexed by
+    symbol and refreshed after ttl seconds. If cache_path is set the raw
+    symbol list is also kept on disk so a warm start skips the network.
+    If a refresh fails the old index keeps being served and the refresh is
+    retried after retry_interval seconds.
+    """
+
+    def __init__(self, fetch, ttl=300, cache_path=None, clock=time.time, retry_interval=30):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self.retry_interval = retry_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._symbols = {}
+        self._rules = {}
+        self._loaded_at = None
+        self._retry_at = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.disk_loads = 0
+
+    def get(self, symbol):
+        """Return the raw exchangeInfo entry for symbol, or None if unknown"""
+        self._ensure_fresh()
+        return self._symbols.get(symbol)
+
+    def get_rules(self, symbol):
+        """Return parsed filters (tickSize, stepSize, minQty, minNotional) for symbol"""
+        self._ensure_fresh()
+        return self._rules.get(symbol)
+
+    def lookup(self, symbol):
+        """Index lookup only: no freshness check, no hit/miss accounting"""
+        return self._symbols.get(symbol)
+
+    def lookup_rules(self, symbol):
+        return self._rules.get(symbol)
+
+    def symbols(self):
+        """All known symbol names"""
+        self._ensure_fresh()
+        return list(self._symbols)
+
+    def is_stale(self):
+        """True when a refresh is due (TTL expired and not backing off after a failure)"""
+        if self._loaded_at is None:
+            return True
+        now = self._clock()
+        return now - self._loaded_at >= self.ttl and now >= self._retry_at
+
+    def refresh_failed(self, error):
+        """
+        Record a failed refresh
+        Re-raises if there is no index to fall back on, otherwise the old one
+        stays in use until the next retry.
+        """
+        if not self._symbols:
+            raise error
+        self.refresh_failures += 1
+        self._retry_at = self._clock() + self.retry_interval
+        logger.warning(f"Exchange info refresh failed, serving cached copy "
+                       f"(retry in {self.retry_interval}s): {error}")
+
+    def _ensure_fresh(self):
+        if not self.is_stale():
+            self.hits += 1
+            return
+        with self._lock:
+            # another thread may have refreshed while we waited
+            if not self.is_stale():
+                self.hits += 1
+                return
+            self.misses += 1
+            if self._loaded_at is None and self._load_from_disk():
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                self.refresh_failed(e)
+
+    def refresh(self):
+        """Download exchange info now and rebuild the index"""
+        self.update(self._fetch())
+
+    def update(self, info):
+        """
+        Rebuild the index from an exchangeInfo payload fetched elsewhere
+        (the async client downloads it itself and hands it over)
+        """
+        now = self._clock()
+        self._build_index(info['symbols'], now)
+        self.refreshes += 1
+        logger.info(f"Exchange info refreshed: {len(self._symbols)} symbols")
+        if self.cache_path:
+            self._save_to_disk(info['symbols'], now)
+
+    def load_cached(self):
+        """Try a warm start from disk; returns True if a fresh on-disk copy was loaded"""
+        if self._loaded_at is not None:
+            return False
+        with self._lock:
+            return self._load_from_disk()
+
+    def invalidate(self):
+        """Force the next lookup to refresh"""
+        self._loaded_at = None
+
+    def stats(self):
+        return {
+            'symbols': len(self._symbols),
+            'hits': self.hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'refresh_failures': self.refresh_failures,
+            'disk_loads': self.disk_loads,
+            'age': None if self._loaded_at is None else self._clock() - self._loaded_at,
+        }
+
+    def _build_index(self, symbols, loaded_at):
+        index = {}
+        rules = {}
+        for s in symbols:
+            index[s['symbol']] = s
+            rules[s['symbol']] = parse_symbol_rules(s)
+        # swap in one go so readers never see a half-built index
+        self._symbols = index
+        self._rules = rules
+        self._loaded_at = loaded_at
+
+    def _load_from_disk(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return False
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = loads(f.read())
+            fetched_at = data['fetched_at']
+            if self._clock() - fetched_at >= self.ttl:
+                return False
+            self._build_index(data['symbols'], fetched_at)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable exchange info cache {self.cache_path}: {e}")
+            return False
+        self.disk_loads += 1
+        logger.info(f"Exchange info loaded from {self.cache_path}: {len(self._symbols)} symbols")
+        return True
+
+    def _save_to_disk(self, symbols, fetched_at):
+        directory = os.path.dirname(self.cache_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = self.cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'fetched_at': fetched_at, 'symbols': symbols}, f)
+            # atomic swap so a crash never leaves a truncated cache behind
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write exchange info cache {self.cache_path}: {e}")
@@ -0,0 +1,345 @@
+"""
+Historical klines
+Downloads futures klines in parallel pages and keeps them on disk per symbol
+and interval as one memory-mapped .npy file per column, so analyses and
+backtests read local arrays instead of calling REST again
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Binance futures returns at most 1500 klines per request
+MAX_PAGE = 1500
+
+INTERVAL_MS = {
+    '1m': 60000, '3m': 180000, '5m': 300000, '15m': 900000, '30m': 1800000,
+    '1h': 3600000, '2h': 7200000, '4h': 14400000, '6h': 21600000, '8h': 28800000, '12h': 43200000,
+    '1d': 86400000, '3d': 259200000, '1w': 604800000,
+}
+
+# column -> (dtype, index in the REST kline row)
+COLUMNS = {
+    'open_time': ('<i8', 0),
+    'open': ('<f8', 1),
+    'high': ('<f8', 2),
+    'low': ('<f8', 3),
+    'close': ('<f8', 4),
+    'volume': ('<f8', 5),
+    'quote_volume': ('<f8', 7),
+    'trades': ('<i8', 8),
+    'taker_buy_volume': ('<f8', 9),
+    'taker_buy_quote_volume': ('<f8', 10),
+}
+
+# .npy v1.0 header padded to a fixed size, so appending rows only rewrites the shape in place
+_HEADER_SIZE = 128
+
+# klines closed less than this long ago may not be published yet, so a
+# missing one is not recorded as a permanent hole
+SETTLE_MS = 60000
+
+
+def interval_ms(interval):
+    try:
+        return INTERVAL_MS[interval]
+    except KeyError:
+        raise ValueError(f"Unsupported kline interval: {interval}")
+
+
+def _header(dtype, rows):
+    text = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (dtype, rows)
+    body = text.ljust(_HEADER_SIZE - 11) + '\n'
+    return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(body)) + body.encode('latin1')
+
+
+def merge_ranges(ranges):
+    """Sorted, non-overlapping [start, end) ranges covering the same times"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        elif start < end:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def subtract_ranges(ranges, holes):
+    """The parts of sorted ranges not inside any of the sorted, merged holes"""
+    result = []
+    for start, end in ranges:
+        for hole_start, hole_end in holes:
+            if hole_end <= start or hole_start >= end:
+                continue
+            if hole_start > start:
+                result.append((start, hole_start))
+            start = max(start, hole_end)
+            if start >= end:
+                break
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+def rows_to_columns(rows):
+    """REST kline rows -> {column: ndarray}"""
+    table = np.array(rows, dtype=object).reshape(len(rows), -1)
+    return {name: table[:, index].astype(dtype) for name, (dtype, index) in COLUMNS.items()}
+
+
+class Klines:
+    """
+    Column arrays for a run of klines (open_time in ms, prices/volumes as float64)
+    Arrays returned by KlineStore are read-only views into the memory-mapped
+    files, not copies.
+    """
+
+    __slots__ = tuple(COLUMNS)
+
+    def __init__(self, columns):
+        for name in COLUMNS:
+            setattr(self, name, columns[name])
+
+    def __len__(self):
+        return len(self.open_time)
+
+    def columns(self):
+        return {name: getattr(self, name) for name in COLUMNS}
+
+
+class KlineStore:
+    """
+    On-disk kline cache: root/SYMBOL/INTERVAL/<column>.npy
+
+    update() downloads whatever part of a time range is missing (before,
+    after or inside what is stored), split into pages of page_limit klines
+    fetched on max_workers threads. fetch(**params) defaults to the
+    client's futures_klines (BinanceClient or MockBinanceClient). Rows are
+    kept sorted by open_time and unique.
+    New rows after the last stored one are appended in place; anything
+    else merges into fresh files swapped in atomically.
+
+    Times the exchange has no klines for (before the symbol was listed,
+    trading halts) are remembered in meta.json next to the columns: the
+    first listed open time and the ranges known to be empty. gaps() leaves
+    them out, so they are downloaded once, not on every update().
+    """
+
+    def __init__(self, root, client=None, fetch=None, max_workers=4, page_limit=MAX_PAGE, clock=time.time):
+        self.root = root
+        self.fetch = fetch or (client.client.futures_klines if client is not None else None)
+        self.max_workers = max_workers
+        self.page_limit = min(page_limit, MAX_PAGE)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def _dir(self, symbol, interval):
+        return os.path.join(self.root, symbol, interval)
+
+    def _meta_path(self, symbol, interval):
+        return os.path.join(self._dir(symbol, interval), 'meta.json')
+
+    def meta(self, symbol, interval):
+        """{'listed': first open time or None, 'empty': [(start, end)]} known for symbol/interval"""
+        try:
+            with open(self._meta_path(symbol, interval)) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return {'listed': None, 'empty': []}
+        return {'listed': meta.get('listed'), 'empty': [tuple(r) for r in meta.get('empty', [])]}
+
+    def _save_meta(self, symbol, interval, listed=None, empty=()):
+        with self._lock:
+            meta = self.meta(symbol, interval)
+            if listed is not None:
+                meta['listed'] = listed
+            meta['empty'] = merge_ranges(meta['empty'] + list(empty))
+            if meta['listed'] is not None:
+                # everything before the listing is implied
+                meta['empty'] = [r for r in meta['empty'] if r[1] > meta['listed']]
+            directory = self._dir(symbol, interval)
+            os.makedirs(directory, exist_ok=True)
+            path = self._meta_path(symbol, interval)
+            with open(path + '.tmp', 'w') as f:
+                json.dump({'listed': meta['listed'], 'empty': meta['empty']}, f)
+            os.replace(path + '.tmp', path)
+
+    # -- reading ---------------------------------------------------------
+
+    def load(self, symbol, interval):
+        """Every stored kline (memory-mapped), or None if nothing is stored"""
+        directory = self._dir(symbol, interval)
+        if not os.path.exists(os.path.join(directory, 'open_time.npy')):
+            return None
+        columns = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r') for name in COLUMNS}
+        # a crash between column appends can leave some columns longer
+        rows = min(len(column) for column in columns.values())
+        return Klines({name: column[:rows] for name, column in columns.items()})
+
+    def range(self, symbol, interval, start=None, end=None):
+        """Klines with start <= open_time < end, as views (no copy); empty if nothing is stored"""
+        klines = self.load(symbol, interval)
+        if klines is None:
+            return Klines({name: np.empty(0, dtype) for name, (dtype, _) in COLUMNS.items()})
+        times = klines.open_time
+        lo = 0 if start is None else int(np.searchsorted(times, start, 'left'))
+        hi = len(times) if end is None else int(np.searchsorted(times, end, 'left'))
+        return Klines({name: column[lo:hi] for name, column in klines.columns().items()})
+
+    def gaps(self, symbol, interval, start, end):
+        """
+        [(start, end)] ranges of open times in [start, end) with no stored
+        kline, leaving out times known to have no klines at all
+        """
+        step = interval_ms(interval)
+        meta = self.meta(symbol, interval)
+        if meta['listed'] is not None:
+            start = max(start, meta['listed'])
+        start = -(-start // step) * step
+        times = np.asarray(self.range(symbol, interval, start, end).open_time)
+        if not len(times):
+            gaps = [(start, end)] if start < end else []
+        else:
+            gaps = []
+            if times[0] > start:
+                gaps.append((start, int(times[0])))
+            for i in np.flatnonzero(np.diff(times) > step):
+                gaps.append((int(times[i]) + step, int(times[i + 1])))
+            if times[-1] + step < end:
+                gaps.append((int(times[-1]) + step, end))
+        return subtract_ranges(gaps, meta['empty'])
+
+    # -- downloading -----------------------------------------------------
+
+    def update(self, symbol, interval, start, end=None):
+        """
+        Download the klines missing from [start, end) (end defaults to the
+        last closed kline); returns the number of klines added
+        """
+        step = interval_ms(interval)
+        now = int(self._clock() * 1000)
+        end = min(end if end is not None else now, now // step * step)
+        gaps = self.gaps(symbol, interval, start, end)
+        span = self.page_limit * step
+        pages = [(page, min(page + span, gap_end)) for gap_start, gap_end in gaps
+                 for page in range(gap_start, gap_end, span)]
+        if not pages:
+            return 0
+        if self.fetch is None:
+            raise ValueError("KlineStore has no client to download from")
+        logger.info(f"Downloading {symbol} {interval}: {len(gaps)} missing ranges, {len(pages)} pages")
+
+        def get(page):
+            s, e = page
+            return self.fetch(symbol=symbol, interval=interval, startTime=s, endTime=e - 1, limit=self.page_limit)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pages))) as pool:
+            results = list(pool.map(get, pages))
+        self.requests += len(pages)
+        self._record_empty(symbol, interval, pages, results, step, now)
+        rows = [row for result in results for row in result if start <= row[0] < end]
+        if not rows:
+            return 0
+        return self.write(symbol, interval, rows_to_columns(rows))
+
+    def _record_empty(self, symbol, interval, pages, results, step, now):
+        """
+        Remember the parts of each page that came back without klines
+        A page shorter than page_limit covers its whole requested range, so
+        whatever it is missing does not exist. If the first page starts in
+        such a hole, one extra request (from startTime 0) finds the listing.
+        """
+        settled = ((now - SETTLE_MS - step) // step + 1) * step
+        empty = []
+        for (page_start, page_end), result in zip(pages, results):
+            if len(result) >= self.page_limit:
+                continue
+            page_end = min(page_end, settled)
+            cursor = page_start
+            for row in result:
+                if row[0] > cursor:
+                    empty.append((cursor, min(row[0], page_end)))
+                cursor = max(cursor, row[0] + step)
+            if cursor < page_end:
+                empty.append((cursor, page_end))
+        empty = [(s, e) for s, e in merge_ranges(empty) if s < e]
+        if not empty:
+            return
+        listed = None
+        first = pages[0][0]
+        if self.meta(symbol, interval)['listed'] is None and empty[0][0] == first:
+            stored = self.load(symbol, interval)
+            if stored is None or not len(stored) or stored.open_time[0] > first:
+                probe = self.fetch(symbol=symbol, interval=interval, startTime=0, limit=1)
+                self.requests += 1
+                if probe:
+                    listed = int(probe[0][0])
+        logger.info(f"{symbol} {interval}: {len(empty)} ranges have no klines"
+                    + (f", listed at {listed}" if listed is not None else ""))
+        self._save_meta(symbol, interval, listed, empty)
+
+    def write(self, symbol, interval, columns):
+        """Store kline columns (any order, may overlap what is stored); returns the number of new rows"""
+        with self._lock:
+            order = np.argsort(columns['open_time'], kind='stable')
+            columns = {name: np.asarray(column)[order] for name, column in columns.items()}
+            times, first = np.unique(columns['open_time'], return_index=True)
+            columns = {name: column[first] for name, column in columns.items()}
+
+            stored = self.load(symbol, interval)
+            if stored is None or not len(stored) or times[0] > stored.open_time[-1]:
+                rows = 0 if stored is None else len(stored)
+                self._append(symbol, interval, columns, rows)
+                added = len(times)
+            else:
+                existing = stored.columns()
+                keep = ~np.isin(times, existing['open_time'])
+                added = int(keep.sum())
+                if added:
+                    merged = {name: np.concatenate([existing[name], columns[name][keep]]) for name in COLUMNS}
+                    order = np.argsort(merged['open_time'], kind='stable')
+                    self._rewrite(symbol, interval, {name: column[order] for name, column in merged.items()})
+        logger.info(f"Stored {added} {symbol} {interval} klines")
+        return added
+
+    def _append(self, symbol, interval, columns, rows):
+        directory = self._dir(symbol, interval)
+        os.makedirs(directory, exist_ok=True)
+        count = len(columns['open_time'])
+        for name, (dtype, _) in COLUMNS.items():
+            path = os.path.join(directory, f'{name}.npy')
+            if rows == 0:
+                with open(path, 'wb') as f:
+                    f.write(_header(dtype, 0))
+            with open(path, 'r+b') as f:
+                # rows past the header's count (a crashed append) are overwritten
+                f.seek(_HEADER_SIZE + rows * 8)
+                f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+                f.seek(0)
+                f.write(_header(dtype, rows + count))
+
+    def _rewrite(self, symbol, interval, columns):
+        directory = self._dir(symbol, interval)
+        count = len(columns['open_time'])
+        for name, (dtype, _) in COLUMNS.items():
+            path = os.path.join(directory, f'{name}.npy')
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(_header(dtype, count))
+                f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            # readers keep their maps of the old file
+            os.replace(tmp_path, path)
@@ -0,0 +1,269 @@
+"""
+Persistent order journal
+Append-only SQLite (WAL) log of every submission and exchange response, with
+batched commits and a replay that rebuilds order state on startup without
+touching the REST API
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from .models import OrderResult, to_json
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    ref INTEGER,
+    order_id INTEGER,
+    client_order_id TEXT,
+    symbol TEXT,
+    side TEXT,
+    type TEXT,
+    status TEXT,
+    price TEXT,
+    orig_qty TEXT,
+    executed_qty TEXT,
+    payload TEXT
+);
+CREATE INDEX IF NOT EXISTS events_order_id ON events(order_id);
+CREATE INDEX IF NOT EXISTS events_client_order_id ON events(client_order_id);
+"""
+
+_INSERT = ("INSERT INTO events (seq, ts, kind, ref, order_id, client_order_id, symbol, side, type, status, "
+           "price, orig_qty, executed_qty, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+
+class OrderJournal:
+    """
+    Order journal backed by SQLite in WAL mode
+
+    kind is 'submit' (the params we sent), 'response' (what the exchange
+    returned, ref = the submit seq), 'error' (a failed submit) or 'update'
+    (later state, e.g. a cancel or a fill). Rows are committed in batches:
+    after batch_size rows or flush_interval seconds, whichever comes first,
+    with synchronous=FULL so each commit is one fsync of the WAL. A crash
+    loses at most the last uncommitted batch; committed batches are always
+    replayed whole. A submission with neither a response nor an error (the
+    process died while it was in flight) stays in unresolved() until it is
+    settled by looking it up on the exchange.
+    """
+
+    def __init__(self, path, batch_size=256, flush_interval=0.05, clock=time.time):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT MAX(seq) FROM events").fetchone()
+        self._seq = row[0] or 0
+        self._pending = []
+        self.commits = 0
+        self.orders = {}
+        self._by_client_id = {}
+        # submit seq -> params of submissions with no response or error yet
+        self._unresolved = {}
+        self._closed = False
+        self._flusher = None
+        if flush_interval:
+            self._wake = threading.Event()
+            self._flusher = threading.Thread(target=self._flush_loop, name='order-journal', daemon=True)
+            self._flusher.start()
+
+    def _append(self, kind, ref, order_id, client_order_id, symbol, side, order_type, status,
+                price, orig_qty, executed_qty, payload):
+        with self._lock:
+            if self._closed:
+                raise ValueError("Order journal is closed")
+            self._seq += 1
+            seq = self._seq
+            self._pending.append((seq, self._clock(), kind, ref, order_id, client_order_id, symbol, side,
+                                  order_type, status, price, orig_qty, executed_qty,
+                                  json.dumps(payload, default=to_json)))
+            if len(self._pending) >= self.batch_size:
+                self._commit()
+        return seq
+
+    def _commit(self):
+        if not self._pending:
+            return
+        conn = self._conn
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(_INSERT, self._pending)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            # keep the batch for the next commit
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        self._pending = []
+        self.commits += 1
+
+    def _flush_loop(self):
+        while not self._wake.wait(self.flush_interval):
+            with self._lock:
+                if self._closed:
+                    return
+                try:
+                    self._commit()
+                except sqlite3.Error as e:
+                    logger.error("Order journal commit failed: %s", e)
+
+    def flush(self):
+        """Commit everything recorded so far"""
+        with self._lock:
+            self._commit()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._commit()
+            self._closed = True
+            self._conn.close()
+        if self._flusher is not None:
+            self._wake.set()
+            self._flusher.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- recording -------------------------------------------------------
+
+    def record_submission(self, params):
+        """Log the params of an order about to be sent; returns its seq for the response"""
+        seq = self._append('submit', None, None, params.get('newClientOrderId'), params.get('symbol'),
+                           params.get('side'), params.get('type'), None, _text(params.get('price')),
+                           _text(params.get('quantity')), None, params)
+        self._unresolved[seq] = params
+        return seq
+
+    def record_response(self, ref, order):
+        """Log the exchange's answer to submission `ref` and update the in-memory state"""
+        self._unresolved.pop(ref, None)
+        self._apply(order)
+        return self._append('response', ref, order.get('orderId'), order.get('clientOrderId'),
+                            order.get('symbol'), order.get('side'), order.get('type'), order.get('status'),
+                            order.get('price'), order.get('origQty'), order.get('executedQty'), order)
+
+    def record_update(self, order):
+        """Log a later state of a known order (cancel, fill, query result)"""
+        self._apply(order)
+        return self._append('update', None, order.get('orderId'), order.get('clientOrderId'),
+                            order.get('symbol'), order.get('side'), order.get('type'), order.get('status'),
+                            order.get('price'), order.get('origQty'), order.get('executedQty'), order)
+
+    def record_error(self, ref, error):
+        """Log that submission `ref` failed"""
+        self._unresolved.pop(ref, None)
+        return self._append('error', ref, None, None, None, None, None, 'ERROR', None, None, None,
+                            {'error': str(error), 'code': getattr(error, 'code', None)})
+
+    # -- state -----------------------------------------------------------
+
+    def _apply(self, order):
+        order_id = order.get('orderId')
+        if order_id is None:
+            return
+        state = OrderResult(order_id, order.get('clientOrderId'), order.get('symbol'), order.get('side'),
+                            order.get('type'), status=order.get('status'), price=order.get('price'),
+                            orig_qty=order.get('origQty'), executed_qty=order.get('executedQty'))
+        self.orders[order_id] = state
+        if state.client_order_id:
+            self._by_client_id[state.client_order_id] = order_id
+
+    def replay(self):
+        """
+        Rebuild the in-memory order state from the journal
+        Only the indexed columns are read; JSON is decoded only for
+        unresolved submissions. Returns the number of orders known afterwards.
+        """
+        self.flush()
+        orders = {}
+        by_client_id = {}
+        # submit seq -> client order ID, until a response, error or order row settles it
+        submits = {}
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT seq, kind, ref, order_id, client_order_id, symbol, side, type, status, price, orig_qty, "
+                "executed_qty FROM events ORDER BY seq")
+            for seq, kind, ref, order_id, client_id, symbol, side, order_type, status, price, orig_qty, \
+                    executed in cursor:
+                if kind == 'submit':
+                    submits[seq] = client_id
+                    continue
+                if ref is not None:
+                    submits.pop(ref, None)
+                if order_id is None:
+                    continue
+                orders[order_id] = OrderResult(order_id, client_id, symbol, side, order_type, status=status,
+                                               price=price, orig_qty=orig_qty, executed_qty=executed)
+                if client_id:
+                    by_client_id[client_id] = order_id
+            unresolved = {}
+            for seq, client_id in submits.items():
+                if client_id in by_client_id:
+                    # settled by a later update
+                    continue
+                payload = self._conn.execute("SELECT payload FROM events WHERE seq = ?", (seq,)).fetchone()[0]
+                unresolved[seq] = json.loads(payload)
+        self.orders = orders
+        self._by_client_id = by_client_id
+        self._unresolved = unresolved
+        logger.info("Order journal replayed: %d orders, %d open, %d unresolved submissions", len(orders),
+                    len(self.open_orders()), len(unresolved))
+        return len(orders)
+
+    def unresolved(self):
+        """
+        Submissions with no response or error yet, {client order ID: {'seq', 'params'}}
+        After a replay these are orders sent just before a crash: they may or
+        may not be on the exchange.
+        """
+        return {params.get('newClientOrderId'): {'seq': seq, 'params': params}
+                for seq, params in list(self._unresolved.items())}
+
+    def get(self, order_id=None, client_order_id=None):
+        """Latest known state of an order (in memory, O(1))"""
+        if order_id is None:
+            order_id = self._by_client_id.get(client_order_id)
+        return self.orders.get(order_id)
+
+    def open_orders(self, symbol=None):
+        return [o for o in self.orders.values()
+                if o.status in OPEN_STATUSES and (symbol is None or o.symbol == symbol)]
+
+    def history(self, order_id=None, client_order_id=None):
+        """Every journal row for one order, oldest first (uses the indexes)"""
+        self.flush()
+        with self._lock:
+            if order_id is not None:
+                rows = self._conn.execute(
+                    "SELECT seq, ts, kind, payload FROM events WHERE order_id = ? "
+                    "OR seq IN (SELECT ref FROM events WHERE order_id = ?) ORDER BY seq",
+                    (order_id, order_id)).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT seq, ts, kind, payload FROM events WHERE client_order_id = ? ORDER BY seq",
+                    (client_order_id,)).fetchall()
+        return [{'seq': seq, 'ts': ts, 'kind': kind, 'data': json.loads(payload)} for seq, ts, kind, payload in rows]
+
+
+def _text(value):
+    return None if value is None else str(value)
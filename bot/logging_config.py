@@ -1,14 +1,81 @@
 # Simple logging: writes to a timestamped file and console.
 # Idempotent and closes handlers on exit to avoid leaking open files.
+# With queued=True the order path only puts records on a queue; a background
+# listener thread formats them and does the file/console I/O.
 
+import atexit
+import json
 import logging
+import logging.handlers
 import os
-import atexit
-from datetime import datetime
+import queue
+from datetime import datetime, timezone
 
 
 _LOG_FILENAME = None
 _HANDLERS_ADDED = False
+_LISTENER = None
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg (+ exc, extra 'data')"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='microseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        data = getattr(record, 'data', None)
+        if data is not None:
+            entry['data'] = data
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues the record untouched
+    The stock handler formats the message in the calling thread; here the
+    %-args are merged by the listener, so log arguments must not be mutated
+    after the call (ours are strings and numbers).
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def make_file_handler(filename, max_bytes=0, backup_count=5, when=None):
+    """Plain, size-rotated (max_bytes) or time-rotated (when='midnight', 'H', ...) file handler"""
+    if when:
+        return logging.handlers.TimedRotatingFileHandler(filename, when=when, backupCount=backup_count,
+                                                         delay=True, utc=True)
+    if max_bytes:
+        return logging.handlers.RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count,
+                                                    delay=True)
+    return logging.FileHandler(filename, delay=True)
+
+
+def attach_handlers(logger, handlers, queued=False):
+    """
+    Add handlers to a logger, directly or behind a queue
+    Returns the started QueueListener when queued, else None.
+    """
+    if not queued:
+        for h in handlers:
+            logger.addHandler(h)
+        return None
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.addHandler(DeferredQueueHandler(log_queue))
+    listener.start()
+    return listener
+
 
 # Cleanup: remove and close handlers when the program exits
 def _close_handlers(root, handlers):
@@ -20,9 +87,26 @@ def _close_handlers(root, handlers):
             pass
 
 
-def setup_logging():
+def stop_logging():
+    """Drain the queue (if queued) and close every handler setup_logging added"""
+    global _LISTENER
+    if _LISTENER is not None:
+        # stop() processes everything still queued before returning
+        root = logging.getLogger()
+        for h in list(root.handlers):
+            if isinstance(h, DeferredQueueHandler) and h.queue is _LISTENER.queue:
+                root.removeHandler(h)
+        _LISTENER.stop()
+        _close_handlers(root, _LISTENER.handlers)
+        _LISTENER = None
+
+
+def setup_logging(queued=False, json_lines=False, max_bytes=0, backup_count=5, when=None):
     # Set up logging once: write to a timestamped file and to the console
-    global _LOG_FILENAME, _HANDLERS_ADDED
+    # queued=True moves formatting and I/O to a listener thread
+    # json_lines=True writes one JSON object per line to the file (console stays readable)
+    # max_bytes / when rotate the file by size or by time
+    global _LOG_FILENAME, _HANDLERS_ADDED, _LISTENER
 
     root = logging.getLogger()
     if _HANDLERS_ADDED:
@@ -36,28 +120,30 @@ def setup_logging():
     if not os.path.exists('logs'):
         os.makedirs('logs')
 
-    _LOG_FILENAME = f"logs/trading_bot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    suffix = 'jsonl' if json_lines else 'log'
+    _LOG_FILENAME = f"logs/trading_bot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{suffix}"
 
-    fh = logging.FileHandler(_LOG_FILENAME, delay=True)
+    fh = make_file_handler(_LOG_FILENAME, max_bytes, backup_count, when)
     sh = logging.StreamHandler()
 
-    formatter = logging.Formatter(log_format)
-    fh.setFormatter(formatter)
+    formatter = logging.Formatter(LOG_FORMAT)
+    fh.setFormatter(JsonLinesFormatter() if json_lines else formatter)
     sh.setFormatter(formatter)
 
     fh.setLevel(logging.INFO)
     sh.setLevel(logging.INFO)
 
     root.setLevel(logging.INFO)
-    root.addHandler(fh)
-    root.addHandler(sh)
+    _LISTENER = attach_handlers(root, [fh, sh], queued)
 
-    # Close handlers on program exit to free resources
-    atexit.register(_close_handlers, root, [fh, sh])
+    # Close handlers on program exit to free resources (flushing the queue first)
+    if _LISTENER is not None:
+        atexit.register(stop_logging)
+    else:
+        atexit.register(_close_handlers, root, [fh, sh])
 
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging initialized. Log file: {_LOG_FILENAME}")
+    logger.info("Logging initialized. Log file: %s", _LOG_FILENAME)
 
     _HANDLERS_ADDED = True
     return _LOG_FILENAME
@@ -0,0 +1,402 @@
+"""
+Local market data cache
+L2 order books, best bid/ask and mark price per symbol, fed by the futures
+depth, bookTicker and markPrice streams (live) or by recorded stream
+messages (replay)
+"""
+
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+logger = logging.getLogger(__name__)
+
+
+def depth_stream(symbol, speed='100ms'):
+    return f"{symbol.lower()}@depth@{speed}"
+
+
+def book_ticker_stream(symbol):
+    return f"{symbol.lower()}@bookTicker"
+
+
+def mark_price_stream(symbol):
+    return f"{symbol.lower()}@markPrice@1s"
+
+
+class OrderBook:
+    """
+    L2 book for one symbol: price -> quantity on each side
+
+    Prices are also kept in sorted lists, so the best level is O(1) and any
+    price lookup is a bisect. Diff updates follow Binance's futures rules:
+    after a snapshot the first event must straddle its lastUpdateId and every
+    later event's `pu` must equal the previous event's `u`.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.bids = {}
+        self.asks = {}
+        self._bid_prices = []   # ascending, best bid is last
+        self._ask_prices = []   # ascending, best ask is first
+        self.last_update_id = None
+        self.synced = False
+        self._first_event = True
+        self.updates = 0
+        self.gaps = 0
+
+    def load_snapshot(self, snapshot):
+        """Replace the book with a REST depth snapshot ({'lastUpdateId', 'bids', 'asks'})"""
+        self.bids = {float(p): float(q) for p, q in snapshot['bids'] if float(q)}
+        self.asks = {float(p): float(q) for p, q in snapshot['asks'] if float(q)}
+        self._bid_prices = sorted(self.bids)
+        self._ask_prices = sorted(self.asks)
+        self.last_update_id = snapshot['lastUpdateId']
+        self.synced = True
+        self._first_event = True
+
+    def apply(self, event):
+        """
+        Apply one depthUpdate event
+        Returns False if the event shows a sequence gap; the book is then
+        marked unsynced and needs a new snapshot.
+        """
+        if not self.synced:
+            return False
+        first_id, last_id = event['U'], event['u']
+        if last_id < self.last_update_id:
+            # already contained in the snapshot
+            return True
+        if self._first_event:
+            if first_id > self.last_update_id:
+                return self._gap(event)
+        elif event.get('pu', self.last_update_id) != self.last_update_id:
+            return self._gap(event)
+
+        for price, qty in event['b']:
+            self._set_level(self.bids, self._bid_prices, float(price), float(qty))
+        for price, qty in event['a']:
+            self._set_level(self.asks, self._ask_prices, float(price), float(qty))
+        self.last_update_id = last_id
+        self._first_event = False
+        self.updates += 1
+        return True
+
+    def _gap(self, event):
+        logger.warning(f"{self.symbol} depth gap at update {event['U']}-{event['u']} "
+                       f"(book at {self.last_update_id}), resyncing")
+        self.gaps += 1
+        self.synced = False
+        return False
+
+    @staticmethod
+    def _set_level(levels, prices, price, qty):
+        if qty:
+            if price not in levels:
+                prices.insert(bisect_left(prices, price), price)
+            levels[price] = qty
+        elif price in levels:
+            del levels[price]
+            del prices[bisect_left(prices, price)]
+
+    def best_bid(self):
+        """(price, qty) or None"""
+        if not self._bid_prices:
+            return None
+        price = self._bid_prices[-1]
+        return price, self.bids[price]
+
+    def best_ask(self):
+        """(price, qty) or None"""
+        if not self._ask_prices:
+            return None
+        price = self._ask_prices[0]
+        return price, self.asks[price]
+
+    def levels(self, side, limit=10):
+        """Top `limit` levels as [(price, qty)], best first; side is 'BUY' (bids) or 'SELL' (asks)"""
+        if side == 'BUY':
+            prices = self._bid_prices[:-limit - 1:-1] if limit else []
+            return [(p, self.bids[p]) for p in prices]
+        return [(p, self.asks[p]) for p in self._ask_prices[:limit]]
+
+    def quantity_at(self, side, price):
+        """Resting quantity at exactly `price` (0 if there is no level)"""
+        levels = self.bids if side == 'BUY' else self.asks
+        return levels.get(float(price), 0.0)
+
+    def count_levels_through(self, side, price):
+        """How many levels are at or better than `price` - a bisect, no scan"""
+        price = float(price)
+        if side == 'BUY':
+            return len(self._bid_prices) - bisect_left(self._bid_prices, price)
+        return bisect_right(self._ask_prices, price)
+
+    def depth_through(self, side, price):
+        """Total quantity resting at or better than `price` on one side"""
+        count = self.count_levels_through(side, price)
+        return sum(qty for _, qty in self.levels(side, count))
+
+    def fill_price(self, quantity, side):
+        """
+        Average price a market order of `quantity` would get
+        side is the order side: a BUY walks the asks, a SELL walks the bids.
+        Returns None if the book is too thin.
+        """
+        remaining = float(quantity)
+        cost = 0.0
+        book_side = 'SELL' if side == 'BUY' else 'BUY'
+        levels = self.asks if side == 'BUY' else self.bids
+        count = len(levels)
+        for price, qty in self.levels(book_side, count):
+            take = min(remaining, qty)
+            cost += take * price
+            remaining -= take
+            if remaining <= 0:
+                return cost / float(quantity)
+        return None
+
+
+class MarketData:
+    """
+    Books and best bid/ask for a set of symbols
+
+    Feed it with on_message() (one raw or combined-stream message at a time),
+    start() (live futures websocket) or replay() (recorded messages).
+    snapshot_fetcher(symbol) returns a REST depth snapshot; it is called when
+    a book first sees updates and whenever a sequence gap is detected. Updates
+    that arrive while a book is unsynced are buffered and applied on top of
+    the next snapshot.
+
+    Only one snapshot per symbol is fetched at a time, outside the lock. A
+    snapshot that fails, or whose lastUpdateId is still behind the first
+    buffered update, is retried after a backoff (resync_delay, doubling up
+    to max_resync_delay), not on the next message.
+    """
+
+    def __init__(self, snapshot_fetcher=None, max_buffer=1000, resync_delay=1.0, max_resync_delay=30.0,
+                 clock=time.monotonic):
+        self.snapshot_fetcher = snapshot_fetcher
+        self.max_buffer = max_buffer
+        self.resync_delay = resync_delay
+        self.max_resync_delay = max_resync_delay
+        self._clock = clock
+        self.books = {}
+        self.tickers = {}
+        self.mark_prices = {}
+        self._pending = {}
+        self._in_flight = set()
+        # symbol -> (monotonic time the next snapshot may be fetched, current delay)
+        self._retry_at = {}
+        self._lock = threading.RLock()
+        self._manager = None
+        self.messages = 0
+        self.snapshots = 0
+
+    @classmethod
+    def for_client(cls, client, depth_limit=1000, **kwargs):
+        """MarketData that pulls snapshots through a python-binance (or mock) client"""
+        def fetch(symbol):
+            return client.futures_order_book(symbol=symbol, limit=depth_limit)
+        return cls(fetch, **kwargs)
+
+    def on_message(self, message):
+        """Handle one stream message (dict or JSON string)"""
+        if isinstance(message, str):
+            message = json.loads(message)
+        data = message.get('data', message)
+        kind = data.get('e')
+        resync = None
+        with self._lock:
+            self.messages += 1
+            if kind == 'depthUpdate':
+                resync = self._on_depth(data)
+            elif kind == 'bookTicker':
+                self._on_book_ticker(data)
+            elif kind == 'markPriceUpdate':
+                self._on_mark_price(data)
+            elif kind == 'snapshot':
+                self.load_snapshot(data['s'], data)
+            elif kind == 'error':
+                logger.error(f"Market data stream error: {data.get('m')}")
+        if resync is not None:
+            self._resync(resync)
+
+    def _on_book_ticker(self, data):
+        symbol = data['s']
+        current = self.tickers.get(symbol)
+        if current is not None and data['u'] < current['updateId']:
+            return
+        self.tickers[symbol] = {
+            'bid': float(data['b']),
+            'bidQty': float(data['B']),
+            'ask': float(data['a']),
+            'askQty': float(data['A']),
+            'updateId': data['u'],
+            'time': data.get('T'),
+        }
+
+    def _on_mark_price(self, data):
+        symbol = data['s']
+        current = self.mark_prices.get(symbol)
+        if current is not None and data['E'] < current[1]:
+            return
+        self.mark_prices[symbol] = (float(data['p']), data['E'])
+
+    def _on_depth(self, data):
+        """Apply or buffer a depth update; returns the symbol if a snapshot should be fetched now"""
+        symbol = data['s']
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(symbol)
+        if book.synced and book.apply(data):
+            return None
+        pending = self._pending.setdefault(symbol, [])
+        pending.append(data)
+        if len(pending) > self.max_buffer:
+            del pending[0]
+        if self.snapshot_fetcher is None or symbol in self._in_flight:
+            # replays carry their own snapshot messages
+            return None
+        retry = self._retry_at.get(symbol)
+        if retry is not None and self._clock() < retry[0]:
+            return None
+        self._in_flight.add(symbol)
+        return symbol
+
+    def _resync(self, symbol):
+        """Fetch one snapshot (without holding the lock) and install it unless it is stale"""
+        try:
+            snapshot = self.snapshot_fetcher(symbol)
+        except Exception as e:
+            logger.error(f"Failed to fetch {symbol} depth snapshot: {e}")
+            with self._lock:
+                self._in_flight.discard(symbol)
+                self._back_off(symbol)
+            return
+        with self._lock:
+            self._in_flight.discard(symbol)
+            self.snapshots += 1
+            pending = self._pending.get(symbol)
+            if pending and snapshot['lastUpdateId'] < pending[0]['U']:
+                logger.warning(f"{symbol} depth snapshot at {snapshot['lastUpdateId']} is behind the "
+                               f"buffered updates (from {pending[0]['U']}), retrying")
+                self._back_off(symbol)
+                return
+            self.load_snapshot(symbol, snapshot)
+            if self.books[symbol].synced:
+                self._retry_at.pop(symbol, None)
+            else:
+                self._back_off(symbol)
+
+    def _back_off(self, symbol):
+        retry = self._retry_at.get(symbol)
+        delay = self.resync_delay if retry is None else min(retry[1] * 2, self.max_resync_delay)
+        self._retry_at[symbol] = (self._clock() + delay, delay)
+
+    def load_snapshot(self, symbol, snapshot):
+        """Install a depth snapshot and apply any buffered updates after it"""
+        with self._lock:
+            book = self.books.get(symbol)
+            if book is None:
+                book = self.books[symbol] = OrderBook(symbol)
+            book.load_snapshot(snapshot)
+            pending = self._pending.pop(symbol, [])
+            for event in pending:
+                if not book.apply(event):
+                    # snapshot already stale; wait for the next one
+                    self._pending[symbol] = pending[pending.index(event):]
+                    break
+            logger.info(f"{symbol} book synced at update {book.last_update_id}")
+
+    def book(self, symbol):
+        return self.books.get(symbol)
+
+    def best_bid(self, symbol):
+        """(price, qty) from the synced book, else from bookTicker, else None"""
+        with self._lock:
+            book = self.books.get(symbol)
+            if book is not None and book.synced:
+                return book.best_bid()
+            ticker = self.tickers.get(symbol)
+            return (ticker['bid'], ticker['bidQty']) if ticker else None
+
+    def best_ask(self, symbol):
+        """(price, qty) from the synced book, else from bookTicker, else None"""
+        with self._lock:
+            book = self.books.get(symbol)
+            if book is not None and book.synced:
+                return book.best_ask()
+            ticker = self.tickers.get(symbol)
+            return (ticker['ask'], ticker['askQty']) if ticker else None
+
+    def mid_price(self, symbol):
+        bid = self.best_bid(symbol)
+        ask = self.best_ask(symbol)
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def mark_price(self, symbol):
+        """Latest mark price from the markPrice stream, None if none was seen"""
+        mark = self.mark_prices.get(symbol)
+        return mark[0] if mark is not None else None
+
+    def depth(self, symbol, side, limit=10):
+        """Top levels of a synced book, [] if the symbol has no synced book"""
+        with self._lock:
+            book = self.books.get(symbol)
+            if book is None or not book.synced:
+                return []
+            return book.levels(side, limit)
+
+    def fill_price(self, symbol, side, quantity):
+        """Estimated average price for a market order, None if unknown or too thin"""
+        with self._lock:
+            book = self.books.get(symbol)
+            if book is None or not book.synced:
+                return None
+            return book.fill_price(quantity, side)
+
+    def replay(self, path):
+        """Feed every message recorded in a JSONL file; returns the number of messages"""
+        count = 0
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    self.on_message(line)
+                    count += 1
+        return count
+
+    def start(self, api_key, api_secret, symbols, testnet=True, depth_speed='100ms'):
+        """Subscribe to depth, bookTicker and markPrice for `symbols` on the futures websocket"""
+        from binance import ThreadedWebsocketManager
+
+        streams = []
+        for symbol in symbols:
+            streams.append(depth_stream(symbol, depth_speed))
+            streams.append(book_ticker_stream(symbol))
+            streams.append(mark_price_stream(symbol))
+        self._manager = ThreadedWebsocketManager(api_key, api_secret, testnet=testnet)
+        self._manager.start()
+        self._manager.start_futures_multiplex_socket(callback=self.on_message, streams=streams)
+        logger.info(f"Market data streaming {len(streams)} streams")
+
+    def stop(self):
+        if self._manager is not None:
+            self._manager.stop()
+            self._manager = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'messages': self.messages,
+                'snapshots': self.snapshots,
+                'books': {s: {'synced': b.synced, 'updates': b.updates, 'gaps': b.gaps,
+                              'last_update_id': b.last_update_id} for s, b in self.books.items()},
+                'tickers': len(self.tickers),
+                'mark_prices': len(self.mark_prices),
+            }
@@ -0,0 +1,190 @@
+"""
+Hot-path latency metrics
+Log-linear (HDR-style) histograms per stage, timing spans for the order
+path and Prometheus text export. Pass a Metrics object to OrderManager /
+BinanceClient to turn it on; without one the order path only pays an
+`is None` check per stage.
+"""
+
+import threading
+import time
+
+# 2**SUB_BITS linear sub-buckets per power of two: about 3% relative error
+SUB_BITS = 5
+_SUB_COUNT = 1 << SUB_BITS
+# enough buckets for any value below 2**63 ns
+_BUCKETS = (64 - SUB_BITS) * _SUB_COUNT
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+_now = time.perf_counter_ns
+
+
+def bucket_index(value):
+    """Bucket for a non-negative integer value (constant time)"""
+    if value < _SUB_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BITS - 1
+    return (shift + 1) * _SUB_COUNT + (value >> shift) - _SUB_COUNT
+
+
+def bucket_bounds(index):
+    """(lowest, highest) value that lands in a bucket"""
+    if index < 2 * _SUB_COUNT:
+        return index, index
+    shift = index // _SUB_COUNT - 1
+    mantissa = index % _SUB_COUNT + _SUB_COUNT
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class Histogram:
+    """
+    Fixed-size log-linear histogram of integer values (nanoseconds here)
+    record() is a bit_length, a shift and a list increment - no allocation,
+    no sorting. Quantiles are read back with about 3% precision.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, value):
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def quantile(self, q):
+        """Value at quantile q (0..1), None if nothing was recorded"""
+        if not self.count:
+            return None
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen >= rank:
+                    low, high = bucket_bounds(index)
+                    return max(self.min, min((low + high) // 2, self.max))
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def reset(self):
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def summary(self):
+        """count, mean, min, max and quantiles, all in microseconds"""
+        result = {
+            'count': self.count,
+            'mean_us': self.mean() / 1000 if self.count else None,
+            'min_us': self.min / 1000 if self.min is not None else None,
+            'max_us': self.max / 1000 if self.count else None,
+        }
+        for q in QUANTILES:
+            value = self.quantile(q)
+            result[f"p{q * 100:g}_us"] = value / 1000 if value is not None else None
+        return result
+
+
+class Span:
+    """
+    Times consecutive stages of one operation
+    lap(stage) charges the time since the previous lap to `stage` (a stage
+    may be charged more than once); finish() records every stage plus the
+    total into the registry.
+    """
+
+    __slots__ = ('metrics', 'prefix', 'start', 'last', 'stages')
+
+    def __init__(self, metrics, prefix):
+        self.metrics = metrics
+        self.prefix = prefix
+        self.start = self.last = _now()
+        self.stages = {}
+
+    def lap(self, stage):
+        now = _now()
+        stages = self.stages
+        if stage in stages:
+            stages[stage] += now - self.last
+        else:
+            stages[stage] = now - self.last
+        self.last = now
+
+    def finish(self, outcome='total'):
+        stage_histogram = self.metrics.stage_histogram
+        prefix = self.prefix
+        for stage, elapsed in self.stages.items():
+            stage_histogram(prefix, stage).record(elapsed)
+        stage_histogram(prefix, outcome).record(self.last - self.start)
+
+
+class Metrics:
+    """Registry of named histograms"""
+
+    def __init__(self):
+        self.histograms = {}
+        # (prefix, stage) -> histogram, so spans don't build name strings per record
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram(name))
+        return histogram
+
+    def stage_histogram(self, prefix, stage):
+        histogram = self._stages.get((prefix, stage))
+        if histogram is None:
+            histogram = self._stages[(prefix, stage)] = self.histogram(f"{prefix}.{stage}")
+        return histogram
+
+    def record(self, name, nanoseconds):
+        self.histogram(name).record(nanoseconds)
+
+    def span(self, prefix):
+        return Span(self, prefix)
+
+    def reset(self):
+        for histogram in list(self.histograms.values()):
+            histogram.reset()
+
+    def snapshot(self):
+        """{name: summary} for every histogram with data"""
+        return {name: h.summary() for name, h in sorted(self.histograms.items()) if h.count}
+
+    def report(self):
+        """Human-readable table (what `cli.py --stats` prints)"""
+        lines = [f"{'stage':<24} {'count':>7} {'mean':>10} {'p50':>10} {'p99':>10} {'max':>10}  (us)"]
+        for name, s in self.snapshot().items():
+            lines.append(f"{name:<24} {s['count']:>7} {s['mean_us']:>10.1f} {s['p50_us']:>10.1f} "
+                         f"{s['p99_us']:>10.1f} {s['max_us']:>10.1f}")
+        return "\n".join(lines)
+
+    def prometheus(self, metric='trading_bot_stage_latency_seconds'):
+        """Prometheus text exposition format: one summary family, stage as a label"""
+        lines = [f"# HELP {metric} Latency of each order path stage",
+                 f"# TYPE {metric} summary"]
+        for name, h in sorted(self.histograms.items()):
+            if not h.count:
+                continue
+            for q in QUANTILES:
+                lines.append(f'{metric}{{stage="{name}",quantile="{q:g}"}} {h.quantile(q) / 1e9:.9f}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {h.total / 1e9:.9f}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {h.count}')
+        return "\n".join(lines) + "\n"
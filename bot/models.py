@@ -0,0 +1,256 @@
+"""
+Order and symbol models
+Compact, slotted replacements for the raw JSON dicts: one small object per
+order instead of a dict, numbers kept as the exchange strings and only turned
+into Decimals when asked for
+"""
+
+import json
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    loads = orjson.loads
+else:
+    loads = json.loads
+
+
+# one shared copy of the short repeated strings (symbol, side, status, ...),
+# instead of a fresh one per parsed order
+_shared = {}
+
+
+def _shared_text(value):
+    return _shared.setdefault(value, value)
+
+
+def _decimal(text):
+    return None if text is None or text == '' else Decimal(text)
+
+
+class _Model:
+    """
+    Read-only mapping view over the slots, keyed by the API field names
+    (order['orderId'], order.get('avgPrice')), so code written against the
+    raw dicts keeps working. Missing fields are None and read as absent.
+    """
+
+    __slots__ = ()
+    # API field name -> slot
+    _FIELDS = {}
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        slot = self._FIELDS.get(key)
+        if slot is None:
+            return default
+        value = getattr(self, slot)
+        return default if value is None else value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def keys(self):
+        return [key for key, slot in self._FIELDS.items() if getattr(self, slot) is not None]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def to_dict(self):
+        """The fields in API shape (what json.dumps should see)"""
+        return {key: getattr(self, slot) for key, slot in self._FIELDS.items() if getattr(self, slot) is not None}
+
+    def __eq__(self, other):
+        if isinstance(other, _Model):
+            other = other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class OrderRequest(_Model):
+    """
+    One order to send: the futures_create_order / batchOrders parameters
+    quantity and price are passed through as given (numbers or strings).
+    """
+
+    __slots__ = ('symbol', 'side', 'type', 'quantity', 'price', 'time_in_force', 'client_order_id')
+    _FIELDS = {
+        'symbol': 'symbol', 'side': 'side', 'type': 'type', 'timeInForce': 'time_in_force',
+        'quantity': 'quantity', 'price': 'price', 'newClientOrderId': 'client_order_id',
+    }
+
+    def __init__(self, symbol, side, type, quantity, price=None, time_in_force=None, client_order_id=None):
+        self.symbol = symbol
+        self.side = side
+        self.type = type
+        self.quantity = quantity
+        self.price = price
+        self.time_in_force = time_in_force
+        self.client_order_id = client_order_id
+
+    def params(self):
+        """Keyword arguments for futures_create_order, in the order they are signed"""
+        params = {'symbol': self.symbol, 'side': self.side, 'type': self.type}
+        if self.time_in_force is not None:
+            params['timeInForce'] = self.time_in_force
+        params['quantity'] = self.quantity
+        if self.price is not None:
+            params['price'] = self.price
+        if self.client_order_id is not None:
+            params['newClientOrderId'] = self.client_order_id
+        return params
+
+
+class OrderResult(_Model):
+    """
+    An order as the exchange reports it (create/get/cancel responses,
+    ORDER_TRADE_UPDATE events)
+
+    Identity and status fields are plain attributes. The numbers are kept as
+    the exchange strings (executed_qty_text, ...); price, orig_qty,
+    executed_qty, avg_price and cum_quote turn them into Decimals on access.
+    """
+
+    __slots__ = ('order_id', 'client_order_id', 'symbol', 'side', 'type', 'time_in_force', 'status',
+                 'position_side', 'reduce_only', 'update_time',
+                 'price_text', 'orig_qty_text', 'executed_qty_text', 'avg_price_text', 'cum_quote_text')
+    _FIELDS = {
+        'orderId': 'order_id', 'clientOrderId': 'client_order_id', 'symbol': 'symbol', 'side': 'side',
+        'type': 'type', 'timeInForce': 'time_in_force', 'status': 'status', 'positionSide': 'position_side',
+        'reduceOnly': 'reduce_only', 'price': 'price_text', 'origQty': 'orig_qty_text',
+        'executedQty': 'executed_qty_text', 'avgPrice': 'avg_price_text', 'cumQuote': 'cum_quote_text',
+        'updateTime': 'update_time',
+    }
+
+    def __init__(self, order_id, client_order_id=None, symbol=None, side=None, type=None, time_in_force=None,
+                 status=None, price=None, orig_qty=None, executed_qty=None, avg_price=None, cum_quote=None,
+                 update_time=None, position_side=None, reduce_only=None):
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.symbol = symbol
+        self.side = side
+        self.type = type
+        self.time_in_force = time_in_force
+        self.status = status
+        self.position_side = position_side
+        self.reduce_only = reduce_only
+        self.update_time = update_time
+        self.price_text = price
+        self.orig_qty_text = orig_qty
+        self.executed_qty_text = executed_qty
+        self.avg_price_text = avg_price
+        self.cum_quote_text = cum_quote
+
+    @classmethod
+    def from_response(cls, data):
+        """From a decoded order response dict (an OrderResult is returned as is)"""
+        if isinstance(data, OrderResult):
+            return data
+        # filled in directly: skips the __init__ call on the response path
+        order = object.__new__(cls)
+        get = data.get
+        order.order_id = get('orderId')
+        order.client_order_id = get('clientOrderId')
+        order.symbol = _shared_text(get('symbol'))
+        order.side = _shared_text(get('side'))
+        order.type = _shared_text(get('type'))
+        order.time_in_force = _shared_text(get('timeInForce'))
+        order.status = _shared_text(get('status'))
+        order.position_side = _shared_text(get('positionSide'))
+        order.reduce_only = get('reduceOnly')
+        order.update_time = get('updateTime')
+        order.price_text = get('price')
+        order.orig_qty_text = get('origQty')
+        order.executed_qty_text = get('executedQty')
+        order.avg_price_text = get('avgPrice')
+        order.cum_quote_text = get('cumQuote')
+        return order
+
+    price = property(lambda self: _decimal(self.price_text))
+    orig_qty = property(lambda self: _decimal(self.orig_qty_text))
+    executed_qty = property(lambda self: _decimal(self.executed_qty_text))
+    avg_price = property(lambda self: _decimal(self.avg_price_text))
+    cum_quote = property(lambda self: _decimal(self.cum_quote_text))
+
+
+class SymbolRules(_Model):
+    """
+    Trading filters of one symbol (see exchange_info.parse_symbol_rules)
+    Strings as the exchange sends them (tick_size_text, or rules['tickSize']),
+    Decimals on access (tick_size).
+    """
+
+    __slots__ = ('symbol', 'tick_size_text', 'min_price_text', 'max_price_text', 'step_size_text',
+                 'min_qty_text', 'max_qty_text', 'market_step_size_text', 'market_min_qty_text',
+                 'market_max_qty_text', 'min_notional_text')
+    _FIELDS = {
+        'symbol': 'symbol', 'tickSize': 'tick_size_text', 'minPrice': 'min_price_text',
+        'maxPrice': 'max_price_text',
+        'stepSize': 'step_size_text', 'minQty': 'min_qty_text', 'maxQty': 'max_qty_text',
+        'marketStepSize': 'market_step_size_text', 'marketMinQty': 'market_min_qty_text',
+        'marketMaxQty': 'market_max_qty_text', 'minNotional': 'min_notional_text',
+    }
+
+    def __init__(self, symbol, tick_size=None, min_price=None, max_price=None, step_size=None, min_qty=None,
+                 max_qty=None, market_step_size=None, market_min_qty=None, market_max_qty=None,
+                 min_notional=None):
+        self.symbol = symbol
+        self.tick_size_text = tick_size
+        self.min_price_text = min_price
+        self.max_price_text = max_price
+        self.step_size_text = step_size
+        self.min_qty_text = min_qty
+        self.max_qty_text = max_qty
+        self.market_step_size_text = market_step_size
+        self.market_min_qty_text = market_min_qty
+        self.market_max_qty_text = market_max_qty
+        self.min_notional_text = min_notional
+
+    tick_size = property(lambda self: _decimal(self.tick_size_text))
+    min_price = property(lambda self: _decimal(self.min_price_text))
+    max_price = property(lambda self: _decimal(self.max_price_text))
+    step_size = property(lambda self: _decimal(self.step_size_text))
+    min_qty = property(lambda self: _decimal(self.min_qty_text))
+    max_qty = property(lambda self: _decimal(self.max_qty_text))
+    market_step_size = property(lambda self: _decimal(self.market_step_size_text))
+    market_min_qty = property(lambda self: _decimal(self.market_min_qty_text))
+    market_max_qty = property(lambda self: _decimal(self.market_max_qty_text))
+    min_notional = property(lambda self: _decimal(self.min_notional_text))
+
+
+def parse_order(raw):
+    """OrderResult from a JSON order response (bytes or str)"""
+    return OrderResult.from_response(loads(raw))
+
+
+def parse_orders(raw):
+    """OrderResults from a JSON list of order responses (e.g. open orders)"""
+    return [OrderResult.from_response(data) for data in loads(raw)]
+
+
+def to_json(value):
+    """json.dumps default= hook: models become their API-shaped dicts"""
+    if isinstance(value, _Model):
+        return value.to_dict()
+    return str(value)
@@ -0,0 +1,218 @@
+"""
+Decimal-exact order normalisation
+Rounds (or rejects) quantity and price to the symbol's stepSize/tickSize and
+checks min/max quantity, price and notional locally, so orders that would be
+rejected by the exchange never cost a round trip
+"""
+
+from decimal import Decimal, InvalidOperation, ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR
+
+
+def to_decimal(value):
+    """Exact Decimal for an input value; floats go through repr() so 0.1 stays 0.1"""
+    if isinstance(value, Decimal):
+        number = value
+    elif isinstance(value, float):
+        number = Decimal(repr(value))
+    else:
+        try:
+            number = Decimal(str(value).strip())
+        except InvalidOperation:
+            raise ValueError(f"Invalid number: {value!r}")
+    if not number.is_finite():
+        raise ValueError(f"Invalid number: {value!r}")
+    return number
+
+
+def _optional(value):
+    if value in (None, ''):
+        return None
+    value = Decimal(value)
+    return value if value > 0 else None
+
+
+class _Grid:
+    """
+    Snap values onto multiples of one increment
+    Powers of ten use a single quantize(); other increments (e.g. 0.5) divide
+    first. Both are constant time.
+    """
+
+    def __init__(self, increment):
+        self.increment = Decimal(increment).normalize()
+        # exponent used for the output string, e.g. 0.010 -> 0.01 -> 2 places
+        self.exponent = Decimal(1).scaleb(min(0, self.increment.as_tuple().exponent))
+        self.power_of_ten = self.increment == self.exponent
+
+    def snap(self, value, rounding):
+        if self.power_of_ten:
+            return value.quantize(self.exponent, rounding=rounding)
+        steps = (value / self.increment).to_integral_value(rounding=rounding)
+        return (steps * self.increment).quantize(self.exponent)
+
+    def on_grid(self, value):
+        return value % self.increment == 0
+
+
+class SymbolFilters:
+    """
+    Quantizers and limits for one symbol, built once from its parsed rules
+    (see exchange_info.parse_symbol_rules)
+    """
+
+    def __init__(self, rules):
+        self.symbol = rules['symbol']
+        self.price_grid = _Grid(rules['tickSize']) if rules.get('tickSize') else None
+        self.qty_grid = _Grid(rules['stepSize']) if rules.get('stepSize') else None
+        self.market_qty_grid = _Grid(rules['marketStepSize']) if rules.get('marketStepSize') else self.qty_grid
+        self.min_qty = _optional(rules.get('minQty'))
+        self.max_qty = _optional(rules.get('maxQty'))
+        self.market_min_qty = _optional(rules.get('marketMinQty')) or self.min_qty
+        self.market_max_qty = _optional(rules.get('marketMaxQty')) or self.max_qty
+        self.min_price = _optional(rules.get('minPrice'))
+        self.max_price = _optional(rules.get('maxPrice'))
+        self.min_notional = _optional(rules.get('minNotional'))
+
+    def quantity(self, value, order_type='LIMIT', strict=False):
+        """Quantity as an exact Decimal on the step grid (always rounded down)"""
+        qty = to_decimal(value)
+        if qty <= 0:
+            raise ValueError(f"{self.symbol}: quantity must be positive, got {value}")
+        market = order_type == 'MARKET'
+        grid = self.market_qty_grid if market else self.qty_grid
+        if grid is not None:
+            if strict and not grid.on_grid(qty):
+                raise ValueError(f"{self.symbol}: quantity {qty} is not a multiple of stepSize {grid.increment}")
+            qty = grid.snap(qty, ROUND_DOWN)
+        min_qty = self.market_min_qty if market else self.min_qty
+        max_qty = self.market_max_qty if market else self.max_qty
+        if min_qty is not None and qty < min_qty:
+            raise ValueError(f"{self.symbol}: quantity {qty} is below minQty {min_qty}")
+        if max_qty is not None and qty > max_qty:
+            raise ValueError(f"{self.symbol}: quantity {qty} is above maxQty {max_qty}")
+        return qty
+
+    def price(self, value, side, strict=False):
+        """
+        Price as an exact Decimal on the tick grid
+        BUY rounds down and SELL rounds up, so rounding never makes the price worse
+        """
+        price = to_decimal(value)
+        if price <= 0:
+            raise ValueError(f"{self.symbol}: price must be positive, got {value}")
+        grid = self.price_grid
+        if grid is not None:
+            if strict and not grid.on_grid(price):
+                raise ValueError(f"{self.symbol}: price {price} is not a multiple of tickSize {grid.increment}")
+            price = grid.snap(price, ROUND_FLOOR if side == 'BUY' else ROUND_CEILING)
+        if self.min_price is not None and price < self.min_price:
+            raise ValueError(f"{self.symbol}: price {price} is below minPrice {self.min_price}")
+        if self.max_price is not None and price > self.max_price:
+            raise ValueError(f"{self.symbol}: price {price} is above maxPrice {self.max_price}")
+        return price
+
+    def check_notional(self, qty, price):
+        if self.min_notional is not None and qty * price < self.min_notional:
+            raise ValueError(f"{self.symbol}: notional {qty * price} is below minNotional {self.min_notional}")
+
+
+class OrderNormalizer:
+    """
+    Normalises orders against exchange filters before they are sent
+
+    rules_source(symbol) returns parsed symbol rules - usually
+    BinanceClient.get_symbol_rules, which is served from the exchange info
+    cache. The Decimal quantizers are built once per rules object and
+    reused; when the cache refreshes it hands out new rules objects, so a
+    changed tickSize, stepSize or minNotional takes effect right away.
+    strict=True rejects off-grid values instead of rounding them.
+    Returned quantities and prices are plain decimal strings (no exponent,
+    no float artefacts), ready for futures_create_order.
+    """
+
+    def __init__(self, rules_source, strict=False):
+        self.rules_source = rules_source
+        self.strict = strict
+        self._filters = {}
+
+    def filters(self, symbol):
+        rules = self.rules_source(symbol)
+        if rules is None:
+            raise ValueError(f"Unknown symbol: {symbol}")
+        cached = self._filters.get(symbol)
+        if cached is not None and cached[0] is rules:
+            return cached[1]
+        filters = SymbolFilters(rules)
+        self._filters[symbol] = (rules, filters)
+        return filters
+
+    def invalidate(self):
+        """Drop the quantizers (e.g. after the exchange info was refreshed)"""
+        self._filters = {}
+
+    def normalize(self, symbol, side, order_type, quantity, price=None, reference_price=None):
+        """
+        (quantity, price) as strings; price is None for MARKET orders
+        reference_price (e.g. the best bid/ask) lets MARKET orders be checked
+        against minNotional too. Raises ValueError for anything the exchange
+        would reject.
+        """
+        filters = self.filters(symbol)
+        qty = filters.quantity(quantity, order_type, self.strict)
+        if order_type == 'MARKET':
+            if reference_price is not None:
+                filters.check_notional(qty, to_decimal(reference_price))
+            return format(qty, 'f'), None
+        if price is None:
+            raise ValueError(f"{symbol}: price is required for {order_type} orders")
+        price = filters.price(price, side, self.strict)
+        filters.check_notional(qty, price)
+        return format(qty, 'f'), format(price, 'f')
+
+    def normalize_specs(self, specs):
+        """
+        Normalise many specs; returns [(spec, error)] in input order
+        Specs are grouped by symbol so each symbol's filters are looked up once.
+        """
+        results = [None] * len(specs)
+        by_symbol = {}
+        for i, spec in enumerate(specs):
+            by_symbol.setdefault(spec['symbol'], []).append(i)
+        for symbol, indexes in by_symbol.items():
+            try:
+                filters = self.filters(symbol)
+            except ValueError as e:
+                for i in indexes:
+                    results[i] = (None, str(e))
+                continue
+            for i in indexes:
+                results[i] = self._normalize_one(filters, specs[i])
+        return results
+
+    def normalize_quantities(self, symbol, quantities, order_type='LIMIT'):
+        """Step-rounded quantity strings for a column of values (one filter lookup)"""
+        filters = self.filters(symbol)
+        quantity = filters.quantity
+        strict = self.strict
+        return [format(quantity(q, order_type, strict), 'f') for q in quantities]
+
+    def normalize_prices(self, symbol, prices, side):
+        """Tick-rounded price strings for a column of values (one filter lookup)"""
+        filters = self.filters(symbol)
+        price = filters.price
+        strict = self.strict
+        return [format(price(p, side, strict), 'f') for p in prices]
+
+    def _normalize_one(self, filters, spec):
+        try:
+            qty = filters.quantity(spec['quantity'], spec['type'], self.strict)
+            normalized = dict(spec, quantity=format(qty, 'f'))
+            if spec['type'] != 'MARKET':
+                if spec.get('price') is None:
+                    raise ValueError(f"{filters.symbol}: price is required for {spec['type']} orders")
+                price = filters.price(spec['price'], spec['side'], self.strict)
+                filters.check_notional(qty, price)
+                normalized['price'] = format(price, 'f')
+            return normalized, None
+        except ValueError as e:
+            return None, str(e)
@@ -1,41 +1,292 @@
 """
 Order placement logic
-Handles market and limit orders
+Handles market and limit orders, cancels and reconciliation
 """
 
-from binance.exceptions import BinanceAPIException
+from decimal import Decimal
+import json
 import logging
 
+from .errors import api_errors
+from .models import OrderRequest, OrderResult
+from .retry import FATAL, ClientOrderIds, classify, lookup_order
+
 logger = logging.getLogger(__name__)
 
+# Binance futures accepts at most 5 orders per batchOrders request
+BATCH_SIZE = 5
+# ...and cancels at most 10 per batchOrders DELETE
+CANCEL_BATCH_SIZE = 10
+
+
+def _to_param(value):
+    """Render a number the way the API wants it (no exponent notation)"""
+    if isinstance(value, float):
+        return format(Decimal(repr(value)), 'f')
+    return str(value)
+
+
+def batch_params(spec):
+    """Turn an order spec dict into a batchOrders entry (all values as strings)"""
+    if spec['type'] == 'LIMIT':
+        request = OrderRequest(spec['symbol'], spec['side'], 'LIMIT', _to_param(spec['quantity']),
+                               _to_param(spec['price']), spec.get('timeInForce', 'GTC'))
+    else:
+        request = OrderRequest(spec['symbol'], spec['side'], spec['type'], _to_param(spec['quantity']))
+    return request.params()
+
+
+def prepare_order(normalizer, client_ids, symbol, side, order_type, quantity, price=None,
+                  reference_price=None):
+    """
+    The OrderRequest for one MARKET or GTC LIMIT order
+    Rounded/checked by normalizer when there is one (raises ValueError) and
+    given the next newClientOrderId from client_ids. Shared by OrderManager
+    and AsyncOrderManager so both send the same parameters.
+    """
+    if normalizer is not None:
+        quantity, price = normalizer.normalize(symbol, side, order_type, quantity, price,
+                                               reference_price=reference_price)
+    # timeInForce GTC = Good Till Cancel (stays open until filled or cancelled)
+    time_in_force = 'GTC' if order_type == 'LIMIT' else None
+    return OrderRequest(symbol, side, order_type, quantity, price, time_in_force, client_ids.next())
+
+
+def prepare_specs(normalizer, specs, results):
+    """
+    (specs to send, indexes of the valid ones) for a batch
+    With a normalizer, orders the exchange would reject fail here without a
+    request: their results entry gets the error.
+    """
+    if normalizer is None:
+        return specs, range(len(specs))
+    to_send = [None] * len(specs)
+    valid = []
+    for i, (spec, error) in enumerate(normalizer.normalize_specs(specs)):
+        if error is None:
+            to_send[i] = spec
+            valid.append(i)
+        else:
+            logger.error("Order %d rejected locally: %s", i, error)
+            results[i] = {'spec': specs[i], 'order': None, 'error': error}
+    return to_send, valid
+
+
+def split_batches(count):
+    """Index ranges of at most BATCH_SIZE orders"""
+    return [range(i, min(i + BATCH_SIZE, count)) for i in range(0, count, BATCH_SIZE)]
+
+
+def batch_error_responses(error, count):
+    """A whole batch request failed: give every order in it the same error entry"""
+    if isinstance(error, api_errors()):
+        logger.error("Binance API error on batch: %s", error.message)
+        return [{'code': error.code, 'msg': error.message}] * count
+    logger.error("Error placing batch: %s", error)
+    return [{'code': None, 'msg': str(error)}] * count
+
+
+def collect_batch_results(specs, indexes, responses, results):
+    """Store the per-order outcome of one batch into results"""
+    responses = list(responses or [])
+    for n, i in enumerate(indexes):
+        response = responses[n] if n < len(responses) else None
+        if not isinstance(response, dict):
+            logger.error("Order %d: no response for order", i)
+            results[i] = {'spec': specs[i], 'order': None, 'error': 'no response for order'}
+        elif 'orderId' in response:
+            results[i] = {'spec': specs[i], 'order': OrderResult.from_response(response), 'error': None}
+        else:
+            logger.error("Order %d rejected: %s", i, response.get('msg'))
+            results[i] = {'spec': specs[i], 'order': None, 'error': response.get('msg')}
+
+
+def log_batch_summary(results):
+    placed = sum(1 for r in results if r['error'] is None)
+    logger.info("Batch finished: %d placed, %d failed", placed, len(results) - placed)
+
+
+def _error_text(error):
+    if isinstance(error, api_errors()):
+        return error.message
+    return str(error)
+
+
+def _same_number(a, b):
+    if a is None or b is None:
+        return a == b
+    return Decimal(a) == Decimal(b)
+
+
+def diff_orders(local, remote):
+    """
+    Compare local open orders with the exchange's (OrderResults, same symbols)
+    Returns {'matched', 'unknown' (only on the exchange), 'missing' (only
+    local), 'mismatched' ([{'local', 'exchange'}] with a different status,
+    quantity, price or filled quantity)}.
+    """
+    local = {o.order_id: o for o in local}
+    remote = {o.order_id: o for o in remote}
+    diff = {'matched': 0, 'unknown': [], 'missing': [], 'mismatched': []}
+    for order_id, theirs in remote.items():
+        ours = local.get(order_id)
+        if ours is None:
+            diff['unknown'].append(theirs)
+        elif (ours.status != theirs.status or not _same_number(ours.orig_qty_text, theirs.orig_qty_text)
+              or not _same_number(ours.price_text, theirs.price_text)
+              or not _same_number(ours.executed_qty_text or '0', theirs.executed_qty_text or '0')):
+            diff['mismatched'].append({'local': ours, 'exchange': theirs})
+        else:
+            diff['matched'] += 1
+    diff['missing'] = [o for order_id, o in local.items() if order_id not in remote]
+    return diff
+
+
+def _or_na(value):
+    return 'N/A' if value is None else value
+
+
+def format_order_response(order):
+    """
+    Format order response for clean output
+    Makes it easier to read
+    """
+    order = OrderResult.from_response(order)
+    output = []
+    output.append("\n" + "="*50)
+    output.append("ORDER EXECUTED SUCCESSFULLY")
+    output.append("="*50)
+    output.append(f"Order ID: {_or_na(order.order_id)}")
+    output.append(f"Symbol: {_or_na(order.symbol)}")
+    output.append(f"Side: {_or_na(order.side)}")
+    output.append(f"Type: {_or_na(order.type)}")
+    output.append(f"Status: {_or_na(order.status)}")
+    output.append(f"Quantity: {_or_na(order.orig_qty_text)}")
+    
+    if order.executed_qty_text is not None:
+        output.append(f"Executed Qty: {order.executed_qty_text}")
+    
+    if order.avg_price_text is not None and order.avg_price_text != '0':
+        output.append(f"Average Price: {order.avg_price_text}")
+    elif order.price_text is not None:
+        output.append(f"Limit Price: {order.price_text}")
+        
+    output.append("="*50 + "\n")
+    
+    return "\n".join(output)
+
 
 class OrderManager:
-    def __init__(self, client):
-        """Initialize with a BinanceClient instance"""
+    def __init__(self, client, market_data=None, normalizer=None, metrics=None, journal=None,
+                 retry=None, client_ids=None, risk=None):
+        """
+        Initialize with a BinanceClient instance
+        market_data is an optional MarketData cache; normalizer an optional
+        OrderNormalizer that rounds/rejects orders against the symbol filters
+        before they are sent; metrics an optional Metrics registry that gets
+        per-stage latencies (log, validate, submit) of every order; journal
+        an optional OrderJournal that persists every submission and response.
+        Every order gets a newClientOrderId from client_ids (a ClientOrderIds);
+        retry is an optional RetryPolicy for failed or timed-out requests;
+        risk an optional RiskEngine that checks every order before it is sent.
+        """
         self.client = client
+        self.market_data = market_data
+        self.normalizer = normalizer
+        self.metrics = metrics
+        self.journal = journal
+        self.retry = retry
+        self.client_ids = client_ids or ClientOrderIds()
+        self.risk = risk
+
+    def best_bid(self, symbol):
+        """(price, qty) from the local market data cache, None without one"""
+        if self.market_data is None:
+            return None
+        return self.market_data.best_bid(symbol)
+
+    def best_ask(self, symbol):
+        """(price, qty) from the local market data cache, None without one"""
+        if self.market_data is None:
+            return None
+        return self.market_data.best_ask(symbol)
+
+    def estimate_fill_price(self, symbol, side, quantity):
+        """Average price a MARKET order would get by walking the local book"""
+        if self.market_data is None:
+            return None
+        return self.market_data.fill_price(symbol, side, quantity)
+
+    def check_limit_price(self, symbol, side, price):
+        """Warn if a LIMIT order would cross the spread and execute as a taker"""
+        quote = self.best_ask(symbol) if side == 'BUY' else self.best_bid(symbol)
+        if quote is None:
+            return True
+        crosses = price >= quote[0] if side == 'BUY' else price <= quote[0]
+        if crosses:
+            logger.warning("LIMIT %s %s @ %s crosses the book (best %s %s) and will fill immediately",
+                           side, symbol, price, 'ask' if side == 'BUY' else 'bid', quote[0])
+        return not crosses
 
     def place_market_order(self, symbol, side, quantity):
         """
         Place a market order
         Market orders execute immediately at current price
         """
-        logger.info(f"Placing MARKET order: {side} {quantity} {symbol}")
+        span = self.metrics.span('order') if self.metrics is not None else None
+        client_order_id = None
+        logger.info("Placing MARKET order: %s %s %s", side, quantity, symbol)
+        if span:
+            span.lap('log')
+        ref = None
         
         try:
-            order = self.client.client.futures_create_order(
-                symbol=symbol,
-                side=side,
-                type='MARKET',
-                quantity=quantity
-            )
-            logger.info(f"Market order placed successfully: {order['orderId']}")
+            reference = None
+            if self.normalizer is not None:
+                quote = self.best_ask(symbol) if side == 'BUY' else self.best_bid(symbol)
+                reference = quote[0] if quote else None
+            request = prepare_order(self.normalizer, self.client_ids, symbol, side, 'MARKET', quantity,
+                                    reference_price=reference)
+            client_order_id = request.client_order_id
+            if self.risk is not None:
+                self.risk.check(symbol, side, 'MARKET', request.quantity, client_order_id=client_order_id)
+            if span:
+                span.lap('validate')
+            params = request.params()
+            if self.journal is not None:
+                ref = self.journal.record_submission(params)
+            try:
+                order = self.client.client.futures_create_order(**params)
+            except Exception as e:
+                if self.retry is None:
+                    raise
+                order = self._recover(e, params)
+            order = OrderResult.from_response(order)
+            if self.risk is not None:
+                self.risk.on_order(order)
+            if ref is not None:
+                self.journal.record_response(ref, order)
+            if span:
+                span.lap('submit')
+            logger.info("Market order placed successfully: %s", order.order_id)
+            if span:
+                span.lap('log')
+                span.finish()
             return order
         
-        except BinanceAPIException as e:
-            logger.error(f"Binance API error: {e.message}")
+        except api_errors() as e:
+            logger.error("Binance API error: %s", e.message)
+            self._journal_error(ref, e)
+            self._release(client_order_id)
+            if span:
+                span.finish('error')
             raise
         except Exception as e:
-            logger.error(f"Error placing market order: {e}")
+            logger.error("Error placing market order: %s", e)
+            self._journal_error(ref, e)
+            self._release(client_order_id)
+            if span:
+                span.finish('error')
             raise
 
     def place_limit_order(self, symbol, side, quantity, price):
@@ -43,52 +294,407 @@ class OrderManager:
         Place a limit order
         Limit orders only execute at specified price or better
         """
-        logger.info(f"Placing LIMIT order: {side} {quantity} {symbol} @ {price}")
+        span = self.metrics.span('order') if self.metrics is not None else None
+        client_order_id = None
+        logger.info("Placing LIMIT order: %s %s %s @ %s", side, quantity, symbol, price)
+        if span:
+            span.lap('log')
+        if self.market_data is not None:
+            self.check_limit_price(symbol, side, price)
+        ref = None
         
         try:
-            # timeInForce GTC = Good Till Cancel (stays open until filled or cancelled)
-            order = self.client.client.futures_create_order(
-                symbol=symbol,
-                side=side,
-                type='LIMIT',
-                timeInForce='GTC',
-                quantity=quantity,
-                price=price
-            )
-            logger.info(f"Limit order placed successfully: {order['orderId']}")
+            request = prepare_order(self.normalizer, self.client_ids, symbol, side, 'LIMIT', quantity, price)
+            client_order_id = request.client_order_id
+            if self.risk is not None:
+                self.risk.check(symbol, side, 'LIMIT', request.quantity, request.price, client_order_id)
+            if span:
+                span.lap('validate')
+            params = request.params()
+            if self.journal is not None:
+                ref = self.journal.record_submission(params)
+            try:
+                order = self.client.client.futures_create_order(**params)
+            except Exception as e:
+                if self.retry is None:
+                    raise
+                order = self._recover(e, params)
+            order = OrderResult.from_response(order)
+            if self.risk is not None:
+                self.risk.on_order(order)
+            if ref is not None:
+                self.journal.record_response(ref, order)
+            if span:
+                span.lap('submit')
+            logger.info("Limit order placed successfully: %s", order.order_id)
+            if span:
+                span.lap('log')
+                span.finish()
             return order
         
-        except BinanceAPIException as e:
-            logger.error(f"Binance API error: {e.message}")
+        except api_errors() as e:
+            logger.error("Binance API error: %s", e.message)
+            self._journal_error(ref, e)
+            self._release(client_order_id)
+            if span:
+                span.finish('error')
             raise
         except Exception as e:
-            logger.error(f"Error placing limit order: {e}")
+            logger.error("Error placing limit order: %s", e)
+            self._journal_error(ref, e)
+            self._release(client_order_id)
+            if span:
+                span.finish('error')
             raise
 
+    def place_orders(self, specs, max_workers=4):
+        """
+        Place many orders through the batchOrders endpoint
+        specs are dicts with symbol, side, type, quantity and (for LIMIT) price.
+        Orders are grouped 5 per request and the requests run concurrently.
+        Returns one result per spec, in order: {'spec', 'order', 'error'}.
+        A failure only marks the orders it affected.
+        """
+        span = self.metrics.span('batch') if self.metrics is not None else None
+        specs = list(specs)
+        results = [None] * len(specs)
+        to_send, valid = prepare_specs(self.normalizer, specs, results)
+        # client IDs are taken up front when the risk checks have to reserve exposure under them
+        client_order_ids = {}
+        if self.risk is not None:
+            checked = []
+            for i in valid:
+                spec = to_send[i]
+                client_order_id = self.client_ids.next()
+                try:
+                    self.risk.check(spec['symbol'], spec['side'], spec['type'], spec['quantity'], spec.get('price'),
+                                    client_order_id)
+                except ValueError as e:
+                    results[i] = {'spec': specs[i], 'order': None, 'error': str(e)}
+                    continue
+                client_order_ids[i] = client_order_id
+                checked.append(i)
+            valid = checked
+        batches = [valid[r.start:r.stop] for r in split_batches(len(valid))]
+        logger.info("Placing %d orders in %d batches", len(valid), len(batches))
+        if span:
+            span.lap('validate')
+
+        journal = self.journal
+
+        def submit(indexes):
+            batch = [batch_params(to_send[i]) for i in indexes]
+            for i, params in zip(indexes, batch):
+                params['newClientOrderId'] = client_order_ids.get(i) or self.client_ids.next()
+            refs = [journal.record_submission(params) for params in batch] if journal is not None else None
+            try:
+                responses = self.client.client.futures_place_batch_order(batchOrders=batch)
+            except Exception as e:
+                responses = self._recover_batch(e, batch) if self.retry is not None else None
+                if responses is None:
+                    responses = batch_error_responses(e, len(batch))
+            collect_batch_results(specs, indexes, responses, results)
+            if self.risk is not None:
+                for i in indexes:
+                    if results[i]['order'] is not None:
+                        self.risk.on_order(results[i]['order'])
+                    else:
+                        self.risk.release(client_order_ids[i])
+            if refs is not None:
+                for ref, i in zip(refs, indexes):
+                    if results[i]['order'] is not None:
+                        journal.record_response(ref, results[i]['order'])
+                    else:
+                        journal.record_error(ref, results[i]['error'])
+
+        if len(batches) == 1:
+            submit(batches[0])
+        elif batches:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+                list(pool.map(submit, batches))
+        if span:
+            span.lap('submit')
+
+        log_batch_summary(results)
+        if span:
+            span.finish()
+        return results
+
+    def _recover(self, error, params):
+        """Hand a failed create-order request to the retry policy (same client ID on resend)"""
+        client = self.client.client
+        return self.retry.recover(
+            error,
+            lambda: client.futures_create_order(**params),
+            lambda: lookup_order(client, params['symbol'], params['newClientOrderId']))
+
+    # -- cancels ---------------------------------------------------------
+
+    def _per_symbol(self, func, symbols, max_workers):
+        """{symbol: func(symbol)}, the symbols running concurrently on at most max_workers threads"""
+        symbols = list(dict.fromkeys(symbols))
+        if len(symbols) <= 1:
+            return {symbol: func(symbol) for symbol in symbols}
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as pool:
+            return dict(zip(symbols, pool.map(func, symbols)))
+
+    def _on_update(self, order):
+        """An order changed outside of placement (cancel, reconcile): keep risk and journal in step"""
+        if self.risk is not None:
+            self.risk.on_order(order)
+        if self.journal is not None:
+            self.journal.record_update(order)
+
+    def cancel_order(self, symbol, order_id=None, client_order_id=None):
+        """Cancel one open order by order ID or client order ID; returns the cancelled OrderResult"""
+        if order_id is None and client_order_id is None:
+            raise ValueError("order_id or client_order_id is required")
+        logger.info("Cancelling order %s on %s", order_id if order_id is not None else client_order_id, symbol)
+        params = {'symbol': symbol}
+        if order_id is not None:
+            params['orderId'] = order_id
+        else:
+            params['origClientOrderId'] = client_order_id
+        try:
+            order = OrderResult.from_response(self.client.client.futures_cancel_order(**params))
+        except api_errors() as e:
+            logger.error("Binance API error: %s", e.message)
+            raise
+        except Exception as e:
+            logger.error("Error cancelling order: %s", e)
+            raise
+        self._on_update(order)
+        logger.info("Order cancelled: %s", order.order_id)
+        return order
+
+    def cancel_all(self, symbols, max_workers=4):
+        """
+        Cancel every open order on each symbol (one request per symbol, run
+        concurrently); returns {symbol: None or the error message}
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+
+        def cancel(symbol):
+            logger.info("Cancelling all open orders on %s", symbol)
+            try:
+                self.client.client.futures_cancel_all_open_orders(symbol=symbol)
+            except Exception as e:
+                logger.error("Error cancelling all orders on %s: %s", symbol, _error_text(e))
+                return _error_text(e)
+            # no per-order responses: everything this side knew as open on the symbol is gone
+            if self.risk is not None:
+                self.risk.cancel_all(symbol)
+            if self.journal is not None:
+                for order in self.journal.open_orders(symbol):
+                    self.journal.record_update(dict(order.to_dict(), status='CANCELED'))
+            return None
+
+        return self._per_symbol(cancel, symbols, max_workers)
+
+    def cancel_orders(self, orders, max_workers=4):
+        """
+        Cancel many orders: orders maps symbol -> IDs (ints are order IDs,
+        strings client order IDs). Sent 10 per request, every request across
+        all symbols running concurrently on at most max_workers threads.
+        Returns {symbol: [{'id', 'order', 'error'}, ...]} in input order.
+        """
+        chunks = []
+        for symbol, ids in orders.items():
+            ids = list(ids)
+            for key, wanted in (('orderIdList', int), ('origClientOrderIdList', str)):
+                group = [i for i in ids if isinstance(i, wanted)]
+                chunks.extend((symbol, key, group[n:n + CANCEL_BATCH_SIZE])
+                              for n in range(0, len(group), CANCEL_BATCH_SIZE))
+
+        def cancel(chunk):
+            symbol, key, ids = chunk
+            try:
+                # compact JSON: spaces after the commas would be URL-encoded into the list
+                id_list = json.dumps(ids, separators=(',', ':'))
+                responses = self.client.client.futures_cancel_orders(symbol=symbol, **{key: id_list})
+            except Exception as e:
+                logger.error("Error cancelling %d orders on %s: %s", len(ids), symbol, _error_text(e))
+                return [{'id': i, 'order': None, 'error': _error_text(e)} for i in ids]
+            responses = list(responses or [])
+            results = []
+            for n, i in enumerate(ids):
+                response = responses[n] if n < len(responses) else None
+                if isinstance(response, dict) and 'orderId' in response:
+                    order = OrderResult.from_response(response)
+                    self._on_update(order)
+                    results.append({'id': i, 'order': order, 'error': None})
+                else:
+                    error = response.get('msg') if isinstance(response, dict) else 'no response for order'
+                    logger.error("Cancel of %s on %s failed: %s", i, symbol, error)
+                    results.append({'id': i, 'order': None, 'error': error})
+            return results
+
+        if len(chunks) <= 1:
+            outcomes = [cancel(chunk) for chunk in chunks]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+                outcomes = list(pool.map(cancel, chunks))
+        by_id = {}
+        for (symbol, _, _), results in zip(chunks, outcomes):
+            for result in results:
+                by_id[(symbol, result['id'])] = result
+        results = {symbol: [by_id[(symbol, i)] for i in ids] for symbol, ids in orders.items()}
+        cancelled = sum(1 for r in by_id.values() if r['error'] is None)
+        logger.info("Cancelled %d of %d orders", cancelled, len(by_id))
+        return results
+
+    def cancel_replace(self, symbol, order_id=None, client_order_id=None, price=None, quantity=None):
+        """
+        Replace an open LIMIT order: cancel it, then place the new one
+        The replacement is only sent once the cancel is confirmed, so the two
+        are never on the book together, and if the cancel fails (already
+        filled, unknown) nothing new is placed. quantity defaults to what the
+        old order had left unfilled, price to its price. Returns
+        {'cancelled': OrderResult, 'order': OrderResult}.
+        """
+        cancelled = self.cancel_order(symbol, order_id, client_order_id)
+        if quantity is None:
+            quantity = format(Decimal(cancelled.orig_qty_text) - Decimal(cancelled.executed_qty_text or '0'), 'f')
+            if Decimal(quantity) <= 0:
+                raise ValueError(f"order {cancelled.order_id} has nothing left to replace")
+        if price is None:
+            price = cancelled.price_text
+        try:
+            order = self.place_limit_order(symbol, cancelled.side, quantity, price)
+        except Exception:
+            logger.error("Order %s was cancelled but its replacement failed", cancelled.order_id)
+            raise
+        logger.info("Order %s replaced by %s", cancelled.order_id, order.order_id)
+        return {'cancelled': cancelled, 'order': order}
+
+    # -- reconciliation --------------------------------------------------
+
+    def open_orders(self, symbols=None, max_workers=4):
+        """
+        Open orders on the exchange as {symbol: [OrderResult]}
+        One request per symbol, run concurrently, or without symbols a single
+        all-symbols request (only symbols with open orders appear).
+        """
+        client = self.client.client
+        if symbols is None:
+            by_symbol = {}
+            for response in client.futures_get_open_orders():
+                order = OrderResult.from_response(response)
+                by_symbol.setdefault(order.symbol, []).append(order)
+            return by_symbol
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        return self._per_symbol(
+            lambda symbol: [OrderResult.from_response(o) for o in client.futures_get_open_orders(symbol=symbol)],
+            symbols, max_workers)
+
+    def reconcile(self, symbols=None, local=None, repair=False, max_workers=4):
+        """
+        Diff local open orders against futures_get_open_orders
+        local has open_orders(symbol) (an OrderJournal or UserDataStore) and
+        defaults to the journal. With symbols each symbol is one request, run
+        concurrently; without, one all-symbols request (weight 40) covers
+        every symbol either side knows. Returns {symbol: diff_orders(...)}.
+        repair=True brings the journal and risk engine in line: orders only
+        the exchange knows are recorded, and orders the exchange no longer
+        lists are looked up for their final state.
+        """
+        local = local if local is not None else self.journal
+        if local is None:
+            raise ValueError("reconcile needs local order state (a journal or user-data store)")
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        remote = self.open_orders(symbols, max_workers)
+        if symbols is None:
+            symbols = sorted(set(remote) | {o.symbol for o in local.open_orders()})
+
+        def check(symbol):
+            diff = diff_orders(local.open_orders(symbol), remote.get(symbol, []))
+            if diff['unknown'] or diff['missing'] or diff['mismatched']:
+                logger.warning("%s out of sync: %d unknown, %d missing, %d mismatched", symbol,
+                               len(diff['unknown']), len(diff['missing']), len(diff['mismatched']))
+            if repair:
+                self._repair(symbol, diff)
+            return diff
+
+        return self._per_symbol(check, symbols, max_workers)
+
+    def _repair(self, symbol, diff):
+        for order in diff['unknown']:
+            self._on_update(order)
+        for pair in diff['mismatched']:
+            self._on_update(pair['exchange'])
+        for order in diff['missing']:
+            try:
+                final = self.client.client.futures_get_order(symbol=symbol, orderId=order.order_id)
+            except Exception as e:
+                logger.error("Could not look up order %s on %s: %s", order.order_id, symbol, _error_text(e))
+                continue
+            self._on_update(OrderResult.from_response(final))
+
+    def settle_unresolved(self):
+        """
+        Look up journaled submissions that never got a response (a crash
+        while they were in flight) by client order ID
+        Orders the exchange has are journaled as their response; the rest as
+        errors, since they never arrived. Returns {client order ID: OrderResult
+        or None}; lookups that fail stay unresolved for the next call.
+        """
+        if self.journal is None:
+            raise ValueError("settle_unresolved needs a journal")
+        settled = {}
+        for client_order_id, entry in self.journal.unresolved().items():
+            symbol = entry['params'].get('symbol')
+            try:
+                order = lookup_order(self.client.client, symbol, client_order_id)
+            except Exception as e:
+                logger.error("Could not look up order %s on %s: %s", client_order_id, symbol, _error_text(e))
+                continue
+            if order is None:
+                logger.warning("Order %s on %s never reached the exchange", client_order_id, symbol)
+                self.journal.record_error(entry['seq'], "Order never reached the exchange")
+                settled[client_order_id] = None
+                continue
+            order = OrderResult.from_response(order)
+            logger.info("Order %s on %s recovered: %s %s", client_order_id, symbol, order.order_id, order.status)
+            if self.risk is not None:
+                self.risk.on_order(order)
+            self.journal.record_response(entry['seq'], order)
+            settled[client_order_id] = order
+        return settled
+
+    def _recover_batch(self, error, batch):
+        """
+        A whole batch request failed: settle each order on its own
+        Returns per-order responses, or None if the error is not retryable.
+        """
+        if classify(error) == FATAL:
+            return None
+        responses = []
+        for params in batch:
+            try:
+                responses.append(self._recover(error, params))
+            except api_errors() as e:
+                responses.append({'code': e.code, 'msg': e.message})
+            except Exception as e:
+                responses.append({'code': None, 'msg': str(e)})
+        return responses
+
+    def _journal_error(self, ref, error):
+        if ref is not None:
+            self.journal.record_error(ref, error)
+
+    def _release(self, client_order_id):
+        if self.risk is not None and client_order_id is not None:
+            self.risk.release(client_order_id)
+
     def format_order_response(self, order):
         """
         Format order response for clean output
         Makes it easier to read
         """
-        output = []
-        output.append("\n" + "="*50)
-        output.append("ORDER EXECUTED SUCCESSFULLY")
-        output.append("="*50)
-        output.append(f"Order ID: {order.get('orderId', 'N/A')}")
-        output.append(f"Symbol: {order.get('symbol', 'N/A')}")
-        output.append(f"Side: {order.get('side', 'N/A')}")
-        output.append(f"Type: {order.get('type', 'N/A')}")
-        output.append(f"Status: {order.get('status', 'N/A')}")
-        output.append(f"Quantity: {order.get('origQty', 'N/A')}")
-        
-        if 'executedQty' in order:
-            output.append(f"Executed Qty: {order['executedQty']}")
-        
-        if 'avgPrice' in order and order['avgPrice'] != '0':
-            output.append(f"Average Price: {order['avgPrice']}")
-        elif 'price' in order:
-            output.append(f"Limit Price: {order['price']}")
-            
-        output.append("="*50 + "\n")
-        
-        return "\n".join(output)
+        return format_order_response(order)
@@ -0,0 +1,109 @@
+"""
+python-binance Client with the pooled session installed
+Kept apart from client.py so importing the package doesn't load python-binance
+"""
+
+import logging
+import time
+
+from binance.client import Client
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+
+from .models import loads
+from .session import configure_session
+from .signing import RequestSigner
+
+logger = logging.getLogger(__name__)
+
+# the signed body is sent pre-encoded, so requests won't add this itself
+_FORM_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+# -1021: timestamp outside recvWindow (our clock or offset is off)
+_TIMESTAMP_ERROR = -1021
+
+
+class PooledClient(Client):
+    """
+    python-binance Client whose requests session is pooled before the first ping
+    With a Metrics registry every request is split into sign / network / decode.
+    Signed requests use a RequestSigner and, if one is attached, the
+    server-time estimate of a TimeSync instead of the raw local clock.
+    """
+
+    def __init__(self, api_key, api_secret, session_config, governor=None, metrics=None, time_sync=None,
+                 **kwargs):
+        self.session_config = session_config
+        self.governor = governor
+        self.metrics = metrics
+        self.time_sync = time_sync
+        self.signer = RequestSigner(api_secret) if api_secret else None
+        self.REQUEST_TIMEOUT = session_config.timeout
+        super().__init__(api_key, api_secret, **kwargs)
+
+    def _init_session(self):
+        session = super()._init_session()
+        self.adapter, self.session_stats = configure_session(session, self.session_config, self.governor)
+        return session
+
+    def _get_request_kwargs(self, method, signed, force_params=False, **kwargs):
+        if not signed or self.signer is None or self.PRIVATE_KEY:
+            return super()._get_request_kwargs(method, signed, force_params, **kwargs)
+        kwargs['timeout'] = self.REQUEST_TIMEOUT
+        if self._requests_params:
+            kwargs.update(self._requests_params)
+        data = kwargs.pop('data', None) or {}
+        if 'requests_params' in data:
+            kwargs.update(data.pop('requests_params'))
+        if self.time_sync is not None:
+            timestamp = self.time_sync.timestamp()
+        else:
+            timestamp = int(time.time() * 1000 + self.timestamp_offset)
+        query = self.signer.signed_query(data, timestamp)
+        if method == 'get' or force_params:
+            kwargs['params'] = query
+        else:
+            kwargs['data'] = query
+            kwargs['headers'] = _FORM_HEADERS
+        return kwargs
+
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        metrics = self.metrics
+        if metrics is None:
+            try:
+                return super()._request(method, uri, signed, force_params, **kwargs)
+            except Exception as e:
+                self._check_timestamp_error(e)
+                raise
+        span = metrics.span('http')
+        kwargs = self._get_request_kwargs(method, signed, force_params, **kwargs)
+        span.lap('sign')
+        try:
+            # includes any rate limit wait in the adapter
+            self.response = getattr(self.session, method)(uri, **kwargs)
+            span.lap('network')
+            result = self._handle_response(self.response)
+            span.lap('decode')
+        except Exception as e:
+            span.finish('error')
+            self._check_timestamp_error(e)
+            raise
+        span.finish()
+        return result
+
+    @staticmethod
+    def _handle_response(response):
+        """python-binance's response check, decoding with the fast parser (orjson when installed)"""
+        if not (200 <= response.status_code < 300):
+            raise BinanceAPIException(response, response.status_code, response.text)
+        try:
+            return loads(response.content)
+        except ValueError:
+            raise BinanceRequestException(f"Invalid Response: {response.text}")
+
+    def _check_timestamp_error(self, error):
+        """On -1021 re-measure the clock offset right away, so a retry goes out with a fresh timestamp"""
+        if getattr(error, 'code', None) == _TIMESTAMP_ERROR and self.time_sync is not None:
+            try:
+                self.time_sync.measure()
+            except Exception as e:
+                logger.warning(f"Server time resync after -1021 failed: {e}")
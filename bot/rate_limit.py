@@ -0,0 +1,292 @@
+"""
+Client-side rate limit governor
+Token buckets per Binance limit, kept in sync with the X-MBX-* usage headers
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from urllib.parse import parse_qs
+
+logger = logging.getLogger(__name__)
+
+# USD-M futures defaults (exchangeInfo 'rateLimits' can override them)
+DEFAULT_LIMITS = {
+    ('REQUEST_WEIGHT', '1M'): 2400,
+    ('ORDERS', '10S'): 300,
+    ('ORDERS', '1M'): 1200,
+}
+
+_INTERVAL_SECONDS = {'S': 1, 'M': 60, 'H': 3600, 'D': 86400}
+_INTERVAL_LETTER = {'SECOND': 'S', 'MINUTE': 'M', 'HOUR': 'H', 'DAY': 'D'}
+
+_WEIGHT_HEADER = re.compile(r'^x-mbx-used-weight-(\d+[smhd])$')
+_ORDER_HEADER = re.compile(r'^x-mbx-order-count-(\d+[smhd])$')
+
+# (method, path suffix) -> request weight; everything else costs 1
+ENDPOINT_WEIGHTS = {
+    ('GET', '/fapi/v1/exchangeInfo'): 1,
+    ('GET', '/fapi/v2/account'): 5,
+    ('GET', '/fapi/v2/balance'): 5,
+    ('GET', '/fapi/v2/positionRisk'): 5,
+    ('GET', '/fapi/v1/allOrders'): 5,
+    ('GET', '/fapi/v1/userTrades'): 5,
+    ('GET', '/fapi/v1/depth'): 10,
+    ('POST', '/fapi/v1/batchOrders'): 5,
+}
+
+# endpoints that count against the ORDERS limits
+ORDER_ENDPOINTS = {
+    ('POST', '/fapi/v1/order'),
+    ('POST', '/fapi/v1/batchOrders'),
+    ('PUT', '/fapi/v1/order'),
+}
+
+
+def interval_seconds(code):
+    """'1M' -> 60, '10S' -> 10"""
+    return int(code[:-1]) * _INTERVAL_SECONDS[code[-1].upper()]
+
+
+def _batch_order_count(query, body):
+    """Number of orders in a batchOrders request (query string first, then body)"""
+    for source in (query, body):
+        if not source:
+            continue
+        if isinstance(source, bytes):
+            source = source.decode('utf-8', 'replace')
+        values = parse_qs(source).get('batchOrders')
+        if not values:
+            continue
+        try:
+            return max(1, len(json.loads(values[0])))
+        except ValueError:
+            # each order in the JSON list carries one "symbol" key
+            return max(1, values[0].count('"symbol"'))
+    return 1
+
+
+def request_cost(method, path, body=None):
+    """(weight, orders) a REST request will use; path may include the query string"""
+    method = method.upper()
+    path, _, query = path.partition('?')
+    key = (method, path)
+    weight = ENDPOINT_WEIGHTS.get(key, 1)
+    orders = 0
+    if key in ORDER_ENDPOINTS:
+        orders = 1
+        if path.endswith('batchOrders'):
+            # python-binance sends futures params in the query string, not the body
+            orders = _batch_order_count(query, body)
+    return weight, orders
+
+
+class TokenBucket:
+    """
+    One Binance limit (e.g. 2400 weight per minute)
+    capacity is limit * headroom so we stay a little under the real limit
+    """
+
+    def __init__(self, limit, interval, headroom=0.9, clock=time.monotonic):
+        self.limit = limit
+        self.interval = interval
+        self.capacity = limit * headroom
+        self.rate = self.capacity / interval
+        self._clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+        self.reported_used = None
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, cost, now):
+        self._refill(now)
+        # small tolerance so float rounding after a sleep can't leave us spinning
+        if self.tokens >= cost - 1e-9:
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+    def consume(self, cost):
+        self.tokens -= cost
+
+    def sync(self, used, now):
+        """The server says `used` is spent in its current window"""
+        self._refill(now)
+        self.reported_used = used
+        self.tokens = min(self.tokens, self.capacity - used)
+
+
+class RateLimitGovernor:
+    """
+    Schedules requests so REQUEST_WEIGHT and ORDERS limits are never exceeded
+
+    acquire(weight, orders) blocks until every bucket has room, then spends it.
+    update_from_headers(headers, status) syncs the buckets with what the
+    server reports and backs off completely on 429/418 (Retry-After).
+    """
+
+    def __init__(self, limits=None, headroom=0.9, clock=time.monotonic, sleep=time.sleep):
+        self.headroom = headroom
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.buckets = {}
+        self.blocked_until = 0.0
+
+        self.requests = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.limit_hits = 0
+
+        for key, limit in (limits or DEFAULT_LIMITS).items():
+            self._add_bucket(key, limit)
+
+    def _add_bucket(self, key, limit):
+        self.buckets[key] = TokenBucket(limit, interval_seconds(key[1]), self.headroom, self._clock)
+
+    def configure(self, rate_limits):
+        """Replace the limits with exchangeInfo['rateLimits']"""
+        with self._lock:
+            self.buckets = {}
+            for rl in rate_limits:
+                letter = _INTERVAL_LETTER.get(rl['interval'])
+                if letter is None or rl['rateLimitType'] not in ('REQUEST_WEIGHT', 'ORDERS'):
+                    continue
+                self._add_bucket((rl['rateLimitType'], f"{rl['intervalNum']}{letter}"), rl['limit'])
+
+    def acquire(self, weight=1, orders=0):
+        """Wait until the request fits in every limit, then reserve it. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            wait = self._reserve(weight, orders, waited)
+            if wait <= 0:
+                return waited
+            self._sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, weight=1, orders=0):
+        """acquire() for asyncio code: waits with asyncio.sleep instead of blocking the loop"""
+        import asyncio
+        waited = 0.0
+        while True:
+            wait = self._reserve(weight, orders, waited)
+            if wait <= 0:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def _reserve(self, weight, orders, waited):
+        """Spend the request's cost if every bucket has room (returns 0), else the seconds to wait"""
+        with self._lock:
+            now = self._clock()
+            wait = max(0.0, self.blocked_until - now)
+            for (limit_type, _), bucket in self.buckets.items():
+                cost = weight if limit_type == 'REQUEST_WEIGHT' else orders
+                if cost:
+                    wait = max(wait, bucket.wait_time(cost, now))
+            if wait > 0:
+                return wait
+            for (limit_type, _), bucket in self.buckets.items():
+                cost = weight if limit_type == 'REQUEST_WEIGHT' else orders
+                if cost:
+                    bucket.consume(cost)
+            self.requests += 1
+            if waited:
+                self.waits += 1
+                self.total_wait += waited
+            return 0.0
+
+    def update_from_headers(self, headers, status=200):
+        """Sync buckets from X-MBX-USED-WEIGHT-* / X-MBX-ORDER-COUNT-* response headers"""
+        retry_after = None
+        with self._lock:
+            now = self._clock()
+            for name, value in headers.items():
+                name = name.lower()
+                match = _WEIGHT_HEADER.match(name)
+                limit_type = 'REQUEST_WEIGHT'
+                if match is None:
+                    match = _ORDER_HEADER.match(name)
+                    limit_type = 'ORDERS'
+                if match is not None:
+                    bucket = self.buckets.get((limit_type, match.group(1).upper()))
+                    if bucket is not None:
+                        bucket.sync(int(value), now)
+                elif name == 'retry-after':
+                    retry_after = float(value)
+
+            if status in (418, 429):
+                self.limit_hits += 1
+                backoff = retry_after if retry_after is not None else 1.0
+                self.blocked_until = max(self.blocked_until, now + backoff)
+        if status in (418, 429):
+            logger.warning(f"Rate limit hit (HTTP {status}), backing off {backoff:.1f}s")
+
+    def metrics(self):
+        """Current state of every bucket plus wait counters"""
+        with self._lock:
+            now = self._clock()
+            buckets = {}
+            for (limit_type, interval), bucket in self.buckets.items():
+                bucket._refill(now)
+                buckets[f"{limit_type}_{interval}"] = {
+                    'limit': bucket.limit,
+                    'capacity': bucket.capacity,
+                    'available': bucket.tokens,
+                    'reported_used': bucket.reported_used,
+                }
+            return {
+                'buckets': buckets,
+                'requests': self.requests,
+                'waits': self.waits,
+                'total_wait': self.total_wait,
+                'limit_hits': self.limit_hits,
+                'blocked_for': max(0.0, self.blocked_until - now),
+            }
+
+
+class RateLimitServer:
+    """
+    Exchange-side fixed-window counters for offline tests
+    record() returns (status, headers) just like Binance would send them
+    """
+
+    def __init__(self, limits=None, clock=time.monotonic):
+        self.limits = dict(limits or DEFAULT_LIMITS)
+        self._clock = clock
+        self._windows = {key: (None, 0) for key in self.limits}
+        self.rejected = 0
+
+    def record(self, weight=1, orders=0):
+        now = self._clock()
+        usage = {}
+        over = False
+        for key, limit in self.limits.items():
+            seconds = interval_seconds(key[1])
+            window = int(now // seconds)
+            current, used = self._windows[key]
+            if current != window:
+                used = 0
+            cost = weight if key[0] == 'REQUEST_WEIGHT' else orders
+            if used + cost > limit:
+                over = True
+                retry_after = (window + 1) * seconds - now
+            usage[key] = (window, used + cost)
+
+        if over:
+            self.rejected += 1
+            return 429, {'Retry-After': str(max(1, int(retry_after + 0.999)))}
+
+        headers = {}
+        for key, state in usage.items():
+            self._windows[key] = state
+            if key[0] == 'REQUEST_WEIGHT':
+                headers[f"X-MBX-USED-WEIGHT-{key[1]}"] = str(state[1])
+            else:
+                headers[f"X-MBX-ORDER-COUNT-{key[1]}"] = str(state[1])
+        return 200, headers
@@ -0,0 +1,128 @@
+"""
+Idempotent order retries
+Every order carries a deterministic newClientOrderId, so after a failure the
+bot can ask the exchange whether the order landed before sending it again.
+Nothing here runs unless a request has already failed.
+"""
+
+import itertools
+import logging
+import os
+import random
+import sys
+import time
+
+from .errors import api_errors
+
+logger = logging.getLogger(__name__)
+
+# what a failure tells us about the order
+FATAL = 'fatal'            # rejected: retrying cannot help
+RETRY = 'retry'            # never reached the matching engine: safe to resend
+AMBIGUOUS = 'ambiguous'    # may or may not have been placed: look it up first
+
+# -1007 timeout waiting for the backend (send status unknown), -1001 internal disconnect
+_AMBIGUOUS_CODES = (-1007, -1001)
+# -1003 too many requests, -1015 too many orders, -1021 timestamp outside recvWindow
+_RETRY_CODES = (-1003, -1015, -1021)
+# -4116 the client ID already exists: an earlier attempt did get through
+_DUPLICATE_ID = -4116
+# -2013 order does not exist
+_NO_SUCH_ORDER = -2013
+
+
+def classify(error):
+    """FATAL, RETRY or AMBIGUOUS for an exception raised by an order request"""
+    if isinstance(error, api_errors()):
+        if error.code == _DUPLICATE_ID or error.code in _AMBIGUOUS_CODES:
+            return AMBIGUOUS
+        if error.code in _RETRY_CODES or error.status_code in (418, 429):
+            return RETRY
+        if error.status_code >= 500:
+            return AMBIGUOUS
+        return FATAL
+    requests_errors = sys.modules.get('requests.exceptions')
+    if requests_errors is not None:
+        if isinstance(error, requests_errors.ConnectTimeout):
+            return RETRY
+        if isinstance(error, (requests_errors.Timeout, requests_errors.ConnectionError)):
+            return AMBIGUOUS
+    if isinstance(error, ConnectionRefusedError):
+        return RETRY
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return AMBIGUOUS
+    return FATAL
+
+
+def lookup_order(client, symbol, client_order_id):
+    """The order with this client ID, or None if the exchange never saw it"""
+    try:
+        return client.futures_get_order(symbol=symbol, origClientOrderId=client_order_id)
+    except api_errors() as e:
+        if e.code == _NO_SUCH_ORDER:
+            return None
+        raise
+
+
+class ClientOrderIds:
+    """
+    Deterministic newClientOrderId values: prefix-1, prefix-2, ...
+    The default prefix is unique per process start, so a restarted bot
+    does not reuse IDs; pass your own prefix (and start) to reproduce a run.
+    """
+
+    def __init__(self, prefix=None, start=1):
+        if prefix is None:
+            prefix = f"tb{os.getpid():x}{int(time.time() * 1000):x}"
+        self.prefix = prefix
+        self._counter = itertools.count(start)
+
+    def next(self):
+        return f"{self.prefix}-{next(self._counter)}"
+
+
+class RetryPolicy:
+    """
+    Up to `attempts` retries with full-jitter exponential backoff
+    (a random delay between 0 and min(max_delay, base_delay * 2**attempt))
+    """
+
+    def __init__(self, attempts=3, base_delay=0.05, max_delay=2.0, seed=None, sleep=time.sleep):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self._random = random.Random(seed)
+        self.retries = 0
+        self.resolved = 0
+
+    def delay(self, attempt):
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def recover(self, error, send, lookup):
+        """
+        Finish an order whose first send() raised `error`
+        Ambiguous failures are resolved with lookup() (by client ID) before
+        anything is resent; resends reuse the same client ID, so the exchange
+        itself rejects a duplicate. Returns the order or raises the last error.
+        """
+        for attempt in range(self.attempts):
+            kind = classify(error)
+            if kind == FATAL:
+                raise error
+            self.retries += 1
+            delay = self.delay(attempt)
+            logger.warning("Order request failed (%s: %s), retry %d/%d in %.3fs",
+                           kind, error, attempt + 1, self.attempts, delay)
+            self.sleep(delay)
+            try:
+                if kind == AMBIGUOUS:
+                    order = lookup()
+                    if order is not None:
+                        self.resolved += 1
+                        logger.info("Order %s found by client ID after failure", order.get('orderId'))
+                        return order
+                return send()
+            except Exception as e:
+                error = e
+        raise error
@@ -0,0 +1,310 @@
+"""
+Pre-trade risk checks
+Position and open-order exposure per symbol for one account, kept up to
+date incrementally from order responses and user-data events, so checking
+an order is a few dict lookups and float comparisons instead of a
+futures_account() round trip
+"""
+
+import json
+import logging
+import threading
+from collections import deque
+
+from .models import OrderResult
+from .user_data import _ORDER_FIELDS
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+
+
+class RiskError(ValueError):
+    """An order breaks a risk limit; it was not sent"""
+
+
+class RiskLimits:
+    """
+    Limits for a symbol (or the default for every symbol); None disables one
+    Quantities are in the base asset and notionals in the quote asset at the
+    mark price. price_band is how far a LIMIT price may be from the mark, as
+    a fraction (0.05 = 5%). max_position and max_notional apply to the
+    worst case: the position plus every open order on one side filling.
+    """
+
+    __slots__ = ('max_order_qty', 'max_order_notional', 'max_position', 'max_notional', 'price_band')
+
+    def __init__(self, max_order_qty=None, max_order_notional=None, max_position=None, max_notional=None,
+                 price_band=None):
+        self.max_order_qty = max_order_qty
+        self.max_order_notional = max_order_notional
+        self.max_position = max_position
+        self.max_notional = max_notional
+        self.price_band = price_band
+
+    def needs_price(self):
+        return (self.max_order_notional is not None or self.max_notional is not None
+                or self.price_band is not None)
+
+
+class Exposure:
+    """One symbol: position, open order quantity per side, last mark and worst-case notional"""
+
+    __slots__ = ('position', 'open_buy', 'open_sell', 'mark', 'notional')
+
+    def __init__(self):
+        self.position = 0.0
+        self.open_buy = 0.0
+        self.open_sell = 0.0
+        self.mark = None
+        self.notional = 0.0
+
+    def worst(self, buy=0.0, sell=0.0):
+        """Largest absolute position if every open order (plus buy/sell more) on one side filled"""
+        return max(abs(self.position + self.open_buy + buy), abs(self.position - self.open_sell - sell))
+
+
+class RiskEngine:
+    """
+    Pre-trade limits for one account
+
+    check() runs before an order is sent and reserves its quantity as open
+    exposure; on_order() applies every response or update after that (it
+    only adds the change since the order's last known state, so the same
+    update seen twice from REST and the stream counts once); release()
+    drops the reservation of an order that was never placed. Reference
+    prices come from market_data (mark price, else mid) or
+    update_mark_price(). The account total adds up every symbol's
+    worst-case notional at the mark last seen for that symbol.
+    """
+
+    def __init__(self, limits=None, symbol_limits=None, max_account_notional=None, market_data=None,
+                 account='default', max_closed=10000):
+        self.limits = limits or RiskLimits()
+        self.symbol_limits = dict(symbol_limits or {})
+        self.max_account_notional = max_account_notional
+        self.market_data = market_data
+        self.account = account
+        self.max_closed = max_closed
+        self.account_notional = 0.0
+        self.checks = 0
+        self.rejections = 0
+        self._exposure = {}
+        # client order ID (or order ID) -> [symbol, side, executed, open quantity, finished]
+        self._orders = {}
+        self._closed = deque()
+        self._lock = threading.Lock()
+
+    def _get(self, symbol):
+        exposure = self._exposure.get(symbol)
+        if exposure is None:
+            exposure = self._exposure[symbol] = Exposure()
+        return exposure
+
+    def _refresh(self, exposure):
+        notional = exposure.worst() * (exposure.mark or 0.0)
+        self.account_notional += notional - exposure.notional
+        exposure.notional = notional
+
+    def update_mark_price(self, symbol, price):
+        with self._lock:
+            exposure = self._get(symbol)
+            exposure.mark = float(price)
+            self._refresh(exposure)
+
+    def _reference(self, symbol, exposure):
+        if self.market_data is not None:
+            price = self.market_data.mark_price(symbol)
+            if price is None:
+                price = self.market_data.mid_price(symbol)
+            if price is not None and price != exposure.mark:
+                exposure.mark = price
+                self._refresh(exposure)
+        return exposure.mark
+
+    # -- checks ----------------------------------------------------------
+
+    def check(self, symbol, side, order_type, quantity, price=None, client_order_id=None):
+        """
+        Raise RiskError if the order breaks a limit
+        With a client_order_id the quantity is held as open exposure until
+        on_order() or release() sees that ID, so orders checked concurrently
+        can't all use the same headroom.
+        """
+        qty = float(quantity)
+        price = float(price) if price is not None else None
+        limits = self.symbol_limits.get(symbol, self.limits)
+        with self._lock:
+            self.checks += 1
+            exposure = self._get(symbol)
+            mark = self._reference(symbol, exposure)
+            error = self._breach(limits, exposure, side, order_type, qty, price, mark)
+            if error is not None:
+                self.rejections += 1
+                logger.error("Risk check failed for %s %s %s %s: %s", self.account, side, qty, symbol, error)
+                raise RiskError(f"{symbol}: {error}")
+            if client_order_id is not None:
+                self._orders[client_order_id] = [symbol, side, 0.0, qty, False]
+                if side == 'BUY':
+                    exposure.open_buy += qty
+                else:
+                    exposure.open_sell += qty
+                self._refresh(exposure)
+
+    def _breach(self, limits, exposure, side, order_type, qty, price, mark):
+        """Why the order breaks a limit, or None"""
+        if limits.max_order_qty is not None and qty > limits.max_order_qty:
+            return f"quantity {qty:g} is above the {limits.max_order_qty:g} order limit"
+        reference = price if price is not None else mark
+        if reference is None and (limits.needs_price() or self.max_account_notional is not None):
+            return "no mark price to check the order against"
+        if limits.price_band is not None and order_type != 'MARKET' and price is not None:
+            if mark is None:
+                return "no mark price to check the order against"
+            if abs(price - mark) > limits.price_band * mark:
+                return f"price {price:g} is more than {limits.price_band:.2%} from the mark price {mark:g}"
+        if limits.max_order_notional is not None and qty * reference > limits.max_order_notional:
+            return f"notional {qty * reference:,.2f} is above the {limits.max_order_notional:,.2f} order limit"
+        buy, sell = (qty, 0.0) if side == 'BUY' else (0.0, qty)
+        worst = exposure.worst(buy, sell)
+        if limits.max_position is not None and worst > limits.max_position and worst > exposure.worst():
+            return f"position could reach {worst:g}, above the {limits.max_position:g} limit"
+        if limits.max_notional is not None or self.max_account_notional is not None:
+            notional = worst * (mark if mark is not None else reference)
+            if limits.max_notional is not None and notional > limits.max_notional and worst > exposure.worst():
+                return f"exposure could reach {notional:,.2f}, above the {limits.max_notional:,.2f} limit"
+            total = self.account_notional - exposure.notional + notional
+            if self.max_account_notional is not None and total > self.max_account_notional \
+                    and notional > exposure.notional:
+                return (f"account exposure could reach {total:,.2f}, above the "
+                        f"{self.max_account_notional:,.2f} limit")
+        return None
+
+    # -- updates ---------------------------------------------------------
+
+    def on_order(self, order):
+        """Apply an order response or update (OrderResult or API dict)"""
+        order = OrderResult.from_response(order)
+        key = order.client_order_id or order.order_id
+        executed = float(order.executed_qty_text or 0)
+        finished = order.status not in OPEN_STATUSES
+        remaining = 0.0 if finished else max(float(order.orig_qty_text or 0) - executed, 0.0)
+        with self._lock:
+            state = self._orders.get(key)
+            if state is None:
+                state = self._orders[key] = [order.symbol, order.side, 0.0, 0.0, False]
+            elif state[4]:
+                # already finished; a late duplicate
+                return
+            symbol, side, done, resting, _ = state
+            # a stale update can't undo fills already counted
+            executed = max(executed, done)
+            exposure = self._get(symbol)
+            if side == 'BUY':
+                exposure.position += executed - done
+                exposure.open_buy += remaining - resting
+            else:
+                exposure.position -= executed - done
+                exposure.open_sell += remaining - resting
+            state[2] = executed
+            state[3] = remaining
+            if finished:
+                state[4] = True
+                self._closed.append(key)
+                while len(self._closed) > self.max_closed:
+                    self._orders.pop(self._closed.popleft(), None)
+            self._refresh(exposure)
+
+    def release(self, client_order_id):
+        """Drop the reservation check() made for an order that was not placed"""
+        with self._lock:
+            state = self._orders.get(client_order_id)
+            if state is None or state[4] or state[2]:
+                return
+            del self._orders[client_order_id]
+            exposure = self._get(state[0])
+            if state[1] == 'BUY':
+                exposure.open_buy -= state[3]
+            else:
+                exposure.open_sell -= state[3]
+            self._refresh(exposure)
+
+    def cancel_all(self, symbol):
+        """Every open order on symbol was cancelled (cancel-all has no per-order responses)"""
+        with self._lock:
+            for key, state in list(self._orders.items()):
+                if state[0] == symbol and not state[4]:
+                    state[3] = 0.0
+                    state[4] = True
+                    self._closed.append(key)
+            while len(self._closed) > self.max_closed:
+                self._orders.pop(self._closed.popleft(), None)
+            exposure = self._get(symbol)
+            exposure.open_buy = exposure.open_sell = 0.0
+            self._refresh(exposure)
+
+    def set_position(self, symbol, amount, mark_price=None):
+        with self._lock:
+            exposure = self._get(symbol)
+            exposure.position = float(amount)
+            if mark_price is not None:
+                exposure.mark = float(mark_price)
+            self._refresh(exposure)
+
+    def load_snapshot(self, account, open_orders):
+        """
+        Start from REST snapshots (futures_account, futures_get_open_orders)
+        Positions are replaced; open orders are applied like any update.
+        """
+        for position in account.get('positions', []):
+            amount = float(position.get('positionAmt') or 0)
+            mark = position.get('markPrice')
+            if mark is None and amount and position.get('notional') is not None:
+                mark = abs(float(position['notional']) / amount)
+            self.set_position(position['symbol'], amount, mark)
+        for order in open_orders:
+            self.on_order(order)
+        logger.info("Risk state loaded for %s: %d positions, %d open orders", self.account,
+                    len(account.get('positions', [])), len(open_orders))
+
+    def on_message(self, message):
+        """
+        Apply a user-data or markPrice stream message (dict or JSON string)
+        ORDER_TRADE_UPDATE keeps orders and fills current, ACCOUNT_UPDATE
+        positions changed by anything but an order, markPriceUpdate the mark.
+        """
+        if isinstance(message, str):
+            message = json.loads(message)
+        data = message.get('data', message)
+        kind = data.get('e')
+        if kind == 'ORDER_TRADE_UPDATE':
+            event = data['o']
+            self.on_order({name: event[key] for key, name in _ORDER_FIELDS if key in event})
+        elif kind == 'ACCOUNT_UPDATE' and data['a'].get('m') != 'ORDER':
+            # fills already arrive as order updates; take positions from the
+            # account only when something else moved them (liquidation, ADL...)
+            for position in data['a'].get('P', []):
+                if position.get('ps', 'BOTH') == 'BOTH':
+                    self.set_position(position['s'], position['pa'])
+        elif kind == 'markPriceUpdate':
+            self.update_mark_price(data['s'], data['p'])
+        return kind
+
+    # -- reporting -------------------------------------------------------
+
+    def exposure(self, symbol):
+        """{'position', 'open_buy', 'open_sell', 'mark', 'notional'} for one symbol"""
+        with self._lock:
+            exposure = self._get(symbol)
+            return {name: getattr(exposure, name) for name in Exposure.__slots__}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'account': self.account,
+                'checks': self.checks,
+                'rejections': self.rejections,
+                'account_notional': self.account_notional,
+                'symbols': len(self._exposure),
+                'tracked_orders': len(self._orders) - len(self._closed),
+            }
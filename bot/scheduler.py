@@ -0,0 +1,120 @@
+"""
+Timer wheel scheduler
+Hashed timer wheel for the execution algorithms: O(1) to schedule or cancel
+a timer, and each tick only looks at one bucket. Runs on any clock, so a
+SimulatedClock makes a whole schedule play out instantly and reproducibly.
+"""
+
+import itertools
+import math
+import time
+
+# float slack when mapping times to ticks (0.7 / 0.1 is 6.999...)
+_EPSILON = 1e-9
+
+
+class SimulatedClock:
+    """A clock that only moves when told to: time() for the clock, sleep() to advance it"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class Timer:
+    __slots__ = ('when', 'tick', 'seq', 'callback', 'args', 'cancelled')
+
+    def __init__(self, when, tick, seq, callback, args):
+        self.when = when
+        self.tick = tick
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Timers bucketed by tick (tick seconds each) over `size` buckets
+
+    A timer fires from the first advance() at or after its time, never
+    before it and at most one tick late. Timers due in the same advance()
+    fire in (time, scheduling order), so runs are deterministic. Callbacks
+    run on the thread calling advance() and may schedule more timers.
+    """
+
+    def __init__(self, tick=0.1, size=512, clock=time.monotonic):
+        self.tick = tick
+        self.size = size
+        self.clock = clock
+        self._buckets = [[] for _ in range(size)]
+        # timers scheduled for a tick that was already processed
+        self._expired = []
+        self._current = math.floor(clock() / tick + _EPSILON)
+        self._seq = itertools.count()
+        self.pending = 0
+        self.fired = 0
+
+    def call_at(self, when, callback, *args):
+        """Run callback(*args) at clock time `when`; returns a Timer (cancel() to drop it)"""
+        tick = math.ceil(when / self.tick - _EPSILON)
+        timer = Timer(when, tick, next(self._seq), callback, args)
+        if tick <= self._current:
+            self._expired.append(timer)
+        else:
+            self._buckets[tick % self.size].append(timer)
+        self.pending += 1
+        return timer
+
+    def call_later(self, delay, callback, *args):
+        return self.call_at(self.clock() + delay, callback, *args)
+
+    def advance(self, now=None):
+        """Fire every timer due by `now` (default: the clock); returns how many fired"""
+        if now is None:
+            now = self.clock()
+        target = math.floor(now / self.tick + _EPSILON)
+        due = self._expired
+        self._expired = []
+        if target > self._current:
+            if target - self._current >= self.size:
+                ticks = range(self.size)
+            else:
+                ticks = range(self._current + 1, target + 1)
+            for tick in ticks:
+                bucket = self._buckets[tick % self.size]
+                if not bucket:
+                    continue
+                keep = []
+                for timer in bucket:
+                    (due if timer.tick <= target or timer.cancelled else keep).append(timer)
+                self._buckets[tick % self.size] = keep
+            self._current = target
+        fired = 0
+        while due:
+            due.sort(key=lambda t: (t.when, t.seq))
+            for timer in due:
+                self.pending -= 1
+                if not timer.cancelled:
+                    timer.callback(*timer.args)
+                    fired += 1
+            # timers the callbacks scheduled for a tick already passed
+            due = self._expired
+            self._expired = []
+        self.fired += fired
+        return fired
+
+    def run(self, until, sleep=time.sleep):
+        """advance() every tick until until() is true (sleep is clock.sleep with a SimulatedClock)"""
+        self.advance()
+        while not until():
+            sleep(self.tick)
+            self.advance()
@@ -0,0 +1,155 @@
+"""
+Pooled HTTP session setup
+One keep-alive connection pool per client, with retry/timeout tuning and reuse stats
+"""
+
+import socket
+import threading
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+from .rate_limit import request_cost
+
+
+class SessionConfig:
+    """
+    Tuning knobs for the client's HTTP session
+
+    pool_size        connections kept open per host
+    pool_block       wait for a free connection instead of opening extra ones
+    max_retries      retries for connection errors and 502/503/504 on idempotent calls
+    backoff_factor   urllib3 retry backoff
+    timeout          seconds, or a (connect, read) tuple
+    keepalive_idle   seconds before TCP keep-alive probes start (None = OS default)
+    """
+
+    def __init__(self, pool_size=10, pool_block=False, max_retries=3, backoff_factor=0.3,
+                 timeout=10, keepalive_idle=60):
+        self.pool_size = pool_size
+        self.pool_block = pool_block
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.keepalive_idle = keepalive_idle
+
+
+def _keepalive_socket_options(idle):
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # Linux/macOS only; other platforms just get SO_KEEPALIVE
+    if idle and hasattr(socket, 'TCP_KEEPIDLE'):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, int(idle)))
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, int(idle) // 4)))
+    return options
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with TCP keep-alive enabled on every pooled socket
+    If a governor is attached every request waits for rate limit budget
+    first, and the response headers are fed back into it.
+    """
+
+    def __init__(self, config, governor=None):
+        self.session_config = config
+        self.governor = governor
+        retries = Retry(
+            total=config.max_retries,
+            connect=config.max_retries,
+            read=0,
+            backoff_factor=config.backoff_factor,
+            status_forcelist=(502, 503, 504),
+            # never blindly resend orders; POST/PUT retries are handled by the caller
+            allowed_methods=frozenset({'GET', 'DELETE', 'HEAD', 'OPTIONS'}),
+            raise_on_status=False,
+        )
+        super().__init__(
+            pool_connections=4,
+            pool_maxsize=config.pool_size,
+            max_retries=retries,
+            pool_block=config.pool_block,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs['socket_options'] = _keepalive_socket_options(self.session_config.keepalive_idle)
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+
+    def send(self, request, **kwargs):
+        governor = self.governor
+        if governor is None:
+            return super().send(request, **kwargs)
+        weight, orders = request_cost(request.method, request.path_url, request.body)
+        governor.acquire(weight, orders)
+        response = super().send(request, **kwargs)
+        governor.update_from_headers(response.headers, response.status_code)
+        return response
+
+    def connection_counts(self):
+        """(connections opened, requests sent) summed over all host pools"""
+        opened = 0
+        sent = 0
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                sent += pool.num_requests
+        return opened, sent
+
+
+class SessionStats:
+    """Per-request timing collected from a requests response hook"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.total_time = 0.0
+        self.min_time = None
+        self.max_time = 0.0
+        self.last_time = None
+
+    def record(self, response, *args, **kwargs):
+        elapsed = response.elapsed.total_seconds()
+        with self._lock:
+            self.requests += 1
+            self.total_time += elapsed
+            self.last_time = elapsed
+            if self.min_time is None or elapsed < self.min_time:
+                self.min_time = elapsed
+            if elapsed > self.max_time:
+                self.max_time = elapsed
+        return response
+
+
+def configure_session(session, config=None, governor=None):
+    """
+    Mount a pooled keep-alive adapter on a requests session and start timing it
+    Returns (adapter, stats)
+    """
+    config = config or SessionConfig()
+    adapter = PooledHTTPAdapter(config, governor)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+
+    stats = SessionStats()
+    session.hooks['response'].append(stats.record)
+    return adapter, stats
+
+
+def connection_report(adapter, stats):
+    """Connection reuse and timing summary as a plain dict"""
+    opened, sent = adapter.connection_counts()
+    count = stats.requests
+    return {
+        'requests': count,
+        'connections_opened': opened,
+        'connections_reused': max(0, sent - opened),
+        'reuse_ratio': (sent - opened) / sent if sent else 0.0,
+        'avg_ms': stats.total_time * 1000 / count if count else None,
+        'min_ms': stats.min_time * 1000 if stats.min_time is not None else None,
+        'max_ms': stats.max_time * 1000 if count else None,
+        'last_ms': stats.last_time * 1000 if stats.last_time is not None else None,
+    }
@@ -0,0 +1,349 @@
+"""
+Simulated futures exchange
+Price-time-priority order books with partial fills, cancels, unique order
+IDs, a latency model and optional replay of historical trades. Backs
+MockBinanceClient so dry runs, tests and load tests see realistic fills.
+"""
+
+import itertools
+import json
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+# quantities below this are treated as fully filled (float residue)
+_EPSILON = 1e-12
+_INF = float('inf')
+
+
+def format_number(value):
+    """Float -> exchange-style string without exponent or trailing zeros"""
+    text = f"{value:.8f}".rstrip('0')
+    return text[:-1] if text.endswith('.') else text
+
+
+class LatencyModel:
+    """
+    Simulated network round trip: base seconds plus exponential jitter
+    Pass an int seed for reproducible samples.
+    """
+
+    def __init__(self, base=0.0, jitter=0.0, seed=None):
+        self.base = base
+        self.jitter = jitter
+        self._random = random.Random(seed)
+
+    def sample(self):
+        if self.jitter:
+            return self.base + self._random.expovariate(1.0 / self.jitter)
+        return self.base
+
+
+class SimOrder:
+    __slots__ = ('order_id', 'client_order_id', 'symbol', 'side', 'type', 'time_in_force',
+                 'price', 'orig_qty', 'orig_qty_text', 'price_text', 'remaining', 'executed',
+                 'cum_quote', 'status', 'update_time')
+
+    def __init__(self, order_id, client_order_id, symbol, side, order_type, time_in_force,
+                 price, qty, qty_text, price_text):
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.symbol = symbol
+        self.side = side
+        self.type = order_type
+        self.time_in_force = time_in_force
+        self.price = price
+        self.orig_qty = qty
+        self.orig_qty_text = qty_text
+        self.price_text = price_text
+        self.remaining = qty
+        self.executed = 0.0
+        self.cum_quote = 0.0
+        self.status = 'NEW'
+        self.update_time = 0
+
+    def to_response(self):
+        """Binance futures order response"""
+        executed = self.executed
+        if not executed:
+            executed_text = avg_price = cum_quote = '0'
+        else:
+            executed_text = self.orig_qty_text if executed == self.orig_qty else format_number(executed)
+            avg_price = format_number(self.cum_quote / executed)
+            cum_quote = format_number(self.cum_quote)
+        return {
+            'orderId': self.order_id,
+            'clientOrderId': self.client_order_id,
+            'symbol': self.symbol,
+            'side': self.side,
+            'type': self.type,
+            'timeInForce': self.time_in_force,
+            'status': self.status,
+            'origQty': self.orig_qty_text,
+            'executedQty': executed_text,
+            'price': self.price_text,
+            'avgPrice': avg_price,
+            'cumQuote': cum_quote,
+            'updateTime': self.update_time,
+        }
+
+
+class SimBook:
+    """
+    One symbol's resting orders
+    Levels are price -> deque of orders (time priority). Both key lists are
+    sorted so the best level is the last element: bids by price, asks by
+    -price. New levels are inserted with bisect.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.bids = {}
+        self.asks = {}
+        self.bid_keys = []
+        self.ask_keys = []
+        self.last_price = None
+
+    def best_bid(self):
+        return self.bid_keys[-1] if self.bid_keys else None
+
+    def best_ask(self):
+        return -self.ask_keys[-1] if self.ask_keys else None
+
+    def rest(self, order):
+        if order.side == 'BUY':
+            levels, keys, key = self.bids, self.bid_keys, order.price
+        else:
+            levels, keys, key = self.asks, self.ask_keys, -order.price
+        level = levels.get(order.price)
+        if level is None:
+            level = levels[order.price] = deque()
+            keys.insert(bisect_left(keys, key), key)
+        level.append(order)
+
+    def remove(self, order):
+        if order.side == 'BUY':
+            levels, keys, key = self.bids, self.bid_keys, order.price
+        else:
+            levels, keys, key = self.asks, self.ask_keys, -order.price
+        level = levels[order.price]
+        level.remove(order)
+        if not level:
+            del levels[order.price]
+            del keys[bisect_left(keys, key)]
+
+    def available(self, side, limit):
+        """Quantity a taker on `side` could fill up to `limit` (for FOK)"""
+        total = 0.0
+        if side == 'BUY':
+            for key in reversed(self.ask_keys):
+                if -key > limit:
+                    break
+                total += sum(o.remaining for o in self.asks[-key])
+        else:
+            for key in reversed(self.bid_keys):
+                if key < limit:
+                    break
+                total += sum(o.remaining for o in self.bids[key])
+        return total
+
+    def match(self, side, limit, quantity, now):
+        """
+        Take liquidity for a taker on `side` up to price `limit`
+        Returns (filled qty, quote spent). Resting orders are updated in place.
+        """
+        if side == 'BUY':
+            levels, keys, sign = self.asks, self.ask_keys, -1
+        else:
+            levels, keys, sign = self.bids, self.bid_keys, 1
+        remaining = quantity
+        quote = 0.0
+        while remaining > _EPSILON and keys:
+            price = sign * keys[-1]
+            if (side == 'BUY' and price > limit) or (side == 'SELL' and price < limit):
+                break
+            level = levels[price]
+            while level and remaining > _EPSILON:
+                maker = level[0]
+                fill = maker.remaining if maker.remaining < remaining else remaining
+                maker.remaining -= fill
+                maker.executed += fill
+                maker.cum_quote += fill * price
+                maker.update_time = now
+                remaining -= fill
+                quote += fill * price
+                if maker.remaining <= _EPSILON:
+                    maker.remaining = 0.0
+                    maker.executed = maker.orig_qty
+                    maker.status = 'FILLED'
+                    level.popleft()
+                else:
+                    maker.status = 'PARTIALLY_FILLED'
+            if not level:
+                del levels[price]
+                keys.pop()
+            self.last_price = price
+        return quantity - remaining, quote
+
+
+class SimulatedExchange:
+    """
+    Matching engine for any number of symbols
+
+    MARKET orders take liquidity; if the book runs dry the rest is filled at
+    the last trade price (or default_price) so dry runs always complete - set
+    fill_empty_book=False to expire the remainder instead, like a thin market.
+    LIMIT orders match what they cross and rest the remainder (GTC), cancel
+    it (IOC), fill completely or not at all (FOK), or are rejected if they
+    would take liquidity (GTX post-only).
+    """
+
+    def __init__(self, default_price=100.0, fill_empty_book=True, clock=time.time):
+        self.default_price = default_price
+        self.fill_empty_book = fill_empty_book
+        self._clock = clock
+        self._ids = itertools.count(1)
+        self.books = {}
+        self.orders = {}
+        self.client_orders = {}
+        self.trades = 0
+        # batch placement calls in from several threads
+        self._lock = threading.Lock()
+
+    def book(self, symbol):
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = SimBook(symbol)
+        return book
+
+    def submit(self, symbol, side, order_type, quantity, price=None, time_in_force=None,
+               client_order_id=None):
+        """Place an order and return its SimOrder (already matched)"""
+        with self._lock:
+            return self._submit(symbol, side, order_type, quantity, price, time_in_force, client_order_id)
+
+    def _submit(self, symbol, side, order_type, quantity, price, time_in_force, client_order_id):
+        qty = float(quantity)
+        order_id = next(self._ids)
+        if client_order_id is None:
+            client_order_id = f"sim-{order_id}"
+        elif client_order_id in self.client_orders:
+            raise ValueError(f"Duplicate clientOrderId {client_order_id}")
+        now = int(self._clock() * 1000)
+        book = self.book(symbol)
+
+        if order_type == 'MARKET':
+            order = SimOrder(order_id, client_order_id, symbol, side, 'MARKET', 'GTC',
+                             None, qty, str(quantity), '0')
+            limit = _INF if side == 'BUY' else 0.0
+        else:
+            limit = float(price)
+            time_in_force = time_in_force or 'GTC'
+            order = SimOrder(order_id, client_order_id, symbol, side, order_type, time_in_force,
+                             limit, qty, str(quantity), str(price))
+        order.update_time = now
+        self.orders[order_id] = order
+        self.client_orders[client_order_id] = order_id
+
+        if order_type != 'MARKET':
+            crosses = ((side == 'BUY' and book.ask_keys and book.best_ask() <= limit) or
+                       (side == 'SELL' and book.bid_keys and book.best_bid() >= limit))
+            if time_in_force == 'GTX' and crosses:
+                order.status = 'EXPIRED'
+                return order
+            if time_in_force == 'FOK' and book.available(side, limit) < qty - _EPSILON:
+                order.status = 'EXPIRED'
+                return order
+            if not crosses:
+                if time_in_force == 'IOC':
+                    order.status = 'EXPIRED'
+                else:
+                    book.rest(order)
+                return order
+
+        filled, quote = book.match(side, limit, qty, now)
+        if filled:
+            self.trades += 1
+        if order_type == 'MARKET' and qty - filled > _EPSILON and self.fill_empty_book:
+            price = book.last_price if book.last_price is not None else self.default_price
+            quote += (qty - filled) * price
+            filled = qty
+        order.executed = filled
+        order.cum_quote = quote
+        order.remaining = qty - filled
+        if order.remaining <= _EPSILON:
+            order.remaining = 0.0
+            order.executed = qty
+            order.status = 'FILLED'
+        elif order_type == 'MARKET' or time_in_force == 'IOC':
+            # the unfilled rest of an IOC/MARKET order is dropped
+            order.status = 'EXPIRED'
+        else:
+            order.status = 'PARTIALLY_FILLED' if filled else 'NEW'
+            book.rest(order)
+        return order
+
+    def find(self, order_id=None, client_order_id=None):
+        if order_id is not None:
+            return self.orders.get(int(order_id))
+        if client_order_id is not None:
+            order_id = self.client_orders.get(client_order_id)
+        return self.orders.get(order_id)
+
+    def cancel(self, order_id=None, client_order_id=None):
+        """Cancel a resting order; returns it, or None if it isn't open"""
+        with self._lock:
+            order = self.find(order_id, client_order_id)
+            if order is None or order.status not in ('NEW', 'PARTIALLY_FILLED'):
+                return None
+            self.books[order.symbol].remove(order)
+            order.status = 'CANCELED'
+            order.update_time = int(self._clock() * 1000)
+            return order
+
+    def open_orders(self, symbol=None):
+        books = [self.books[symbol]] if symbol in self.books else ([] if symbol else self.books.values())
+        result = []
+        for book in books:
+            for levels in (book.bids, book.asks):
+                for level in levels.values():
+                    result.extend(level)
+        result.sort(key=lambda o: o.order_id)
+        return result
+
+    def depth(self, symbol, limit=100):
+        """REST-style depth snapshot: {'lastUpdateId', 'bids', 'asks'} with string pairs"""
+        book = self.book(symbol)
+        bids = [[format_number(p), format_number(sum(o.remaining for o in book.bids[p]))]
+                for p in reversed(book.bid_keys[-limit:])]
+        asks = [[format_number(-k), format_number(sum(o.remaining for o in book.asks[-k]))]
+                for k in reversed(book.ask_keys[-limit:])]
+        return {'lastUpdateId': next(self._ids), 'bids': bids, 'asks': asks}
+
+    def replay_trade(self, symbol, price, quantity, buyer_is_maker):
+        """
+        Apply one historical trade to the resting orders
+        The aggressor is the seller when the buyer was the maker, so the trade
+        consumes our bids at or above its price (asks at or below otherwise).
+        """
+        side = 'SELL' if buyer_is_maker else 'BUY'
+        with self._lock:
+            book = self.book(symbol)
+            filled, _ = book.match(side, float(price), float(quantity), int(self._clock() * 1000))
+            book.last_price = float(price)
+        return filled
+
+    def replay_trades(self, symbol, trades):
+        """
+        Replay aggTrades-style dicts ({'p', 'q', 'm'}) or a JSONL file of them
+        Returns the quantity of our resting orders that got filled.
+        """
+        if isinstance(trades, str):
+            with open(trades) as f:
+                trades = [json.loads(line) for line in f if line.strip()]
+        filled = 0.0
+        for trade in trades:
+            filled += self.replay_trade(symbol, trade['p'], trade['q'], trade['m'])
+        return filled
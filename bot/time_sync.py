@@ -0,0 +1,80 @@
+"""
+Server time synchronisation
+Estimates the offset between the local clock and the exchange clock (and the
+round trip) so signed requests carry a timestamp the server accepts
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TimeSync:
+    """
+    Offset to the server clock, refreshed in the background
+
+    fetch_server_time() returns the server time in ms (e.g. from
+    futures_time()). Each measurement takes `samples` round trips and keeps
+    the one with the smallest RTT, assuming the server read its clock half
+    way through it (as NTP does). Until the first measurement the offset is 0.
+    """
+
+    def __init__(self, fetch_server_time, interval=60.0, samples=3, clock=time.time):
+        self.fetch_server_time = fetch_server_time
+        self.interval = interval
+        self.samples = samples
+        self._clock = clock
+        self.offset_ms = 0.0
+        self.rtt_ms = None
+        self.measurements = 0
+        self.last_sync = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def timestamp(self):
+        """Current server time estimate in ms (what goes into `timestamp=`)"""
+        return int(self._clock() * 1000 + self.offset_ms)
+
+    def measure(self):
+        """Take one measurement now; returns (offset_ms, rtt_ms)"""
+        best = None
+        for _ in range(self.samples):
+            sent = self._clock()
+            server_ms = self.fetch_server_time()
+            received = self._clock()
+            rtt_ms = (received - sent) * 1000
+            if best is None or rtt_ms < best[1]:
+                best = (server_ms - (sent + received) * 500, rtt_ms)
+        self.offset_ms, self.rtt_ms = best
+        self.measurements += 1
+        self.last_sync = self._clock()
+        logger.debug(f"Server time offset {self.offset_ms:+.1f}ms (rtt {self.rtt_ms:.1f}ms)")
+        return best
+
+    def start(self):
+        """Measure now and every `interval` seconds on a daemon thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='time-sync', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                self.measure()
+            except Exception as e:
+                logger.warning(f"Server time sync failed: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def stats(self):
+        return {'offset_ms': self.offset_ms, 'rtt_ms': self.rtt_ms, 'measurements': self.measurements}
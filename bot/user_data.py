@@ -0,0 +1,292 @@
+"""
+User-data stream consumer
+Keeps orders, positions and balances in memory from the futures user-data
+stream (ORDER_TRADE_UPDATE / ACCOUNT_UPDATE), so order status and account
+queries are answered locally instead of polling REST
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+
+from .models import OrderResult
+
+logger = logging.getLogger(__name__)
+
+TESTNET_USER_STREAM_URL = 'wss://stream.binancefuture.com/ws'
+USER_STREAM_URL = 'wss://fstream.binance.com/ws'
+
+OPEN_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+
+# ORDER_TRADE_UPDATE 'o' field -> REST order field
+_ORDER_FIELDS = (
+    ('i', 'orderId'), ('c', 'clientOrderId'), ('s', 'symbol'), ('S', 'side'), ('o', 'type'),
+    ('f', 'timeInForce'), ('X', 'status'), ('p', 'price'), ('q', 'origQty'), ('z', 'executedQty'),
+    ('ap', 'avgPrice'), ('T', 'updateTime'),
+)
+
+
+class UserDataStore:
+    """
+    Order, position and balance state for one account
+
+    Feed it with on_message() (live stream or replay()) on top of a REST
+    snapshot from load_snapshot(). Orders are stored as OrderResults and
+    replaced, never modified, so lookups hand them out without copying; an
+    event older than the stored updateTime is ignored, so a snapshot taken
+    while events queue up is safe. Only the newest max_closed finished
+    orders are kept.
+    """
+
+    def __init__(self, max_closed=10000):
+        self.max_closed = max_closed
+        self.orders = {}
+        self._by_client_id = {}
+        self._closed = deque()
+        self.positions = {}
+        self.balances = {}
+        self.account_time = 0
+        self.synced = False
+        self.messages = 0
+        self.fills = 0
+        self._lock = threading.RLock()
+
+    def on_message(self, message):
+        """Handle one stream message (dict or JSON string); returns the event type"""
+        if isinstance(message, str):
+            message = json.loads(message)
+        data = message.get('data', message)
+        kind = data.get('e')
+        with self._lock:
+            self.messages += 1
+            if kind == 'ORDER_TRADE_UPDATE':
+                self._on_order(data['o'])
+            elif kind == 'ACCOUNT_UPDATE':
+                self._on_account(data)
+            elif kind == 'listenKeyExpired':
+                logger.warning("User data listen key expired")
+                self.synced = False
+            elif kind == 'error':
+                logger.error(f"User data stream error: {data.get('m')}")
+                self.synced = False
+        return kind
+
+    def _on_order(self, event):
+        order_id = event['i']
+        current = self.orders.get(order_id)
+        if current is not None and (current.update_time or 0) > event['T']:
+            return
+        order = OrderResult.from_response({name: event[key] for key, name in _ORDER_FIELDS if key in event})
+        if event.get('x') == 'TRADE':
+            self.fills += 1
+        self._store(order)
+
+    def _store(self, order):
+        order_id = order.order_id
+        previous = self.orders.get(order_id)
+        self.orders[order_id] = order
+        if order.client_order_id:
+            self._by_client_id[order.client_order_id] = order_id
+        # count each order once, when it first shows up finished
+        if order.status not in OPEN_STATUSES and (previous is None or previous.status in OPEN_STATUSES):
+            self._closed.append(order_id)
+            while len(self._closed) > self.max_closed:
+                self._forget(self._closed.popleft())
+
+    def _forget(self, order_id):
+        order = self.orders.pop(order_id, None)
+        if order is not None and self._by_client_id.get(order.client_order_id) == order_id:
+            del self._by_client_id[order.client_order_id]
+
+    def _on_account(self, data):
+        if data.get('E', 0) < self.account_time:
+            return
+        self.account_time = data.get('E', 0)
+        account = data['a']
+        for balance in account.get('B', []):
+            self.balances[balance['a']] = {
+                'asset': balance['a'],
+                'walletBalance': balance['wb'],
+                'crossWalletBalance': balance['cw'],
+            }
+        for position in account.get('P', []):
+            side = position.get('ps', 'BOTH')
+            self.positions[(position['s'], side)] = {
+                'symbol': position['s'],
+                'positionSide': side,
+                'positionAmt': position['pa'],
+                'entryPrice': position['ep'],
+                'unrealizedProfit': position['up'],
+                'marginType': position.get('mt'),
+            }
+
+    def load_snapshot(self, account, open_orders):
+        """
+        Replace the state with REST snapshots (futures_account, futures_get_open_orders)
+        Orders we thought were open but the exchange no longer lists finished
+        while we were disconnected; they are dropped, so lookups fall back to REST.
+        """
+        with self._lock:
+            listed = {order['orderId'] for order in open_orders}
+            for order_id in [i for i, o in self.orders.items() if o.status in OPEN_STATUSES]:
+                if order_id not in listed:
+                    self._forget(order_id)
+            for order in open_orders:
+                self._store(OrderResult.from_response(order))
+            self.balances = {a['asset']: {'asset': a['asset'], 'walletBalance': a.get('walletBalance'),
+                                          'crossWalletBalance': a.get('crossWalletBalance')}
+                             for a in account.get('assets', [])}
+            self.positions = {(p['symbol'], p.get('positionSide', 'BOTH')): {
+                'symbol': p['symbol'],
+                'positionSide': p.get('positionSide', 'BOTH'),
+                'positionAmt': p.get('positionAmt'),
+                'entryPrice': p.get('entryPrice'),
+                'unrealizedProfit': p.get('unrealizedProfit'),
+                'marginType': p.get('marginType'),
+            } for p in account.get('positions', [])}
+            self.account_time = account.get('updateTime', 0)
+            self.synced = True
+            logger.info(f"User data synced: {len(open_orders)} open orders, {len(self.positions)} positions")
+
+    def get_order(self, order_id=None, client_order_id=None):
+        with self._lock:
+            if order_id is None:
+                order_id = self._by_client_id.get(client_order_id)
+            return self.orders.get(order_id)
+
+    def open_orders(self, symbol=None):
+        with self._lock:
+            return [o for o in self.orders.values()
+                    if o.status in OPEN_STATUSES and (symbol is None or o.symbol == symbol)]
+
+    def position(self, symbol, position_side='BOTH'):
+        with self._lock:
+            position = self.positions.get((symbol, position_side))
+            return dict(position) if position is not None else None
+
+    def balance(self, asset):
+        with self._lock:
+            balance = self.balances.get(asset)
+            return dict(balance) if balance is not None else None
+
+    def account_info(self):
+        """Balances and positions in the shape of futures_account()"""
+        with self._lock:
+            return {'assets': [dict(b) for b in self.balances.values()],
+                    'positions': [dict(p) for p in self.positions.values()]}
+
+    def replay(self, path):
+        """Feed every message recorded in a JSONL file; returns the number of messages"""
+        count = 0
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    self.on_message(line)
+                    count += 1
+        return count
+
+    def stats(self):
+        with self._lock:
+            return {'messages': self.messages, 'fills': self.fills, 'orders': len(self.orders),
+                    'open_orders': sum(1 for o in self.orders.values() if o.status in OPEN_STATUSES),
+                    'positions': len(self.positions), 'synced': self.synced}
+
+
+class UserDataStream:
+    """
+    Runs the user-data websocket for one account on a background thread
+
+    client is a python-binance Client (or MockBinanceClient): it creates and
+    keeps alive the listenKey and provides the REST snapshots. After every
+    (re)connect the store is resynced from REST; events that arrive while
+    the snapshot is fetched wait in the socket and are applied after it.
+    A listenKeyExpired event or a dropped connection reconnects with a new key.
+    """
+
+    def __init__(self, client, store=None, url=TESTNET_USER_STREAM_URL, keepalive_interval=1800,
+                 reconnect_delay=1.0):
+        self.client = client
+        self.store = store or UserDataStore()
+        self.url = url.rstrip('/')
+        self.keepalive_interval = keepalive_interval
+        self.reconnect_delay = reconnect_delay
+        self.listen_key = None
+        self.connects = 0
+        self.keepalives = 0
+        self._loop = None
+        self._task = None
+        self._thread = None
+        self._stopping = False
+
+    def resync(self):
+        """Reload open orders, positions and balances from REST"""
+        self.store.load_snapshot(self.client.futures_account(), self.client.futures_get_open_orders())
+
+    def start(self):
+        self._stopping = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name='user-data', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping = True
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.listen_key is not None:
+            try:
+                self.client.futures_stream_close(listenKey=self.listen_key)
+            except Exception as e:
+                logger.error(f"Failed to close listen key: {e}")
+            self.listen_key = None
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._task = self._loop.create_task(self._run())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    async def _run(self):
+        import websockets
+
+        loop = asyncio.get_running_loop()
+        while not self._stopping:
+            try:
+                self.listen_key = await loop.run_in_executor(None, self.client.futures_stream_get_listen_key)
+                async with websockets.connect(f"{self.url}/{self.listen_key}") as ws:
+                    self.connects += 1
+                    logger.info(f"User data stream connected (connection {self.connects})")
+                    await loop.run_in_executor(None, self.resync)
+                    keepalive = loop.create_task(self._keepalive(self.listen_key))
+                    try:
+                        async for message in ws:
+                            if self.store.on_message(message) == 'listenKeyExpired':
+                                break
+                    finally:
+                        keepalive.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"User data stream error: {e}")
+            self.store.synced = False
+            if not self._stopping:
+                logger.warning(f"User data stream disconnected, reconnecting in {self.reconnect_delay}s")
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def _keepalive(self, listen_key):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await loop.run_in_executor(None, lambda: self.client.futures_stream_keepalive(listenKey=listen_key))
+                self.keepalives += 1
+            except Exception as e:
+                logger.error(f"User data keepalive failed: {e}")
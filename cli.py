@@ -2,77 +2,17 @@
 import argparse
 import sys
 import logging
+import time
+from decimal import Decimal
 
-
-# Local lightweight validators and logging setup to avoid importing the package
-# which may depend on optional external libraries (kept minimal for CLI use)
-
-def setup_logging():
-    import logging
-    import os
-    from datetime import datetime
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-    log_filename = f"logs/trading_bot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    logging.basicConfig(
-        level=logging.INFO,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(log_filename),
-            logging.StreamHandler()
-        ]
-    )
-    logger = logging.getLogger(__name__)
-    logger.info(f"Logging initialized. Log file: {log_filename}")
-    return log_filename
-
-
-def validate_symbol(symbol):
-    if not symbol:
-        raise ValueError("Symbol cannot be empty")
-    symbol = symbol.upper()
-    if not symbol.endswith('USDT'):
-        logging.getLogger(__name__).warning(f"Symbol {symbol} doesn't end with USDT - might not work on USDT-M futures")
-    return symbol
-
-
-def validate_side(side):
-    side = side.upper()
-    if side not in ['BUY', 'SELL']:
-        raise ValueError(f"Invalid side: {side}. Must be BUY or SELL")
-    return side
-
-
-def validate_order_type(order_type):
-    order_type = order_type.upper()
-    if order_type not in ['MARKET', 'LIMIT']:
-        raise ValueError(f"Invalid order type: {order_type}. Must be MARKET or LIMIT")
-    return order_type
-
-
-def validate_quantity(quantity):
-    try:
-        qty = float(quantity)
-        if qty <= 0:
-            raise ValueError("Quantity must be positive")
-        return qty
-    except (ValueError, TypeError):
-        raise ValueError(f"Invalid quantity: {quantity}")
-
-
-def validate_price(price, order_type):
-    if order_type == 'LIMIT':
-        if price is None:
-            raise ValueError("Price is required for LIMIT orders")
-        try:
-            p = float(price)
-            if p <= 0:
-                raise ValueError("Price must be positive")
-            return p
-        except (ValueError, TypeError):
-            raise ValueError(f"Invalid price: {price}")
-    return None if price is None else float(price)
+from bot.logging_config import setup_logging
+from bot.validators import (
+    validate_symbol,
+    validate_side,
+    validate_order_type,
+    validate_quantity,
+    validate_price
+)
 
 logger = logging.getLogger(__name__)
 
@@ -96,7 +36,616 @@ def print_order_summary(symbol, side, order_type, quantity, price=None):
     print("="*50 + "\n")
 
 
-def main():
+def load_order_file(path):
+    """
+    Read order specs from a CSV (with a header row) or JSONL file
+    Columns/keys: symbol, side, type, quantity, price (price only for LIMIT),
+    and optionally account (for `cli.py portfolio`)
+    """
+    import csv
+    import json
+
+    rows = []
+    with open(path, newline='') as f:
+        if path.endswith('.jsonl') or path.endswith('.json'):
+            for line in f:
+                if line.strip():
+                    rows.append(json.loads(line))
+        else:
+            rows = list(csv.DictReader(f))
+
+    specs = []
+    for n, row in enumerate(rows, start=1):
+        row = {k.strip().lower(): v for k, v in row.items() if k}
+        try:
+            order_type = validate_order_type(row.get('type') or '')
+            spec = {
+                'symbol': validate_symbol(row.get('symbol')),
+                'side': validate_side(row.get('side') or ''),
+                'type': order_type,
+                'quantity': validate_quantity(row.get('quantity')),
+            }
+            price = validate_price(row.get('price') or None, order_type)
+            if price is not None:
+                spec['price'] = price
+            if row.get('account'):
+                spec['account'] = str(row['account']).strip()
+        except ValueError as e:
+            raise ValueError(f"{path} row {n}: {e}")
+        specs.append(spec)
+    return specs
+
+
+def run_batch(order_mgr, path, workers):
+    specs = load_order_file(path)
+    print(f"\nSubmitting {len(specs)} orders from {path}\n")
+
+    results = order_mgr.place_orders(specs, max_workers=workers)
+    failed = 0
+    for n, result in enumerate(results, start=1):
+        spec = result['spec']
+        if result['error'] is None:
+            order = result['order']
+            print(f"#{n} OK   {spec['side']} {spec['quantity']} {spec['symbol']} -> order {order['orderId']} ({order['status']})")
+        else:
+            failed += 1
+            print(f"#{n} FAIL {spec['side']} {spec['quantity']} {spec['symbol']} -> {result['error']}")
+
+    print(f"\nBatch complete: {len(results) - failed} placed, {failed} failed\n")
+    logger.info(f"Batch completed: {len(results) - failed} placed, {failed} failed")
+    return failed
+
+
+def add_order_arguments(parser):
+    parser.add_argument('--symbol', help='Trading pair (e.g., BTCUSDT)')
+    parser.add_argument('--side', choices=['BUY', 'SELL', 'buy', 'sell'],
+                        help='Order side')
+    parser.add_argument('--type', choices=['MARKET', 'LIMIT', 'market', 'limit'],
+                        help='Order type', dest='order_type')
+    parser.add_argument('--quantity', type=float, help='Order quantity')
+    parser.add_argument('--price', type=float, help='Limit price (required for LIMIT orders)')
+
+
+def require_order_arguments(parser, args):
+    missing = [name for name in ('symbol', 'side', 'order_type', 'quantity') if getattr(args, name) is None]
+    if missing:
+        flags = ', '.join('--' + ('type' if m == 'order_type' else m) for m in missing)
+        parser.error(f"the following arguments are required: {flags}")
+
+
+def get_credentials(args, dry_run):
+    import os
+    api_key = args.api_key or os.getenv('BINANCE_API_KEY')
+    api_secret = args.api_secret or os.getenv('BINANCE_API_SECRET')
+
+    if not dry_run and (not api_key or not api_secret):
+        print("\n❌ ERROR: API credentials not found!")
+        print("Either provide --api-key and --api-secret, or set environment variables:")
+        print("  export BINANCE_API_KEY='your_key'")
+        print("  export BINANCE_API_SECRET='your_secret'\n")
+        sys.exit(1)
+    return api_key, api_secret
+
+
+def make_order_manager(client, dry_run, metrics=None, journal=None):
+    """
+    OrderManager for the CLI; live orders are rounded/checked against the symbol
+    filters first and failed requests are retried (looked up by client ID first).
+    Journaled orders left unresolved by a crash are settled before anything else.
+    """
+    from bot.orders import OrderManager
+    if dry_run:
+        order_mgr = OrderManager(client, metrics=metrics, journal=journal)
+    else:
+        from bot.normalizer import OrderNormalizer
+        from bot.retry import RetryPolicy
+        order_mgr = OrderManager(client, normalizer=OrderNormalizer(client.get_symbol_rules), metrics=metrics,
+                                 journal=journal, retry=RetryPolicy())
+    if journal is not None and journal.unresolved():
+        # orders that were in flight when the last run died
+        order_mgr.settle_unresolved()
+    return order_mgr
+
+
+def make_client(api_key, api_secret, dry_run, metrics=None):
+    """Mock client for dry runs, else the process-wide live client (timed if metrics are on)"""
+    if dry_run:
+        from bot.client import MockBinanceClient
+        return MockBinanceClient()
+    from bot.client import get_shared_client
+    if metrics is None:
+        return get_shared_client(api_key, api_secret)
+    return get_shared_client(api_key, api_secret, metrics=metrics)
+
+
+def make_metrics(args):
+    if not getattr(args, 'stats', None):
+        return None
+    from bot.metrics import Metrics
+    return Metrics()
+
+
+def make_journal(args):
+    """Open (and replay) the order journal named by --journal; closed at exit"""
+    if not getattr(args, 'journal', None):
+        return None
+    import atexit
+    from bot.journal import OrderJournal
+    journal = OrderJournal(args.journal)
+    journal.replay()
+    atexit.register(journal.close)
+    return journal
+
+
+def print_stats(metrics, fmt):
+    if metrics is None:
+        return
+    print(metrics.prometheus() if fmt == 'prometheus' else "\nLatency by stage\n" + metrics.report() + "\n")
+
+
+def serve(argv):
+    """cli.py serve: keep one warm client and take orders over a Unix socket or stdin"""
+    from bot.daemon import DEFAULT_SOCKET, OrderDaemon
+
+    parser = argparse.ArgumentParser(prog='cli.py serve',
+                                     description='Run the order daemon (JSON lines over a Unix socket or stdin)')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help=f'Unix socket path (default {DEFAULT_SOCKET})')
+    parser.add_argument('--stdin', action='store_true', help='Read JSONL orders from stdin, answer on stdout')
+    parser.add_argument('--api-key', help='Binance API key (or set BINANCE_API_KEY env var)')
+    parser.add_argument('--api-secret', help='Binance API secret (or set BINANCE_API_SECRET env var)')
+    parser.add_argument('--dry-run', action='store_true', help='Simulate orders without contacting Binance')
+    parser.add_argument('--log-json', action='store_true', help='Write the log file as JSON lines')
+    parser.add_argument('--log-max-bytes', type=int, default=50 * 1024 * 1024,
+                        help='Rotate the log file at this size (0 = never)')
+    parser.add_argument('--stats', action='store_true',
+                        help='Record per-stage latency ({"op": "metrics"} returns it in Prometheus format)')
+    parser.add_argument('--journal', metavar='FILE', help='Persist every order to this SQLite journal')
+    args = parser.parse_args(argv)
+
+    # a long-running daemon logs through a background thread and rotates its file
+    setup_logging(queued=True, json_lines=args.log_json, max_bytes=args.log_max_bytes)
+    api_key, api_secret = get_credentials(args, args.dry_run)
+
+    metrics = make_metrics(args)
+    client = make_client(api_key, api_secret, args.dry_run, metrics)
+    daemon = OrderDaemon(make_order_manager(client, args.dry_run, metrics, make_journal(args)))
+
+    if args.stdin:
+        daemon.serve_stdio(sys.stdin, sys.stdout)
+        return
+    print(f"Order daemon listening on {args.socket} (Ctrl+C to stop)")
+    try:
+        daemon.serve_unix(args.socket)
+    except KeyboardInterrupt:
+        pass
+
+
+def load_accounts(path):
+    """Account credentials from JSON: {"name": {"api_key": ..., "api_secret": ...}}"""
+    import json
+    with open(path) as f:
+        accounts = json.load(f)
+    return {name: (creds['api_key'], creds['api_secret']) for name, creds in accounts.items()}
+
+
+def portfolio(argv):
+    """cli.py portfolio: execute an order file across many accounts and symbols in parallel"""
+    from bot.engine import ExecutionEngine
+
+    parser = argparse.ArgumentParser(prog='cli.py portfolio',
+                                     description='Execute orders for many accounts/symbols in parallel')
+    parser.add_argument('orders', help='CSV or JSONL order file with an account column')
+    parser.add_argument('--accounts', help='JSON file with the API key/secret of every account')
+    parser.add_argument('--dry-run', action='store_true', help='Simulate every account without contacting Binance')
+    parser.add_argument('--workers', type=int, default=16, help='Parallel (account, symbol) lanes')
+    parser.add_argument('--halt-after', type=int, help='Stop an account after this many failed orders')
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    try:
+        intents = load_order_file(args.orders)
+        if args.dry_run:
+            names = {intent.get('account') or 'default' for intent in intents}
+            from bot.client import MockBinanceClient
+            accounts = {name: make_order_manager(MockBinanceClient(), True) for name in names}
+        else:
+            if not args.accounts:
+                parser.error("--accounts is required unless --dry-run is used")
+            accounts = {name: make_order_manager(make_client(key, secret, False), False)
+                        for name, (key, secret) in load_accounts(args.accounts).items()}
+        engine = ExecutionEngine(accounts, max_workers=args.workers, halt_after=args.halt_after)
+        report = engine.run(intents)
+    except ValueError as e:
+        print(f"\n❌ VALIDATION ERROR: {e}\n")
+        logger.error(f"Validation error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}\n")
+        logger.error(f"Failed to run portfolio: {e}", exc_info=True)
+        sys.exit(1)
+
+    for n, result in enumerate(report['results'], start=1):
+        intent = result['intent']
+        label = f"{intent.get('account') or 'default'} {intent['side']} {intent['quantity']} {intent['symbol']}"
+        if result['error'] is None:
+            print(f"#{n} OK   {label} -> order {result['order']['orderId']} ({result['order']['status']})")
+        else:
+            print(f"#{n} FAIL {label} -> {result['error']}")
+    print()
+    for name, stats in sorted(report['accounts'].items()):
+        print(f"{name:<20} {stats['placed']:>6} placed {stats['failed']:>6} failed"
+              f"{'  HALTED' if stats['halted'] else ''}")
+    print(f"\nPortfolio complete: {report['placed']} placed, {report['failed']} failed in "
+          f"{report['seconds']:.2f}s ({report['orders_per_second']:.0f} orders/s)\n")
+    if report['failed']:
+        sys.exit(1)
+
+
+def print_algo_progress(progress):
+    avg = progress['avg_price']
+    print(f"[{progress['algo']}] {progress['status']:<9} {progress['filled']}/{progress['quantity']} "
+          f"{progress['symbol']} ({progress['percent']:.1f}%) in {progress['children']} children, "
+          f"avg {format(avg.quantize(Decimal('0.00000001')).normalize(), 'f') if avg is not None else '-'}, "
+          f"{progress['failed']} failed, {progress['elapsed']:.1f}s")
+
+
+def algo(argv):
+    """cli.py algo: work one parent order through TWAP, VWAP or iceberg child orders"""
+    from bot.algo import TWAP, VWAP, Iceberg
+    from bot.scheduler import SimulatedClock, TimerWheel
+
+    parser = argparse.ArgumentParser(prog='cli.py algo',
+                                     description='Split a parent order into child orders over time')
+    parser.add_argument('strategy', choices=['twap', 'vwap', 'iceberg'])
+    parser.add_argument('--symbol', required=True, help='Trading pair (e.g., BTCUSDT)')
+    parser.add_argument('--side', required=True, choices=['BUY', 'SELL', 'buy', 'sell'], help='Order side')
+    parser.add_argument('--quantity', required=True, help='Parent quantity')
+    parser.add_argument('--duration', type=float, default=300, help='Seconds to spread the order over (twap/vwap)')
+    parser.add_argument('--slices', type=int, default=10, help='Number of child orders (twap)')
+    parser.add_argument('--profile', help='Comma-separated volume per time bucket (vwap), e.g. 1,3,5,3')
+    parser.add_argument('--price', help='Limit price (iceberg)')
+    parser.add_argument('--display', help='Visible quantity per clip (iceberg)')
+    parser.add_argument('--poll', type=float, default=1.0, help='Seconds between child status checks')
+    parser.add_argument('--step-size', help='Quantity step (default: from the exchange info)')
+    parser.add_argument('--api-key', help='Binance API key (or set BINANCE_API_KEY env var)')
+    parser.add_argument('--api-secret', help='Binance API secret (or set BINANCE_API_SECRET env var)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Simulate against the mock exchange on a simulated clock (runs instantly)')
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    api_key, api_secret = get_credentials(args, args.dry_run)
+    try:
+        symbol = validate_symbol(args.symbol)
+        side = validate_side(args.side)
+        validate_quantity(args.quantity)
+        order_mgr = make_order_manager(make_client(api_key, api_secret, args.dry_run), args.dry_run)
+        common = {'step_size': args.step_size, 'on_progress': print_algo_progress, 'poll_interval': args.poll}
+        if args.strategy == 'twap':
+            parent = TWAP(order_mgr, symbol, side, args.quantity, args.duration, args.slices, **common)
+        elif args.strategy == 'vwap':
+            if not args.profile:
+                parser.error("--profile is required for vwap")
+            profile = [float(v) for v in args.profile.split(',')]
+            parent = VWAP(order_mgr, symbol, side, args.quantity, args.duration, profile, **common)
+        else:
+            if args.price is None or args.display is None:
+                parser.error("--price and --display are required for iceberg")
+            validate_price(args.price, 'LIMIT')
+            parent = Iceberg(order_mgr, symbol, side, args.quantity, args.price, args.display, **common)
+    except ValueError as e:
+        print(f"\n❌ VALIDATION ERROR: {e}\n")
+        logger.error(f"Validation error: {e}")
+        sys.exit(1)
+
+    if args.dry_run:
+        clock = SimulatedClock(time.time())
+        wheel, sleep = TimerWheel(clock=clock.time), clock.sleep
+    else:
+        wheel, sleep = TimerWheel(clock=time.monotonic), time.sleep
+    parent.start(wheel)
+    try:
+        wheel.run(lambda: parent.done, sleep=sleep)
+    except KeyboardInterrupt:
+        print("\nInterrupted, cancelling the remaining children")
+        parent.cancel()
+    if parent.status != 'DONE':
+        sys.exit(1)
+
+
+def parse_date(text):
+    """ISO date/datetime (UTC) -> ms timestamp"""
+    from datetime import datetime, timezone
+    moment = datetime.fromisoformat(text)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def history(argv):
+    """cli.py history: download klines into the local columnar cache"""
+    from bot.history import INTERVAL_MS, KlineStore
+
+    parser = argparse.ArgumentParser(prog='cli.py history',
+                                     description='Download futures klines into the local cache (only what is missing)')
+    parser.add_argument('symbols', nargs='+', help='Trading pairs (e.g., BTCUSDT ETHUSDT)')
+    parser.add_argument('--interval', default='1m', choices=list(INTERVAL_MS), help='Kline interval')
+    parser.add_argument('--start', required=True, help='First day to fetch, ISO format (UTC), e.g. 2023-01-01')
+    parser.add_argument('--end', help='End (exclusive), ISO format (default: the last closed kline)')
+    parser.add_argument('--dir', default='data/klines', help='Cache directory')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent page requests')
+    parser.add_argument('--api-key', help='Binance API key (or set BINANCE_API_KEY env var)')
+    parser.add_argument('--api-secret', help='Binance API secret (or set BINANCE_API_SECRET env var)')
+    parser.add_argument('--dry-run', action='store_true', help='Download synthetic klines from the mock client')
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    api_key, api_secret = get_credentials(args, args.dry_run)
+    try:
+        symbols = [validate_symbol(symbol) for symbol in args.symbols]
+        start = parse_date(args.start)
+        end = parse_date(args.end) if args.end else None
+    except ValueError as e:
+        print(f"\n❌ VALIDATION ERROR: {e}\n")
+        logger.error(f"Validation error: {e}")
+        sys.exit(1)
+
+    store = KlineStore(args.dir, client=make_client(api_key, api_secret, args.dry_run), max_workers=args.workers)
+    try:
+        for symbol in symbols:
+            added = store.update(symbol, args.interval, start, end)
+            klines = store.range(symbol, args.interval, start, end)
+            print(f"{symbol} {args.interval}: {added} new, {len(klines)} cached in range")
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}\n")
+        logger.error(f"Kline download failed: {e}", exc_info=True)
+        sys.exit(1)
+    print(f"\n{store.requests} requests\n")
+
+
+def backtest(argv):
+    """cli.py backtest: sweep a moving-average cross strategy over cached klines"""
+    from bot.backtest import FeeModel, MovingAverageCross, SlippageModel, sweep
+    from bot.history import INTERVAL_MS
+
+    parser = argparse.ArgumentParser(prog='cli.py backtest',
+                                     description='Backtest a moving-average cross over klines cached by cli.py history')
+    parser.add_argument('symbol', help='Trading pair (e.g., BTCUSDT)')
+    parser.add_argument('--interval', default='1m', choices=list(INTERVAL_MS), help='Kline interval')
+    parser.add_argument('--start', help='Start, ISO format (UTC) (default: everything cached)')
+    parser.add_argument('--end', help='End (exclusive), ISO format')
+    parser.add_argument('--dir', default='data/klines', help='Cache directory')
+    parser.add_argument('--fast', default='20', help='Comma-separated fast average windows, in bars')
+    parser.add_argument('--slow', default='100', help='Comma-separated slow average windows, in bars')
+    parser.add_argument('--size', type=float, default=1.0, help='Position size in the base asset')
+    parser.add_argument('--long-only', action='store_true', help='Go flat instead of short below the slow average')
+    parser.add_argument('--maker-fee', type=float, default=0.0002, help='Maker fee rate')
+    parser.add_argument('--taker-fee', type=float, default=0.0004, help='Taker fee rate')
+    parser.add_argument('--slippage', type=float, default=1.0, help='Slippage in basis points per taker fill')
+    parser.add_argument('--workers', type=int, help='Processes for the sweep (default: one per core)')
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    try:
+        symbol = validate_symbol(args.symbol)
+        start = parse_date(args.start) if args.start else None
+        end = parse_date(args.end) if args.end else None
+        grid = {'fast': [int(v) for v in args.fast.split(',')], 'slow': [int(v) for v in args.slow.split(',')],
+                'size': [args.size], 'long_only': [args.long_only]}
+    except ValueError as e:
+        print(f"\n❌ VALIDATION ERROR: {e}\n")
+        logger.error(f"Validation error: {e}")
+        sys.exit(1)
+
+    results = sweep(MovingAverageCross, grid, args.dir, symbol, args.interval, start, end, args.workers,
+                    fees=FeeModel(args.maker_fee, args.taker_fee), slippage=SlippageModel(args.slippage))
+    print(f"\n{'fast':>6} {'slow':>6} {'pnl':>14} {'return':>9} {'trades':>7} {'fees':>12} {'max dd':>8}")
+    for r in sorted(results, key=lambda r: r['pnl'], reverse=True):
+        print(f"{r['params']['fast']:>6} {r['params']['slow']:>6} {r['pnl']:>14,.2f} {r['return_pct']:>8.2f}% "
+              f"{r['trades']:>7} {r['fees']:>12,.2f} {r['max_drawdown_pct']:>7.2f}%")
+    print()
+
+
+def add_client_arguments(parser):
+    """Credentials, dry run, journal and worker pool size for the order management commands"""
+    parser.add_argument('--api-key', help='Binance API key (or set BINANCE_API_KEY env var)')
+    parser.add_argument('--api-secret', help='Binance API secret (or set BINANCE_API_SECRET env var)')
+    parser.add_argument('--dry-run', action='store_true', help='Run against the mock exchange')
+    parser.add_argument('--journal', metavar='FILE', help='Order journal to keep in step (and reconcile from)')
+    parser.add_argument('--workers', type=int, default=4, help='Symbols (or cancel batches) handled concurrently')
+
+
+def validated_symbols(symbols):
+    try:
+        return [validate_symbol(symbol) for symbol in symbols]
+    except ValueError as e:
+        print(f"\n❌ VALIDATION ERROR: {e}\n")
+        logger.error(f"Validation error: {e}")
+        sys.exit(1)
+
+
+def order_manager_for(args):
+    setup_logging()
+    api_key, api_secret = get_credentials(args, args.dry_run)
+    return make_order_manager(make_client(api_key, api_secret, args.dry_run), args.dry_run,
+                              journal=make_journal(args))
+
+
+def print_open_order(order):
+    print(f"  {order.order_id:>12} {order.client_order_id or '-':<28} {order.side:<4} {order.type:<6} "
+          f"{order.executed_qty_text or '0'}/{order.orig_qty_text} @ {order.price_text} {order.status}")
+
+
+def open_orders(argv):
+    """cli.py orders: list open orders"""
+    parser = argparse.ArgumentParser(prog='cli.py orders', description='List open orders')
+    parser.add_argument('symbols', nargs='*', help='Trading pairs (default: every symbol)')
+    add_client_arguments(parser)
+    args = parser.parse_args(argv)
+    symbols = validated_symbols(args.symbols) or None
+    by_symbol = order_manager_for(args).open_orders(symbols, args.workers)
+    print(f"\n{sum(len(orders) for orders in by_symbol.values())} open order(s)")
+    for symbol, orders in sorted(by_symbol.items()):
+        if orders:
+            print(f"{symbol}:")
+            for order in orders:
+                print_open_order(order)
+    print()
+
+
+def cancel(argv):
+    """cli.py cancel: cancel all orders on some symbols, or a list of orders on one"""
+    parser = argparse.ArgumentParser(prog='cli.py cancel', description='Cancel open orders')
+    parser.add_argument('symbols', nargs='+', help='Trading pair(s); --ids/--client-ids take exactly one')
+    which = parser.add_mutually_exclusive_group(required=True)
+    which.add_argument('--all', action='store_true', help='Cancel every open order on the symbols')
+    which.add_argument('--ids', nargs='+', type=int, metavar='ORDER_ID', help='Order IDs to cancel, 10 per request')
+    which.add_argument('--client-ids', nargs='+', metavar='CLIENT_ORDER_ID',
+                       help='Client order IDs to cancel, 10 per request')
+    add_client_arguments(parser)
+    args = parser.parse_args(argv)
+    symbols = validated_symbols(args.symbols)
+    if not args.all and len(symbols) != 1:
+        parser.error("--ids/--client-ids need exactly one symbol")
+    order_mgr = order_manager_for(args)
+
+    failed = 0
+    if args.all:
+        for symbol, error in order_mgr.cancel_all(symbols, args.workers).items():
+            print(f"{symbol}: {'all open orders cancelled' if error is None else f'❌ {error}'}")
+            failed += error is not None
+    else:
+        # order IDs go out as ints and client order IDs as strings, even all-digit ones
+        ids = args.ids or args.client_ids
+        results = order_mgr.cancel_orders({symbols[0]: ids}, args.workers)[symbols[0]]
+        for result in results:
+            print(f"{symbols[0]} {result['id']}: "
+                  f"{result['order'].status if result['error'] is None else '❌ ' + result['error']}")
+            failed += result['error'] is not None
+    if failed:
+        sys.exit(1)
+
+
+def replace(argv):
+    """cli.py replace: cancel a LIMIT order and place its replacement"""
+    parser = argparse.ArgumentParser(prog='cli.py replace',
+                                     description='Cancel an open LIMIT order, then place it again at a new price')
+    parser.add_argument('symbol', help='Trading pair (e.g., BTCUSDT)')
+    which = parser.add_mutually_exclusive_group(required=True)
+    which.add_argument('--id', type=int, metavar='ORDER_ID', help='Order ID of the order to replace')
+    which.add_argument('--client-id', metavar='CLIENT_ORDER_ID', help='Client order ID of the order to replace')
+    parser.add_argument('--price', help='New limit price (default: unchanged)')
+    parser.add_argument('--quantity', help='New quantity (default: what the old order had left)')
+    add_client_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        symbol = validate_symbol(args.symbol)
+        if args.price is not None:
+            validate_price(args.price, 'LIMIT')
+        if args.quantity is not None:
+            validate_quantity(args.quantity)
+    except ValueError as e:
+        print(f"\n❌ VALIDATION ERROR: {e}\n")
+        logger.error(f"Validation error: {e}")
+        sys.exit(1)
+    order_mgr = order_manager_for(args)
+    try:
+        result = order_mgr.cancel_replace(symbol, args.id, args.client_id, price=args.price,
+                                          quantity=args.quantity)
+    except Exception as e:
+        print(f"\n❌ ERROR: {getattr(e, 'message', None) or e}\n")
+        logger.error(f"Cancel-replace failed: {e}")
+        sys.exit(1)
+    print(f"\nCancelled {result['cancelled'].order_id} "
+          f"({result['cancelled'].executed_qty_text or '0'} of {result['cancelled'].orig_qty_text} filled)")
+    print(order_mgr.format_order_response(result['order']))
+
+
+def reconcile(argv):
+    """cli.py reconcile: compare the order journal's open orders with the exchange"""
+    parser = argparse.ArgumentParser(prog='cli.py reconcile',
+                                     description='Diff the journal\'s open orders against the exchange')
+    parser.add_argument('symbols', nargs='*', help='Trading pairs (default: every symbol, one request)')
+    parser.add_argument('--repair', action='store_true', help='Record the exchange state in the journal')
+    add_client_arguments(parser)
+    args = parser.parse_args(argv)
+    if not args.journal:
+        parser.error("--journal is required")
+    symbols = validated_symbols(args.symbols) or None
+    order_mgr = order_manager_for(args)
+    diffs = order_mgr.reconcile(symbols, repair=args.repair, max_workers=args.workers)
+    out_of_sync = 0
+    for symbol, diff in diffs.items():
+        problems = len(diff['unknown']) + len(diff['missing']) + len(diff['mismatched'])
+        out_of_sync += problems
+        print(f"{symbol}: {diff['matched']} matched, {len(diff['unknown'])} only on the exchange, "
+              f"{len(diff['missing'])} only local, {len(diff['mismatched'])} different")
+        for order in diff['unknown']:
+            print_open_order(order)
+        for order in diff['missing']:
+            print_open_order(order)
+        for pair in diff['mismatched']:
+            print_open_order(pair['exchange'])
+    print(f"\n{'In sync' if not out_of_sync else f'{out_of_sync} difference(s)'}"
+          f"{' (journal repaired)' if args.repair and out_of_sync else ''}\n")
+    if out_of_sync and not args.repair:
+        sys.exit(1)
+
+
+def submit(argv):
+    """cli.py submit: forward one order to a running daemon, or place it directly if none is up"""
+    from bot.daemon import DEFAULT_SOCKET, DaemonClient, is_running
+
+    parser = argparse.ArgumentParser(prog='cli.py submit',
+                                     description='Send an order to the running order daemon')
+    add_order_arguments(parser)
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help=f'Unix socket path (default {DEFAULT_SOCKET})')
+    args, rest = parser.parse_known_args(argv)
+    require_order_arguments(parser, args)
+
+    if not is_running(args.socket):
+        print(f"No order daemon on {args.socket}, placing the order directly", file=sys.stderr)
+        direct = ['--symbol', args.symbol, '--side', args.side, '--type', args.order_type,
+                  '--quantity', str(args.quantity)]
+        if args.price is not None:
+            direct += ['--price', str(args.price)]
+        return main(direct + rest)
+
+    order_type = args.order_type.upper()
+    print_order_summary(args.symbol.upper(), args.side.upper(), order_type, args.quantity, args.price)
+    with DaemonClient(args.socket) as daemon:
+        reply = daemon.submit(args.symbol, args.side, order_type, args.quantity, args.price)
+
+    if not reply['ok']:
+        print(f"\n❌ ERROR: {reply['error']}\n")
+        sys.exit(1)
+    from bot.orders import format_order_response
+    print(format_order_response(reply['order']))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'serve':
+        return serve(argv[1:])
+    if argv and argv[0] == 'submit':
+        return submit(argv[1:])
+    if argv and argv[0] == 'portfolio':
+        return portfolio(argv[1:])
+    if argv and argv[0] == 'algo':
+        return algo(argv[1:])
+    if argv and argv[0] == 'history':
+        return history(argv[1:])
+    if argv and argv[0] == 'backtest':
+        return backtest(argv[1:])
+    if argv and argv[0] == 'orders':
+        return open_orders(argv[1:])
+    if argv and argv[0] == 'cancel':
+        return cancel(argv[1:])
+    if argv and argv[0] == 'replace':
+        return replace(argv[1:])
+    if argv and argv[0] == 'reconcile':
+        return reconcile(argv[1:])
+
     setup_logging()
     
     parser = argparse.ArgumentParser(
@@ -109,38 +658,78 @@ Examples:
   
   # Place a limit sell order
   python cli.py --symbol ETHUSDT --side SELL --type LIMIT --quantity 0.01 --price 3000
+
+  # Place many orders from a CSV or JSONL file (5 per batch request)
+  python cli.py --batch orders.csv
+
+  # Keep a warm daemon running and forward orders to it
+  python cli.py serve &
+  python cli.py submit --symbol BTCUSDT --side BUY --type MARKET --quantity 0.001
+
+  # Execute an order file (with an account column) across many accounts in parallel
+  python cli.py portfolio orders.csv --accounts accounts.json
+
+  # Buy 1 BTC in 12 slices over an hour (also: vwap --profile, iceberg --price --display)
+  python cli.py algo twap --symbol BTCUSDT --side BUY --quantity 1 --duration 3600 --slices 12
+
+  # Cache 1m klines since 2023 for backtests (re-running only fetches what is new)
+  python cli.py history BTCUSDT ETHUSDT --interval 1m --start 2023-01-01
+
+  # Sweep moving-average windows over the cached klines on all cores
+  python cli.py backtest BTCUSDT --fast 10,20,50 --slow 100,200
+
+  # List, cancel, replace and reconcile open orders
+  python cli.py orders BTCUSDT ETHUSDT
+  python cli.py cancel BTCUSDT ETHUSDT --all
+  python cli.py cancel BTCUSDT --ids 4055671234 4055671235
+  python cli.py cancel BTCUSDT --client-ids my-order-1 my-order-2
+  python cli.py replace BTCUSDT --id 4055671234 --price 30100
+  python cli.py reconcile --journal orders.db --repair
         """
     )
     
-    # Required arguments
-    parser.add_argument('--symbol', required=True, help='Trading pair (e.g., BTCUSDT)')
-    parser.add_argument('--side', required=True, choices=['BUY', 'SELL', 'buy', 'sell'],
-                        help='Order side')
-    parser.add_argument('--type', required=True, choices=['MARKET', 'LIMIT', 'market', 'limit'],
-                        help='Order type', dest='order_type')
-    parser.add_argument('--quantity', required=True, type=float, help='Order quantity')
+    # Order arguments (symbol/side/type/quantity are required unless --batch is used)
+    add_order_arguments(parser)
     
     # Optional arguments
-    parser.add_argument('--price', type=float, help='Limit price (required for LIMIT orders)')
     parser.add_argument('--api-key', help='Binance API key (or set BINANCE_API_KEY env var)')
     parser.add_argument('--api-secret', help='Binance API secret (or set BINANCE_API_SECRET env var)')
     parser.add_argument('--dry-run', action='store_true', help='Simulate order without contacting Binance')
+    parser.add_argument('--batch', metavar='FILE', help='Place all orders listed in a CSV or JSONL file')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent batch requests (with --batch)')
+    parser.add_argument('--stats', nargs='?', const='table', choices=['table', 'prometheus'],
+                        help='Print per-stage latency after the order(s) (table or prometheus)')
+    parser.add_argument('--journal', metavar='FILE', help='Persist every order to this SQLite journal')
     
-    args = parser.parse_args()
-    
-    dry_run = args.dry_run
+    args = parser.parse_args(argv)
 
-    import os
-    api_key = args.api_key or os.getenv('BINANCE_API_KEY')
-    api_secret = args.api_secret or os.getenv('BINANCE_API_SECRET')
+    if not args.batch:
+        require_order_arguments(parser, args)
     
-    if not dry_run and (not api_key or not api_secret):
-        print("\n❌ ERROR: API credentials not found!")
-        print("Either provide --api-key and --api-secret, or set environment variables:")
-        print("  export BINANCE_API_KEY='your_key'")
-        print("  export BINANCE_API_SECRET='your_secret'\n")
-        sys.exit(1)
+    dry_run = args.dry_run
+    api_key, api_secret = get_credentials(args, dry_run)
     
+    if args.batch:
+        try:
+            if dry_run:
+                logger.info("Dry-run mode enabled")
+            metrics = make_metrics(args)
+            client = make_client(api_key, api_secret, dry_run, metrics)
+            order_mgr = make_order_manager(client, dry_run, metrics, make_journal(args))
+            failed = run_batch(order_mgr, args.batch, args.workers)
+            print_stats(metrics, args.stats)
+        except ValueError as e:
+            print(f"\n❌ VALIDATION ERROR: {e}\n")
+            logger.error(f"Validation error: {e}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"\n❌ ERROR: {e}\n")
+            logger.error(f"Failed to place batch: {e}", exc_info=True)
+            sys.exit(1)
+        if failed:
+            sys.exit(1)
+        return
+
     try:
         symbol = validate_symbol(args.symbol)
         side = validate_side(args.side)
@@ -153,61 +742,9 @@ Examples:
         logger.info("Initializing Binance client...")
         if dry_run:
             logger.info("Dry-run mode enabled")
-            class _LocalMockClient:
-                def futures_create_order(self, **kwargs):
-                    import time
-                    order_type = kwargs.get('type')
-                    qty = kwargs.get('quantity')
-                    price = kwargs.get('price')
-                    executed = str(qty) if order_type == 'MARKET' else '0'
-                    avg_price = '100' if order_type == 'MARKET' else '0'
-                    return {
-                        'orderId': int(time.time()),
-                        'symbol': kwargs.get('symbol'),
-                        'side': kwargs.get('side'),
-                        'type': order_type,
-                        'status': 'FILLED' if order_type == 'MARKET' else 'NEW',
-                        'origQty': str(qty),
-                        'executedQty': executed,
-                        'price': str(price) if price is not None else '0',
-                        'avgPrice': avg_price
-                    }
-                def futures_account(self):
-                    return {'assets': []}
-                def futures_exchange_info(self):
-                    return {'symbols': []}
-            class _LocalOrderManager:
-                def __init__(self, client):
-                    self.client = client
-                def place_market_order(self, symbol, side, quantity):
-                    return self.client.futures_create_order(symbol=symbol, side=side, type='MARKET', quantity=quantity)
-                def place_limit_order(self, symbol, side, quantity, price):
-                    return self.client.futures_create_order(symbol=symbol, side=side, type='LIMIT', timeInForce='GTC', quantity=quantity, price=price)
-                def format_order_response(self, order):
-                    output = []
-                    output.append("\n" + "="*50)
-                    output.append("ORDER EXECUTED SUCCESSFULLY")
-                    output.append("="*50)
-                    output.append(f"Order ID: {order.get('orderId', 'N/A')}")
-                    output.append(f"Symbol: {order.get('symbol', 'N/A')}")
-                    output.append(f"Side: {order.get('side', 'N/A')}")
-                    output.append(f"Type: {order.get('type', 'N/A')}")
-                    output.append(f"Status: {order.get('status', 'N/A')}")
-                    output.append(f"Quantity: {order.get('origQty', 'N/A')}")
-                    if 'executedQty' in order:
-                        output.append(f"Executed Qty: {order['executedQty']}")
-                    if 'avgPrice' in order and order['avgPrice'] != '0':
-                        output.append(f"Average Price: {order['avgPrice']}")
-                    elif 'price' in order:
-                        output.append(f"Limit Price: {order['price']}")
-                    output.append("="*50 + "\n")
-                    return "\n".join(output)
-            client = _LocalMockClient()
-            order_mgr = _LocalOrderManager(client)
-        else:
-            from bot import BinanceClient, OrderManager
-            client = BinanceClient(api_key, api_secret)
-            order_mgr = OrderManager(client)
+        metrics = make_metrics(args)
+        client = make_client(api_key, api_secret, dry_run, metrics)
+        order_mgr = make_order_manager(client, dry_run, metrics, make_journal(args))
         
         # Place the order
         if order_type == 'MARKET':
@@ -217,6 +754,7 @@ Examples:
         
         formatted_output = order_mgr.format_order_response(order)
         print(formatted_output)
+        print_stats(metrics, args.stats)
         
         logger.info("Order completed successfully")
         
@@ -0,0 +1,155 @@
+import unittest
+from decimal import Decimal
+
+from bot.algo import TWAP, VWAP, Iceberg, split_quantity
+from bot.client import MockBinanceClient
+from bot.errors import api_error
+from bot.orders import OrderManager
+from bot.retry import ClientOrderIds
+from bot.scheduler import SimulatedClock, TimerWheel
+
+
+class SplitQuantityTest(unittest.TestCase):
+    def test_children_are_on_grid_and_sum_exactly(self):
+        children = split_quantity('1.000', [1] * 7, '0.001')
+        self.assertEqual(sum(children), Decimal('1.000'))
+        self.assertTrue(all(c % Decimal('0.001') == 0 for c in children))
+        self.assertEqual(max(children) - min(children), Decimal('0.001'))
+
+    def test_small_children_are_carried(self):
+        children = split_quantity('0.5', [1, 1, 1, 1, 1], '0.1', min_qty='0.2')
+        self.assertEqual(children, [0, Decimal('0.2'), 0, Decimal('0.3'), 0])
+
+    def test_rejects_off_grid_quantity(self):
+        with self.assertRaises(ValueError):
+            split_quantity('1.0005', [1, 1], '0.001')
+
+
+class TimerWheelTest(unittest.TestCase):
+    def test_fires_in_time_order_and_skips_cancelled(self):
+        clock = SimulatedClock()
+        wheel = TimerWheel(tick=0.1, size=8, clock=clock.time)
+        fired = []
+        wheel.call_at(0.7, fired.append, 'b')
+        wheel.call_at(0.3, fired.append, 'a')
+        wheel.call_at(5.0, fired.append, 'late')
+        wheel.call_at(0.5, fired.append, 'x').cancel()
+        wheel.advance(0.69)
+        self.assertEqual(fired, ['a'])
+        wheel.advance(0.7)
+        self.assertEqual(fired, ['a', 'b'])
+        # more than one revolution at once
+        wheel.advance(10.0)
+        self.assertEqual(fired, ['a', 'b', 'late'])
+        self.assertEqual(wheel.pending, 0)
+
+
+class AlgoTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = SimulatedClock(1000.0)
+        self.wheel = TimerWheel(tick=0.1, clock=self.clock.time)
+        self.mock = MockBinanceClient(num_symbols=3)
+        self.order_mgr = OrderManager(self.mock)
+        self.updates = []
+
+    def run_algo(self, algo):
+        algo.start(self.wheel)
+        self.wheel.run(lambda: algo.done, sleep=self.clock.sleep)
+        return algo
+
+    def test_twap_uses_symbol_step_size(self):
+        # C001USDT trades in steps of 0.1
+        algo = self.run_algo(TWAP(self.order_mgr, 'C001USDT', 'BUY', '1.0', duration=60, slices=7,
+                                  on_progress=self.updates.append))
+        self.assertEqual(algo.status, 'DONE')
+        self.assertEqual(algo.filled, Decimal('1.0'))
+        self.assertEqual(len(algo.children), 7)
+        self.assertTrue(all(c['quantity'] % Decimal('0.1') == 0 for c in algo.children))
+        offsets = [c['at'] - 1000.0 for c in algo.children]
+        for n, offset in enumerate(offsets):
+            self.assertAlmostEqual(offset, n * 60 / 7, delta=0.1 + 1e-9)
+        self.assertEqual(self.updates[-1]['status'], 'DONE')
+        self.assertEqual(self.updates[-1]['percent'], 100.0)
+        self.assertEqual(self.updates[-1]['avg_price'], Decimal('100'))
+
+    def test_vwap_follows_profile(self):
+        algo = self.run_algo(VWAP(self.order_mgr, 'BTCUSDT', 'SELL', '1.0', duration=40, profile=[1, 3, 0, 6],
+                                  step_size='0.1'))
+        self.assertEqual([c['quantity'] for c in algo.children], [Decimal('0.1'), Decimal('0.3'), Decimal('0.6')])
+        self.assertEqual([round(c['at'] - 1000.0, 6) for c in algo.children], [0, 10, 30])
+
+    def test_failed_child_is_carried_to_the_next_slice(self):
+        self.mock.inject_fault(api_error(-1001, 'Internal error; unable to process your request.'))
+        algo = self.run_algo(TWAP(self.order_mgr, 'BTCUSDT', 'BUY', '0.4', duration=4, slices=4, step_size='0.1'))
+        self.assertEqual(algo.status, 'DONE')
+        self.assertEqual(algo.failures, 1)
+        self.assertEqual([c['quantity'] for c in algo.children],
+                         [Decimal('0.1'), Decimal('0.2'), Decimal('0.1'), Decimal('0.1')])
+        self.assertEqual(algo.filled, Decimal('0.4'))
+
+    def test_expired_remainder_is_carried_to_the_next_slice(self):
+        self.mock.exchange.fill_empty_book = False
+        maker = OrderManager(self.mock, client_ids=ClientOrderIds('maker'))
+        maker.place_limit_order('BTCUSDT', 'SELL', '0.15', '100')
+
+        def refill(progress):
+            # liquidity comes back after the second child expired half filled
+            if progress['children'] == 2 and not self.mock.exchange.open_orders('BTCUSDT'):
+                maker.place_limit_order('BTCUSDT', 'SELL', '1', '100')
+
+        algo = self.run_algo(TWAP(self.order_mgr, 'BTCUSDT', 'BUY', '0.4', duration=4, slices=4, step_size='0.05',
+                                  on_progress=refill))
+        self.assertEqual([c['order'].status for c in algo.children], ['FILLED', 'EXPIRED', 'FILLED', 'FILLED'])
+        self.assertEqual([c['quantity'] for c in algo.children],
+                         [Decimal('0.1'), Decimal('0.1'), Decimal('0.15'), Decimal('0.1')])
+        self.assertEqual(algo.filled, Decimal('0.4'))
+        self.assertEqual(algo.status, 'DONE')
+
+    def test_unfilled_last_slice_finishes_partial(self):
+        self.mock.exchange.fill_empty_book = False
+        OrderManager(self.mock, client_ids=ClientOrderIds('maker')).place_limit_order('BTCUSDT', 'SELL', '0.15',
+                                                                                    '100')
+        algo = self.run_algo(TWAP(self.order_mgr, 'BTCUSDT', 'BUY', '0.4', duration=4, slices=4, step_size='0.05'))
+        self.assertEqual(algo.status, 'PARTIAL')
+        self.assertEqual(algo.filled, Decimal('0.15'))
+        self.assertEqual(algo.children[-1]['quantity'], Decimal('0.25'))
+
+    def test_twap_stops_after_max_failures(self):
+        self.mock.inject_fault(api_error(-2019, 'Margin is insufficient.'), times=2)
+        algo = self.run_algo(TWAP(self.order_mgr, 'BTCUSDT', 'BUY', '0.4', duration=4, slices=4, step_size='0.1',
+                                  max_failures=2))
+        self.assertEqual(algo.status, 'FAILED')
+        self.assertEqual(algo.filled, 0)
+        self.assertEqual(len(algo.children), 2)
+
+    def test_iceberg_shows_one_clip_at_a_time(self):
+        algo = Iceberg(self.order_mgr, 'BTCUSDT', 'SELL', '1.0', price=101, display_qty='0.3', step_size='0.1',
+                       poll_interval=1.0)
+        taker = OrderManager(self.mock, client_ids=ClientOrderIds('taker'))
+        visible = []
+
+        def take():
+            visible.append(sum(float(o.remaining) for o in self.mock.exchange.open_orders('BTCUSDT')))
+            taker.place_market_order('BTCUSDT', 'BUY', '0.3')
+
+        for n in range(1, 5):
+            self.wheel.call_at(1000.0 + n * 5, take)
+        self.run_algo(algo)
+        self.assertEqual(algo.status, 'DONE')
+        self.assertEqual([c['quantity'] for c in algo.children],
+                         [Decimal('0.3'), Decimal('0.3'), Decimal('0.3'), Decimal('0.1')])
+        self.assertEqual(visible, [0.3, 0.3, 0.3, 0.1])
+        self.assertEqual(algo.filled, Decimal('1.0'))
+        self.assertEqual(algo.quote / algo.filled, Decimal('101'))
+
+    def test_cancel_pulls_the_resting_clip(self):
+        algo = Iceberg(self.order_mgr, 'BTCUSDT', 'BUY', '1.0', price=99, display_qty='0.5', step_size='0.1')
+        algo.start(self.wheel)
+        self.assertEqual(len(self.mock.exchange.open_orders('BTCUSDT')), 1)
+        algo.cancel()
+        self.assertEqual(algo.status, 'CANCELLED')
+        self.assertEqual(self.mock.exchange.open_orders('BTCUSDT'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import asyncio
+import unittest
+
+from binance.exceptions import BinanceAPIException
+
+from bot.async_client import AsyncBinanceClient, AsyncMockBinanceClient, AsyncOrderManager
+from bot.client import MockBinanceClient
+from bot.errors import api_error
+from bot.normalizer import OrderNormalizer
+from bot.orders import OrderManager
+from bot.rate_limit import RateLimitGovernor
+from bot.retry import ClientOrderIds
+
+
+class TrackingMock(AsyncMockBinanceClient):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def futures_create_order(self, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            return await super().futures_create_order(**kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+class AsyncOrderManagerTest(unittest.TestCase):
+    def test_concurrency_is_capped(self):
+        mock = TrackingMock(latency=0.005)
+        mgr = AsyncOrderManager(mock, max_in_flight=5)
+
+        async def run():
+            return await asyncio.gather(*(mgr.place_market_order('BTCUSDT', 'BUY', 0.001) for _ in range(20)))
+
+        orders = asyncio.run(run())
+        self.assertEqual(len(orders), 20)
+        self.assertEqual(mock.peak, 5)
+
+    def test_sends_the_same_params_as_sync(self):
+        sent = []
+
+        def orders_sent(mock):
+            fill = mock._fill
+            mock._fill = lambda kwargs: sent.append(kwargs) or fill(kwargs)
+            return mock
+
+        sync_mock = orders_sent(MockBinanceClient(num_symbols=3))
+        sync_mgr = OrderManager(sync_mock, normalizer=OrderNormalizer(sync_mock.get_symbol_rules),
+                                client_ids=ClientOrderIds('x'))
+        sync_order = sync_mgr.place_limit_order('C002USDT', 'SELL', 10.004, 3.0005)
+        async_mock = AsyncMockBinanceClient(num_symbols=3)
+        orders_sent(async_mock._mock)
+        async_mgr = AsyncOrderManager(async_mock, normalizer=OrderNormalizer(async_mock.exchange_info.lookup_rules),
+                                      client_ids=ClientOrderIds('x'))
+        async_order = asyncio.run(async_mgr.place_limit_order('C002USDT', 'SELL', 10.004, 3.0005))
+        self.assertEqual(sent[0], sent[1])
+        self.assertEqual((sent[1]['quantity'], sent[1]['price'], sent[1]['newClientOrderId']),
+                         ('10.00', '3.001', 'x-1'))
+        self.assertEqual(set(sync_order), set(async_order))
+        self.assertEqual(async_order['status'], 'NEW')
+
+        results = asyncio.run(async_mgr.place_orders([
+            {'symbol': 'C002USDT', 'side': 'BUY', 'type': 'LIMIT', 'quantity': 0.001, 'price': 3},
+            {'symbol': 'C002USDT', 'side': 'BUY', 'type': 'LIMIT', 'quantity': 2, 'price': 3}]))
+        self.assertIn('minQty', results[0]['error'])
+        self.assertEqual(results[1]['order'].client_order_id, 'x-2')
+
+    def test_mock_injects_faults_and_feeds_the_governor(self):
+        governor = RateLimitGovernor({('REQUEST_WEIGHT', '1m'): 2400, ('ORDERS', '10s'): 300})
+        mock = AsyncMockBinanceClient(governor=governor)
+        mock.inject_fault(api_error(-1001, 'Internal error; unable to process your request.'))
+        mgr = AsyncOrderManager(mock)
+        with self.assertRaises(BinanceAPIException):
+            asyncio.run(mgr.place_market_order('BTCUSDT', 'BUY', 0.001))
+        asyncio.run(mgr.place_market_order('BTCUSDT', 'BUY', 0.001))
+        self.assertEqual(governor.requests, 2)
+        self.assertEqual(mock.rate_limit_server.record(0, 0)[1]['X-MBX-ORDER-COUNT-10S'], '2')
+
+    def test_api_errors_are_reraised(self):
+        mgr = AsyncOrderManager(AsyncMockBinanceClient())
+        with self.assertRaises(BinanceAPIException):
+            asyncio.run(mgr.place_market_order('BTCUSDT', 'BUY', 0))
+
+    def test_place_orders(self):
+        specs = [{'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': q} for q in (0.1, 0, 0.2)] * 3
+        results = asyncio.run(AsyncOrderManager(AsyncMockBinanceClient()).place_orders(specs))
+        self.assertEqual([r['error'] is None for r in results], [True, False, True] * 3)
+
+
+
+class AsyncExchangeInfoTest(unittest.TestCase):
+    def test_concurrent_cold_lookups_download_once(self):
+        mock = AsyncMockBinanceClient(num_symbols=30, latency=0.005)
+        client = AsyncBinanceClient(mock)
+
+        async def run():
+            return await asyncio.gather(*(client.get_symbol_info(f"C{i:03d}USDT") for i in range(20)))
+
+        infos = asyncio.run(run())
+        self.assertEqual([i['symbol'] for i in infos], [f"C{i:03d}USDT" for i in range(20)])
+        stats = client.exchange_info.stats()
+        self.assertEqual(stats['refreshes'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 19)
+
+
+if __name__ == '__main__':
+    unittest.main()
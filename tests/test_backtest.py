@@ -0,0 +1,101 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from bot.backtest import (Backtest, BacktestClient, FeeModel, MovingAverageCross, SlippageModel, Strategy,
+                          moving_average, sweep)
+from bot.client import MockBinanceClient
+from bot.history import COLUMNS, KlineStore, Klines, rows_to_columns
+from bot.orders import OrderManager
+from bot.retry import ClientOrderIds
+
+START = 1577836800000
+
+
+def make_klines(opens, highs, lows, closes):
+    n = len(opens)
+    columns = {name: np.ones(n, dtype) for name, (dtype, _) in COLUMNS.items()}
+    columns.update(open_time=START + 60000 * np.arange(n), open=np.array(opens, float),
+                   high=np.array(highs, float), low=np.array(lows, float), close=np.array(closes, float))
+    return Klines(columns)
+
+
+class FixedTargets(Strategy):
+    def __init__(self, targets):
+        super().__init__()
+        self.targets = targets
+
+    def signals(self, klines):
+        return np.array(self.targets, float)
+
+
+class BacktestClientTest(unittest.TestCase):
+    def setUp(self):
+        self.klines = make_klines([100, 101, 102, 103, 104], [101, 103, 103, 104, 105],
+                                  [99, 100, 97, 102, 103], [101, 102, 103, 104, 105])
+
+    def test_market_order_fills_at_next_open_with_costs(self):
+        result = Backtest(self.klines, 'BTCUSDT', FeeModel(taker=0.001), SlippageModel(bps=10)).run(
+            FixedTargets([1, 1, 0, 0, 0]))
+        self.assertEqual(result.trades, 2)
+        # bought at 101 * 1.001, sold at 103 * 0.999
+        buy, sell = 101 * 1.001, 103 * 0.999
+        self.assertAlmostEqual(result.fees, (buy + sell) * 0.001)
+        self.assertAlmostEqual(result.pnl, sell - buy - result.fees)
+        np.testing.assert_array_equal(result.position, [0, 1, 1, 0, 0])
+
+    def test_limit_orders_rest_until_traded_through(self):
+        client = BacktestClient(self.klines, 'BTCUSDT', FeeModel(maker=0.0), SlippageModel(bps=0))
+        order_mgr = OrderManager(client, client_ids=ClientOrderIds('t'))
+        resting = order_mgr.place_limit_order('BTCUSDT', 'BUY', '1', '98')
+        self.assertEqual(resting.status, 'NEW')
+        crossing = order_mgr.place_limit_order('BTCUSDT', 'SELL', '1', '100')
+        self.assertEqual(crossing.status, 'FILLED')
+        self.assertEqual(crossing.avg_price_text, '101')
+        client.advance(1)
+        self.assertEqual(len(client.futures_get_open_orders()), 1)
+        client.advance(4)
+        filled = client.futures_get_order(orderId=resting.order_id)
+        self.assertEqual((filled['status'], filled['avgPrice']), ('FILLED', '98'))
+        self.assertEqual(client.position, 0)
+        self.assertEqual([f[0] for f in client.fills], [1, 2])
+
+
+class StrategyTest(unittest.TestCase):
+    def test_moving_average(self):
+        np.testing.assert_allclose(moving_average([1, 2, 3, 4, 5], 3), [np.nan, np.nan, 2, 3, 4])
+
+    def test_equity_matches_a_bar_by_bar_replay(self):
+        mock = MockBinanceClient()
+        rows = mock.futures_klines(symbol='BTCUSDT', interval='1m', startTime=START, limit=1500)
+        with tempfile.TemporaryDirectory() as root:
+            store = KlineStore(root)
+            store.write('BTCUSDT', '1m', rows_to_columns(rows))
+            klines = store.load('BTCUSDT', '1m')
+            strategy = MovingAverageCross(fast=5, slow=30)
+            result = Backtest(klines, 'BTCUSDT', FeeModel(taker=0.0005), SlippageModel(bps=2)).run(strategy)
+
+            targets = strategy.signals(klines)
+            cash, position, equity = 10000.0, 0.0, []
+            for bar in range(len(klines)):
+                if bar and targets[bar - 1] != position:
+                    delta = targets[bar - 1] - position
+                    price = klines.open[bar] * (1 + 0.0002 if delta > 0 else 1 - 0.0002)
+                    cash -= delta * price + abs(delta) * price * 0.0005
+                    position = targets[bar - 1]
+                equity.append(cash + position * klines.close[bar])
+            self.assertGreater(result.trades, 10)
+            np.testing.assert_allclose(result.equity, equity)
+
+            grid = {'fast': [5, 10], 'slow': [30]}
+            options = {'fees': FeeModel(taker=0.0005), 'slippage': SlippageModel(bps=2)}
+            local = sweep(MovingAverageCross, grid, root, 'BTCUSDT', '1m', max_workers=1, **options)
+            pooled = sweep(MovingAverageCross, grid, root, 'BTCUSDT', '1m', max_workers=2, **options)
+        self.assertEqual(local, pooled)
+        self.assertEqual([r['params']['fast'] for r in local], [5, 10])
+        self.assertAlmostEqual(local[0]['pnl'], result.pnl)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from bot.client import MockBinanceClient
+from bot.orders import OrderManager
+
+
+class CountingMock(MockBinanceClient):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def futures_place_batch_order(self, **params):
+        self.batches.append(len(params['batchOrders']))
+        return super().futures_place_batch_order(**params)
+
+
+class ShortResponseMock(MockBinanceClient):
+    """Drops the last entry of every batch response"""
+
+    def futures_place_batch_order(self, **params):
+        return super().futures_place_batch_order(**params)[:-1]
+
+
+class PlaceOrdersTest(unittest.TestCase):
+    def test_groups_into_batches_of_five(self):
+        mock = CountingMock()
+        specs = [{'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT', 'quantity': 0.001, 'price': 90000 + i}
+                 for i in range(12)]
+        results = OrderManager(mock).place_orders(specs)
+
+        self.assertEqual(sorted(mock.batches), [2, 5, 5])
+        self.assertEqual(len(results), 12)
+        self.assertTrue(all(r['error'] is None for r in results))
+        self.assertEqual([r['order']['price'] for r in results], [str(90000 + i) for i in range(12)])
+
+    def test_failure_is_isolated_to_one_order(self):
+        specs = [
+            {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': 0.001},
+            {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': 0},
+            {'symbol': 'ETHUSDT', 'side': 'SELL', 'type': 'LIMIT', 'quantity': 0.00001, 'price': 3000.5},
+        ]
+        results = OrderManager(MockBinanceClient()).place_orders(specs)
+
+        self.assertIsNone(results[0]['error'])
+        self.assertIn('Quantity', results[1]['error'])
+        self.assertIsNone(results[1]['order'])
+        self.assertEqual(results[2]['order']['origQty'], '0.00001')
+
+    def test_missing_response_entries_become_errors(self):
+        specs = [{'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': 0.001}] * 7
+        results = OrderManager(ShortResponseMock()).place_orders(specs)
+
+        self.assertEqual([r['error'] for r in results],
+                         [None] * 4 + ['no response for order'] + [None] + ['no response for order'])
+
+    def test_cli_batch_file_dry_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'orders.csv')
+            with open(path, 'w') as f:
+                f.write("symbol,side,type,quantity,price\n")
+                f.write("btcusdt,buy,market,0.001,\n")
+                f.write("ETHUSDT,SELL,LIMIT,0.01,3000\n")
+
+            import cli
+            old_argv = sys.argv
+            sys.argv = ['cli.py', '--batch', path, '--dry-run']
+            out = io.StringIO()
+            try:
+                # keep the test from writing log files into the repo
+                with redirect_stdout(out), mock.patch.object(cli, 'setup_logging'):
+                    cli.main()
+            finally:
+                sys.argv = old_argv
+
+        self.assertIn('Batch complete: 2 placed, 0 failed', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+from bot.client import MockBinanceClient
+from bot.errors import api_error
+from bot.journal import OrderJournal
+from bot.orders import OrderManager, diff_orders
+from bot.retry import ClientOrderIds
+from bot.risk import RiskEngine
+
+
+class CancelTest(unittest.TestCase):
+    def setUp(self):
+        self.mock = MockBinanceClient()
+        self.risk = RiskEngine()
+        self.order_mgr = OrderManager(self.mock, risk=self.risk)
+
+    def rest(self, symbol, count, side='BUY'):
+        price = '90' if side == 'BUY' else '110'
+        return [self.order_mgr.place_limit_order(symbol, side, '0.1', price) for _ in range(count)]
+
+    def test_cancel_all_across_symbols(self):
+        self.rest('BTCUSDT', 3)
+        self.rest('ETHUSDT', 2, 'SELL')
+        kept = self.rest('BNBUSDT', 1)
+        results = self.order_mgr.cancel_all(['BTCUSDT', 'ETHUSDT'], max_workers=2)
+        self.assertEqual(results, {'BTCUSDT': None, 'ETHUSDT': None})
+        self.assertEqual([o.order_id for o in self.mock.exchange.open_orders()], [kept[0].order_id])
+        self.assertEqual(self.risk.exposure('BTCUSDT')['open_buy'], 0.0)
+        self.assertEqual(self.risk.exposure('ETHUSDT')['open_sell'], 0.0)
+
+    def test_batch_cancel_by_id_reports_each_order(self):
+        orders = self.rest('BTCUSDT', 12)
+        eth = self.rest('ETHUSDT', 1)
+        ids = [o.order_id for o in orders] + [999999]
+        results = self.order_mgr.cancel_orders({'BTCUSDT': ids, 'ETHUSDT': [eth[0].client_order_id]})
+        self.assertEqual([r['id'] for r in results['BTCUSDT']], ids)
+        self.assertEqual([r['order'].status for r in results['BTCUSDT'][:12]], ['CANCELED'] * 12)
+        self.assertEqual(results['BTCUSDT'][12]['error'], 'Unknown order sent.')
+        self.assertEqual(results['ETHUSDT'][0]['order'].status, 'CANCELED')
+        self.assertEqual(self.mock.exchange.open_orders(), [])
+        self.assertAlmostEqual(self.risk.exposure('BTCUSDT')['open_buy'], 0.0)
+
+    def test_id_lists_are_compact_json(self):
+        sent = []
+        cancel = self.mock.futures_cancel_orders
+        self.mock.futures_cancel_orders = lambda **params: sent.append(params) or cancel(**params)
+        orders = self.rest('BTCUSDT', 2)
+        self.order_mgr.cancel_orders({'BTCUSDT': [orders[0].order_id, orders[1].client_order_id, '123']})
+        self.assertEqual(sent[0]['orderIdList'], f'[{orders[0].order_id}]')
+        self.assertEqual(sent[1]['origClientOrderIdList'], f'["{orders[1].client_order_id}","123"]')
+
+    def test_cancel_replace_keeps_the_unfilled_quantity(self):
+        order = self.order_mgr.place_limit_order('BTCUSDT', 'SELL', '1.0', '105')
+        self.order_mgr.place_market_order('BTCUSDT', 'BUY', '0.4')
+        result = self.order_mgr.cancel_replace('BTCUSDT', order.order_id, price='106')
+        self.assertEqual(result['cancelled'].status, 'CANCELED')
+        self.assertEqual((result['order'].orig_qty, result['order'].price), (Decimal('0.6'), Decimal('106')))
+        self.assertEqual([o.order_id for o in self.mock.exchange.open_orders()], [result['order'].order_id])
+
+    def test_failed_cancel_places_nothing(self):
+        order = self.order_mgr.place_limit_order('BTCUSDT', 'SELL', '1.0', '105')
+        self.order_mgr.place_market_order('BTCUSDT', 'BUY', '1.0')
+        with self.assertRaises(Exception):
+            self.order_mgr.cancel_replace('BTCUSDT', order.order_id, price='106')
+        self.assertEqual(self.mock.exchange.open_orders(), [])
+
+
+class ReconcileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal = OrderJournal(os.path.join(self.tmp.name, 'orders.db'))
+        self.mock = MockBinanceClient()
+        self.order_mgr = OrderManager(self.mock, journal=self.journal)
+        # another bot on the same account, invisible to the journal
+        self.other = OrderManager(self.mock, client_ids=ClientOrderIds('other'))
+
+    def tearDown(self):
+        self.journal.close()
+        self.tmp.cleanup()
+
+    def test_diff_and_repair(self):
+        matched = self.order_mgr.place_limit_order('BTCUSDT', 'BUY', '0.1', '90')
+        # filled on the exchange without the journal hearing about it
+        filled = self.order_mgr.place_limit_order('BTCUSDT', 'SELL', '0.1', '110')
+        self.other.place_market_order('BTCUSDT', 'BUY', '0.1')
+        # placed by someone else
+        unknown = self.other.place_limit_order('ETHUSDT', 'BUY', '1', '90')
+
+        diffs = self.order_mgr.reconcile()
+        self.assertEqual(set(diffs), {'BTCUSDT', 'ETHUSDT'})
+        self.assertEqual(diffs['BTCUSDT']['matched'], 1)
+        self.assertEqual([o.order_id for o in diffs['BTCUSDT']['missing']], [filled.order_id])
+        self.assertEqual([o.order_id for o in diffs['ETHUSDT']['unknown']], [unknown.order_id])
+
+        self.order_mgr.reconcile(['BTCUSDT', 'ETHUSDT'], repair=True, max_workers=2)
+        self.assertEqual(self.journal.get(filled.order_id).status, 'FILLED')
+        self.assertEqual(sorted(o.order_id for o in self.journal.open_orders()),
+                         sorted([matched.order_id, unknown.order_id]))
+        diffs = self.order_mgr.reconcile(['BTCUSDT', 'ETHUSDT'])
+        self.assertTrue(all(not d['unknown'] and not d['missing'] and not d['mismatched'] for d in diffs.values()))
+
+    def test_partial_fill_is_a_mismatch(self):
+        order = self.order_mgr.place_limit_order('BTCUSDT', 'SELL', '1', '110')
+        self.other.place_market_order('BTCUSDT', 'BUY', '0.3')
+        diff = self.order_mgr.reconcile('BTCUSDT')['BTCUSDT']
+        self.assertEqual(len(diff['mismatched']), 1)
+        self.assertEqual(diff['mismatched'][0]['exchange'].status, 'PARTIALLY_FILLED')
+        self.assertEqual(diff['mismatched'][0]['local'].status, 'NEW')
+        self.order_mgr.reconcile('BTCUSDT', repair=True)
+        self.assertEqual(self.journal.get(order.order_id).status, 'PARTIALLY_FILLED')
+        self.assertEqual(diff_orders(self.journal.open_orders('BTCUSDT'),
+                                     self.order_mgr.open_orders('BTCUSDT')['BTCUSDT'])['matched'], 1)
+
+    def test_cancel_failure_is_reported_per_symbol(self):
+        self.mock.inject_fault(api_error(-1003, 'Too many requests.'), endpoint='futures_cancel_all_open_orders')
+        results = self.order_mgr.cancel_all(['BTCUSDT', 'ETHUSDT'])
+        self.assertEqual(sorted(r is None for r in results.values()), [False, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from bot.client import MockBinanceClient
+from bot.daemon import DaemonClient, OrderDaemon, is_running
+from bot.orders import OrderManager
+
+
+class OrderDaemonTest(unittest.TestCase):
+    def setUp(self):
+        self.daemon = OrderDaemon(OrderManager(MockBinanceClient()))
+
+    def test_handle_orders(self):
+        reply = self.daemon.handle({'symbol': 'btcusdt', 'side': 'buy', 'type': 'market', 'quantity': 0.001})
+        self.assertTrue(reply['ok'])
+        self.assertEqual(reply['order']['symbol'], 'BTCUSDT')
+
+        reply = self.daemon.handle({'symbol': 'ETHUSDT', 'side': 'SELL', 'type': 'LIMIT', 'quantity': 0.01})
+        self.assertFalse(reply['ok'])
+        self.assertIn('Price is required', reply['error'])
+
+        reply = self.daemon.handle({'orders': [
+            {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': 1},
+            {'symbol': 'BTCUSDT', 'side': 'SELL', 'type': 'LIMIT', 'quantity': 1, 'price': 100},
+        ]})
+        self.assertEqual([r['error'] for r in reply['results']], [None, None])
+
+    def test_stdio(self):
+        stdin = io.StringIO('{"op": "ping"}\nnot json\n{"symbol": "BTCUSDT", "side": "BUY", '
+                            '"type": "MARKET", "quantity": 1}\n')
+        stdout = io.StringIO()
+        self.daemon.serve_stdio(stdin, stdout)
+        replies = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([r['ok'] for r in replies], [True, False, True])
+
+    def test_unix_socket_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bot.sock')
+            ready = threading.Event()
+            thread = threading.Thread(target=self.daemon.serve_unix, args=(path, ready), daemon=True)
+            thread.start()
+            ready.wait(5)
+            try:
+                self.assertTrue(is_running(path))
+                with DaemonClient(path) as client:
+                    for _ in range(3):
+                        reply = client.submit('BTCUSDT', 'BUY', 'MARKET', 0.001)
+                        self.assertTrue(reply['ok'])
+            finally:
+                self.daemon.shutdown()
+                thread.join(5)
+            self.assertFalse(os.path.exists(path))
+            self.assertEqual(self.daemon.handled, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from bot.client import MockBinanceClient
+from bot.engine import ExecutionEngine
+from bot.errors import api_error
+from bot.orders import OrderManager
+
+
+def intent(account, symbol, side='BUY', price=30000, quantity=0.01):
+    return {'account': account, 'symbol': symbol, 'side': side, 'type': 'LIMIT',
+            'quantity': quantity, 'price': price}
+
+
+class ExecutionEngineTest(unittest.TestCase):
+    def test_lanes_keep_per_symbol_order_and_run_in_parallel(self):
+        clients = {name: MockBinanceClient(latency=0.02) for name in ('a', 'b')}
+        engine = ExecutionEngine({name: OrderManager(c) for name, c in clients.items()}, max_workers=8)
+        intents = [intent(account, symbol, price=30000 + n)
+                   for n in range(3) for account in ('a', 'b') for symbol in ('BTCUSDT', 'ETHUSDT')]
+        start = time.perf_counter()
+        report = engine.run(intents)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(report['placed'], 12)
+        # 4 lanes of 3 orders at 20ms each: about 60ms in parallel, 240ms serially
+        self.assertLess(elapsed, 0.2)
+        self.assertGreater(report['orders_per_second'], 0)
+        for account, client in clients.items():
+            for symbol in ('BTCUSDT', 'ETHUSDT'):
+                prices = [o.price for o in sorted(client.exchange.orders.values(), key=lambda o: o.order_id)
+                          if o.symbol == symbol]
+                self.assertEqual(prices, [30000.0, 30001.0, 30002.0])
+        self.assertEqual([r['intent'] for r in report['results']], intents)
+
+    def test_failures_stay_in_their_account(self):
+        broken = MockBinanceClient()
+        broken.inject_fault(api_error(-2015, 'Invalid API-key, IP, or permissions for action.', status=401),
+                            times=10)
+        engine = ExecutionEngine({'ok': OrderManager(MockBinanceClient()), 'broken': OrderManager(broken)},
+                                 halt_after=2)
+        intents = [intent(account, 'BTCUSDT', price=30000 + n) for n in range(4) for account in ('ok', 'broken')]
+        intents.append(intent('missing', 'BTCUSDT'))
+        report = engine.run(intents)
+
+        self.assertEqual(report['accounts']['ok'], {'placed': 4, 'failed': 0, 'halted': False})
+        self.assertEqual(report['accounts']['broken'], {'placed': 0, 'failed': 4, 'halted': True})
+        errors = [r['error'] for r in report['results'] if r['intent']['account'] == 'broken']
+        self.assertIn('Invalid API-key', errors[0])
+        self.assertEqual(errors[2:], ['account broken halted'] * 2)
+        # only two requests reached the broken account before it was halted
+        self.assertEqual(len(broken.faults), 8)
+        self.assertEqual(report['results'][-1]['error'], 'unknown account missing')
+
+    def test_cli_portfolio_dry_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'portfolio.csv')
+            with open(path, 'w') as f:
+                f.write("account,symbol,side,type,quantity,price\n")
+                f.write("sub1,btcusdt,buy,market,0.001,\n")
+                f.write("sub2,ETHUSDT,SELL,LIMIT,0.01,3000\n")
+                f.write("sub2,ETHUSDT,SELL,LIMIT,0.01,3001\n")
+
+            import cli
+            out = io.StringIO()
+            with redirect_stdout(out), mock.patch.object(cli, 'setup_logging'):
+                cli.main(['portfolio', path, '--dry-run'])
+
+        self.assertIn('Portfolio complete: 3 placed, 0 failed', out.getvalue())
+        self.assertIn('sub2                      2 placed', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+from bot.client import MockBinanceClient
+from bot.exchange_info import ExchangeInfoCache
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class ExchangeInfoCacheTest(unittest.TestCase):
+    def test_lookups_are_served_from_memory(self):
+        mock = MockBinanceClient(num_symbols=300)
+        self.assertEqual(mock.get_symbol_info('C000USDT')['symbol'], 'C000USDT')
+        self.assertIsNone(mock.get_symbol_info('NOPEUSDT'))
+        for _ in range(10):
+            mock.get_symbol_info('C299USDT')
+
+        self.assertEqual(mock.exchange_info_calls, 1)
+        stats = mock.exchange_info.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 11)
+        self.assertEqual(stats['symbols'], 300)
+
+    def test_rules_are_parsed(self):
+        mock = MockBinanceClient(num_symbols=3)
+        rules = mock.get_symbol_rules('C002USDT')
+        self.assertEqual(rules['tickSize'], '0.001')
+        self.assertEqual(rules['stepSize'], '0.01')
+        self.assertEqual(rules['minQty'], '0.01')
+        self.assertEqual(rules['minNotional'], '5')
+
+    def test_refreshes_after_ttl(self):
+        mock = MockBinanceClient(num_symbols=5)
+        clock = FakeClock()
+        cache = ExchangeInfoCache(mock.futures_exchange_info, ttl=60, clock=clock)
+        cache.get('C001USDT')
+        clock.now += 59
+        cache.get('C001USDT')
+        self.assertEqual(mock.exchange_info_calls, 1)
+        clock.now += 1
+        cache.get('C001USDT')
+        self.assertEqual(mock.exchange_info_calls, 2)
+
+    def test_failed_refresh_keeps_serving_old_index(self):
+        mock = MockBinanceClient(num_symbols=5)
+        clock = FakeClock()
+        calls = []
+
+        def flaky_fetch():
+            calls.append(clock.now)
+            if len(calls) > 1:
+                raise ConnectionError('network down')
+            return mock.futures_exchange_info()
+
+        cache = ExchangeInfoCache(flaky_fetch, ttl=60, clock=clock, retry_interval=10)
+        cache.get('C001USDT')
+        clock.now += 60
+        self.assertEqual(cache.get('C001USDT')['symbol'], 'C001USDT')
+        self.assertEqual(cache.get_rules('C002USDT')['minNotional'], '5')
+        # no new attempt until the retry interval has passed
+        self.assertEqual(len(calls), 2)
+        clock.now += 10
+        cache.get('C001USDT')
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(cache.stats()['refresh_failures'], 2)
+
+    def test_failed_first_fetch_is_raised(self):
+        def broken_fetch():
+            raise ConnectionError('network down')
+
+        with self.assertRaises(ConnectionError):
+            ExchangeInfoCache(broken_fetch).get('BTCUSDT')
+
+    def test_warm_start_from_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'exchange_info.json')
+            first = MockBinanceClient(num_symbols=5, exchange_info_path=path)
+            first.get_symbol_info('C001USDT')
+            self.assertTrue(os.path.exists(path))
+
+            second = MockBinanceClient(num_symbols=5, exchange_info_path=path)
+            self.assertEqual(second.get_symbol_info('C004USDT')['symbol'], 'C004USDT')
+            self.assertEqual(second.exchange_info_calls, 0)
+            self.assertEqual(second.exchange_info.disk_loads, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from bot.client import MockBinanceClient
+from bot.history import KlineStore, _header, interval_ms
+
+START = 1577836800000
+MINUTE = 60000
+
+
+class KlineStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.mock = MockBinanceClient()
+        # "now" is one day after the mock's listing time
+        self.store = KlineStore(self.tmp.name, client=self.mock, page_limit=500,
+                                clock=lambda: (START + 1440 * MINUTE) / 1000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_download_is_paged_and_incremental(self):
+        added = self.store.update('BTCUSDT', '1m', START)
+        self.assertEqual(added, 1440)
+        self.assertEqual(self.mock.kline_requests, 3)
+        klines = self.store.load('BTCUSDT', '1m')
+        self.assertTrue((np.diff(klines.open_time) == MINUTE).all())
+        # nothing missing: no requests at all
+        self.assertEqual(self.store.update('BTCUSDT', '1m', START), 0)
+        self.assertEqual(self.mock.kline_requests, 3)
+
+    def test_only_gaps_are_fetched(self):
+        self.store.update('BTCUSDT', '1m', START, START + 100 * MINUTE)
+        self.store.update('BTCUSDT', '1m', START + 300 * MINUTE, START + 400 * MINUTE)
+        self.assertEqual(self.store.gaps('BTCUSDT', '1m', START, START + 400 * MINUTE),
+                         [(START + 100 * MINUTE, START + 300 * MINUTE)])
+        before = self.mock.kline_requests
+        self.assertEqual(self.store.update('BTCUSDT', '1m', START, START + 400 * MINUTE), 200)
+        self.assertEqual(self.mock.kline_requests, before + 1)
+        klines = self.store.load('BTCUSDT', '1m')
+        self.assertEqual(len(klines), 400)
+        self.assertTrue((np.diff(klines.open_time) == MINUTE).all())
+
+    def test_prepend_matches_a_single_download(self):
+        self.store.update('ETHUSDT', '5m', START + 50 * 5 * MINUTE, START + 100 * 5 * MINUTE)
+        self.store.update('ETHUSDT', '5m', START, START + 100 * 5 * MINUTE)
+        fresh = KlineStore(os.path.join(self.tmp.name, 'fresh'), client=self.mock)
+        fresh.update('ETHUSDT', '5m', START, START + 100 * 5 * MINUTE)
+        a, b = self.store.load('ETHUSDT', '5m'), fresh.load('ETHUSDT', '5m')
+        for name, column in a.columns().items():
+            np.testing.assert_array_equal(column, getattr(b, name))
+
+    def test_time_without_klines_is_fetched_once(self):
+        # asks for 30 days before the mock's listing
+        early = START - 30 * 1440 * MINUTE
+        self.assertEqual(self.store.update('BTCUSDT', '1m', early), 1440)
+        first = self.mock.kline_requests
+        self.assertEqual(self.store.meta('BTCUSDT', '1m')['listed'], START)
+        self.assertEqual(self.store.gaps('BTCUSDT', '1m', early - 1440 * MINUTE, START + 1440 * MINUTE), [])
+        for _ in range(2):
+            self.assertEqual(self.store.update('BTCUSDT', '1m', early), 0)
+        self.assertEqual(self.store.update('BTCUSDT', '1m', early - 60 * 1440 * MINUTE), 0)
+        self.assertEqual(self.mock.kline_requests, first)
+
+    def test_halts_are_remembered(self):
+        fetch = self.mock.futures_klines
+        halt = (START + 100 * MINUTE, START + 200 * MINUTE)
+
+        def halted(**params):
+            return [row for row in fetch(**params) if not halt[0] <= row[0] < halt[1]]
+
+        store = KlineStore(os.path.join(self.tmp.name, 'halted'), fetch=halted, page_limit=500,
+                           clock=lambda: (START + 1440 * MINUTE) / 1000)
+        self.assertEqual(store.update('BTCUSDT', '1m', START), 1340)
+        self.assertIn(halt, store.meta('BTCUSDT', '1m')['empty'])
+        self.assertEqual(store.gaps('BTCUSDT', '1m', START, START + 1440 * MINUTE), [])
+        requests = store.requests
+        self.assertEqual(store.update('BTCUSDT', '1m', START), 0)
+        self.assertEqual(store.requests, requests)
+
+    def test_range_is_a_view(self):
+        self.store.update('BTCUSDT', '1h', START)
+        hours = self.store.range('BTCUSDT', '1h', START + interval_ms('4h'), START + interval_ms('8h'))
+        self.assertEqual(len(hours), 4)
+        self.assertEqual(int(hours.open_time[0]), START + interval_ms('4h'))
+        # a slice of the memory-mapped file, not a copy
+        self.assertIsInstance(hours.close, np.memmap)
+        self.assertFalse(hours.close.flags.owndata)
+        self.assertFalse(hours.close.flags.writeable)
+
+    def test_torn_append_is_ignored(self):
+        self.store.update('BTCUSDT', '1m', START, START + 10 * MINUTE)
+        # a crash after the first column grew but before the others did
+        path = os.path.join(self.tmp.name, 'BTCUSDT', '1m', 'open_time.npy')
+        with open(path, 'r+b') as f:
+            f.seek(0, os.SEEK_END)
+            f.write(np.int64(START + 10 * MINUTE).tobytes())
+            f.seek(0)
+            f.write(_header('<i8', 11))
+        self.assertEqual(len(self.store.load('BTCUSDT', '1m')), 10)
+        self.assertEqual(self.store.update('BTCUSDT', '1m', START, START + 20 * MINUTE), 10)
+        self.assertTrue((np.diff(self.store.load('BTCUSDT', '1m').open_time) == MINUTE).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
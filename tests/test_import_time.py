@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# generous so slow CI machines pass; loading python-binance alone is several times this
+IMPORT_BUDGET_US = 150000
+
+
+def import_times(code):
+    """Run code in a fresh interpreter under -X importtime; returns {module: cumulative us}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class ImportTimeTest(unittest.TestCase):
+    def assert_light(self, times, *modules):
+        loaded = [name for name in times if name == 'binance' or name.startswith(('binance.', 'requests', 'aiohttp'))]
+        self.assertEqual(loaded, [])
+        total = sum(times.get(name, 0) for name in modules)
+        self.assertLess(total, IMPORT_BUDGET_US)
+
+    def test_validators_do_not_load_binance(self):
+        times = import_times('from bot.validators import validate_symbol')
+        self.assert_light(times, 'bot')
+
+    def test_package_import_is_lazy(self):
+        times = import_times('import bot; bot.validate_side; bot.OrderManager; bot.MockBinanceClient')
+        self.assert_light(times, 'bot')
+
+    def test_dry_run_does_not_load_binance(self):
+        code = ('import cli, logging; logging.disable(logging.CRITICAL); '
+                'cli.setup_logging = lambda: None; '
+                "cli.main(['--symbol', 'BTCUSDT', '--side', 'BUY', '--type', 'MARKET', "
+                "'--quantity', '0.001', '--dry-run'])")
+        times = import_times(code)
+        self.assert_light(times, 'cli', 'bot.client', 'bot.orders')
+
+    def test_real_client_still_loads_binance(self):
+        times = import_times('import bot.pooled_client')
+        self.assertIn('binance.client', times)
+
+
+if __name__ == '__main__':
+    unittest.main()
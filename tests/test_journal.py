@@ -0,0 +1,123 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from bot.client import MockBinanceClient
+from bot.journal import OrderJournal
+from bot.orders import OrderManager
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+class OrderJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'orders.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_order_manager_journals_and_replays(self):
+        journal = OrderJournal(self.path, flush_interval=0)
+        order_mgr = OrderManager(MockBinanceClient(), journal=journal)
+        resting = order_mgr.place_limit_order('BTCUSDT', 'BUY', 0.01, 30000)
+        filled = order_mgr.place_market_order('BTCUSDT', 'SELL', 0.004)
+        order_mgr.place_orders([{'symbol': 'ETHUSDT', 'side': 'SELL', 'type': 'LIMIT',
+                                 'quantity': 0.1, 'price': 3000}])
+        journal.close()
+
+        journal = OrderJournal(self.path, flush_interval=0)
+        self.assertEqual(journal.replay(), 3)
+        self.assertEqual(journal.get(filled['orderId'])['status'], 'FILLED')
+        self.assertEqual(journal.get(client_order_id=resting['clientOrderId'])['orderId'], resting['orderId'])
+        self.assertEqual([o['symbol'] for o in journal.open_orders()], ['BTCUSDT', 'ETHUSDT'])
+        kinds = [row['kind'] for row in journal.history(resting['orderId'])]
+        self.assertEqual(kinds, ['submit', 'response'])
+
+        # a later fill/cancel wins over the original response
+        journal.record_update(dict(resting, status='CANCELED'))
+        journal.close()
+        journal = OrderJournal(self.path, flush_interval=0)
+        journal.replay()
+        self.assertEqual(journal.get(resting['orderId'])['status'], 'CANCELED')
+        journal.close()
+
+    def test_failed_submission_is_journaled(self):
+        journal = OrderJournal(self.path, flush_interval=0)
+        order_mgr = OrderManager(MockBinanceClient(), journal=journal)
+        with self.assertRaises(Exception):
+            order_mgr.place_limit_order('BTCUSDT', 'BUY', -1, 30000)
+        journal.flush()
+        kinds = [row[0] for row in journal._conn.execute("SELECT kind FROM events ORDER BY seq")]
+        self.assertEqual(kinds, ['submit', 'error'])
+        journal.close()
+
+    def test_in_flight_submissions_are_settled_after_a_crash(self):
+        mock = MockBinanceClient()
+        journal = OrderJournal(self.path, flush_interval=0)
+        order_mgr = OrderManager(mock, journal=journal)
+        order_mgr.place_market_order('BTCUSDT', 'BUY', 0.01)
+        # the process died after sending one order and before sending another
+        sent = {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT', 'quantity': '0.01', 'price': '30000',
+                'timeInForce': 'GTC', 'newClientOrderId': 'crash-1'}
+        journal.record_submission(sent)
+        mock.futures_create_order(**sent)
+        journal.record_submission(dict(sent, newClientOrderId='crash-2'))
+        journal.close()
+
+        journal = OrderJournal(self.path, flush_interval=0)
+        self.assertEqual(journal.replay(), 1)
+        self.assertEqual(sorted(journal.unresolved()), ['crash-1', 'crash-2'])
+        self.assertEqual(journal.unresolved()['crash-1']['params']['price'], '30000')
+        settled = OrderManager(mock, journal=journal).settle_unresolved()
+        self.assertEqual(settled['crash-1'].status, 'NEW')
+        self.assertIsNone(settled['crash-2'])
+        self.assertEqual(journal.unresolved(), {})
+        journal.close()
+
+        journal = OrderJournal(self.path, flush_interval=0)
+        self.assertEqual(journal.replay(), 2)
+        self.assertEqual(journal.unresolved(), {})
+        self.assertEqual([o.client_order_id for o in journal.open_orders()], ['crash-1'])
+        journal.close()
+
+    def test_failed_commit_keeps_the_batch(self):
+        journal = OrderJournal(self.path, batch_size=1000, flush_interval=0)
+        for i in range(3):
+            journal.record_response(None, {'orderId': i, 'symbol': 'BTCUSDT', 'status': 'NEW'})
+        # another writer took the seq of the second pending row
+        journal._conn.execute("INSERT INTO events (seq, ts, kind) VALUES (2, 0, 'other')")
+        with self.assertRaises(sqlite3.IntegrityError):
+            journal.flush()
+        self.assertEqual(journal._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0], 1)
+        journal._conn.execute("DELETE FROM events WHERE seq = 2")
+        journal.flush()
+        self.assertEqual(journal.replay(), 3)
+        journal.close()
+
+    def test_committed_batches_survive_a_crash(self):
+        # the child commits 300 rows (one full batch of 256 + an explicit flush at 300),
+        # appends 10 more and dies without closing
+        script = (
+            "import os, sys\n"
+            "from bot.journal import OrderJournal\n"
+            "j = OrderJournal(sys.argv[1], batch_size=256, flush_interval=0)\n"
+            "for i in range(310):\n"
+            "    j.record_response(None, {'orderId': i, 'symbol': 'BTCUSDT', 'status': 'NEW'})\n"
+            "    if i == 299:\n"
+            "        j.flush()\n"
+            "os._exit(0)\n"
+        )
+        subprocess.run([sys.executable, '-c', script, self.path], cwd=ROOT, check=True)
+        journal = OrderJournal(self.path, flush_interval=0)
+        self.assertEqual(journal.replay(), 300)
+        # sequence numbers carry on after the last committed row
+        self.assertEqual(journal.record_update({'orderId': 1, 'status': 'FILLED'}), 301)
+        journal.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
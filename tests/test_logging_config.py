@@ -0,0 +1,56 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from bot.logging_config import JsonLinesFormatter, attach_handlers, make_file_handler
+
+
+class QueuedLoggingTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.logger = logging.getLogger('test_logging_config')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.addCleanup(self.logger.handlers.clear)
+
+    def test_queued_json_lines_are_written_by_listener(self):
+        path = os.path.join(self.dir, 'bot.jsonl')
+        handler = make_file_handler(path)
+        handler.setFormatter(JsonLinesFormatter())
+        listener = attach_handlers(self.logger, [handler], queued=True)
+
+        self.logger.info("Placing %s order: %s %s", 'MARKET', 'BUY', 0.001)
+        self.logger.info("with data", extra={'data': {'orderId': 7}})
+        listener.stop()
+        handler.close()
+
+        with open(path) as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual(entries[0]['msg'], 'Placing MARKET order: BUY 0.001')
+        self.assertEqual(entries[0]['level'], 'INFO')
+        self.assertEqual(entries[1]['data'], {'orderId': 7})
+
+    def test_size_rotation(self):
+        path = os.path.join(self.dir, 'bot.log')
+        handler = make_file_handler(path, max_bytes=200, backup_count=2)
+        attach_handlers(self.logger, [handler])
+        for n in range(50):
+            self.logger.info("message number %d", n)
+        handler.close()
+
+        self.assertTrue(os.path.exists(path + '.1'))
+        self.assertTrue(os.path.exists(path + '.2'))
+        self.assertFalse(os.path.exists(path + '.3'))
+
+    def test_time_rotation_handler(self):
+        handler = make_file_handler(os.path.join(self.dir, 'bot.log'), when='midnight')
+        self.assertIsInstance(handler, logging.handlers.TimedRotatingFileHandler)
+        handler.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import json
+import os
+import tempfile
+import unittest
+
+from bot.client import MockBinanceClient
+from bot.market_data import MarketData, OrderBook
+from bot.orders import OrderManager
+
+
+def snapshot(last_id, bids, asks, symbol='BTCUSDT'):
+    return {'e': 'snapshot', 's': symbol, 'lastUpdateId': last_id,
+            'bids': [[str(p), str(q)] for p, q in bids],
+            'asks': [[str(p), str(q)] for p, q in asks]}
+
+
+def depth(first, last, prev, bids=(), asks=(), symbol='BTCUSDT'):
+    return {'stream': f'{symbol.lower()}@depth@100ms',
+            'data': {'e': 'depthUpdate', 's': symbol, 'U': first, 'u': last, 'pu': prev,
+                     'b': [[str(p), str(q)] for p, q in bids],
+                     'a': [[str(p), str(q)] for p, q in asks]}}
+
+
+def ticker(update_id, bid, ask, symbol='BTCUSDT'):
+    return {'e': 'bookTicker', 's': symbol, 'u': update_id,
+            'b': str(bid), 'B': '1', 'a': str(ask), 'A': '2'}
+
+
+class OrderBookTest(unittest.TestCase):
+    def setUp(self):
+        self.book = OrderBook('BTCUSDT')
+        self.book.load_snapshot(snapshot(100, [(99, 1), (98, 2), (97, 3)], [(101, 1), (102, 2), (103, 3)]))
+
+    def test_best_levels_and_depth(self):
+        self.assertEqual(self.book.best_bid(), (99.0, 1.0))
+        self.assertEqual(self.book.best_ask(), (101.0, 1.0))
+        self.assertEqual(self.book.levels('BUY', 2), [(99.0, 1.0), (98.0, 2.0)])
+        self.assertEqual(self.book.count_levels_through('SELL', 102), 2)
+        self.assertEqual(self.book.depth_through('BUY', 98), 3.0)
+        # 1 @ 101 + 1 @ 102
+        self.assertAlmostEqual(self.book.fill_price(2, 'BUY'), 101.5)
+        self.assertIsNone(self.book.fill_price(100, 'SELL'))
+
+    def test_diffs_update_and_remove_levels(self):
+        self.assertTrue(self.book.apply(depth(95, 105, 90, bids=[(99, 0), (99.5, 4)], asks=[(101, 0)])['data']))
+        self.assertEqual(self.book.best_bid(), (99.5, 4.0))
+        self.assertEqual(self.book.best_ask(), (102.0, 2.0))
+        self.assertTrue(self.book.apply(depth(106, 110, 105, asks=[(100.5, 1)])['data']))
+        self.assertEqual(self.book.best_ask(), (100.5, 1.0))
+
+    def test_gap_marks_book_unsynced(self):
+        self.assertTrue(self.book.apply(depth(95, 105, 90)['data']))
+        self.assertFalse(self.book.apply(depth(108, 110, 107)['data']))
+        self.assertFalse(self.book.synced)
+        self.assertEqual(self.book.gaps, 1)
+
+
+class MarketDataReplayTest(unittest.TestCase):
+    def write_replay(self, messages):
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        with os.fdopen(fd, 'w') as f:
+            for message in messages:
+                f.write(json.dumps(message) + '\n')
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_replay_recovers_from_gap(self):
+        path = self.write_replay([
+            depth(90, 95, 85, bids=[(99, 5)]),            # before any snapshot: buffered
+            snapshot(94, [(99, 1), (98, 1)], [(101, 1)]),
+            depth(96, 100, 95, asks=[(100.5, 2)]),
+            depth(110, 115, 105, bids=[(98.5, 1)]),        # gap: pu != 100
+            depth(116, 120, 115, bids=[(99, 0)]),
+            snapshot(112, [(98.5, 1), (99, 3)], [(100.5, 2)]),
+            ticker(7, 98.5, 100.5),
+        ])
+        market_data = MarketData()
+        self.assertEqual(market_data.replay(path), 7)
+
+        book = market_data.book('BTCUSDT')
+        self.assertTrue(book.synced)
+        self.assertEqual(book.gaps, 1)
+        # buffered 110-115 and 116-120 were applied on top of the second snapshot
+        self.assertEqual(book.last_update_id, 120)
+        self.assertEqual(market_data.best_bid('BTCUSDT'), (98.5, 1.0))
+        self.assertEqual(market_data.best_ask('BTCUSDT'), (100.5, 2.0))
+        self.assertEqual(market_data.tickers['BTCUSDT']['bid'], 98.5)
+
+    def test_snapshot_fetched_on_first_update(self):
+        fetched = []
+
+        def fetch(symbol):
+            fetched.append(symbol)
+            return snapshot(100, [(50, 1)], [(51, 1)], symbol)
+
+        market_data = MarketData(fetch)
+        market_data.on_message(depth(99, 101, 98, bids=[(50.5, 2)], symbol='ETHUSDT'))
+        self.assertEqual(fetched, ['ETHUSDT'])
+        self.assertEqual(market_data.best_bid('ETHUSDT'), (50.5, 2.0))
+
+    def test_one_snapshot_per_resync_with_backoff(self):
+        now = [0.0]
+        snapshots = [snapshot(50, [(50, 1)], [(51, 1)]), snapshot(105, [(50, 1)], [(51, 1)])]
+        fetched = []
+
+        def fetch(symbol):
+            fetched.append(symbol)
+            return snapshots[min(len(fetched), len(snapshots)) - 1]
+
+        market_data = MarketData(fetch, resync_delay=1.0, clock=lambda: now[0])
+        # the first snapshot is older than the first buffered update: not installed
+        market_data.on_message(depth(100, 101, 99))
+        self.assertEqual(len(fetched), 1)
+        self.assertFalse(market_data.book('BTCUSDT').synced)
+        # a 100ms stream during the backoff is only buffered
+        for i in range(102, 110):
+            market_data.on_message(depth(i, i, i - 1, bids=[(50.5, i)]))
+        self.assertEqual(len(fetched), 1)
+        now[0] = 1.5
+        market_data.on_message(depth(110, 110, 109, bids=[(50.5, 110)]))
+        self.assertEqual(len(fetched), 2)
+        book = market_data.book('BTCUSDT')
+        self.assertTrue(book.synced)
+        self.assertEqual(book.last_update_id, 110)
+        self.assertEqual(market_data.best_bid('BTCUSDT'), (50.5, 110.0))
+
+    def test_failed_snapshot_backs_off(self):
+        now = [0.0]
+        calls = []
+
+        def fetch(symbol):
+            calls.append(now[0])
+            raise ConnectionError('timeout')
+
+        market_data = MarketData(fetch, resync_delay=1.0, max_resync_delay=2.0, clock=lambda: now[0])
+        for i in range(50):
+            now[0] = i / 10
+            market_data.on_message(depth(i + 1, i + 1, i))
+        # at 0, then after 1s, then after 2s (capped)
+        self.assertEqual(calls, [0.0, 1.0, 3.0])
+
+    def test_ticker_used_without_book(self):
+        market_data = MarketData()
+        market_data.on_message(json.dumps(ticker(5, 10, 11)))
+        market_data.on_message(ticker(4, 9, 12))  # older update is ignored
+        self.assertEqual(market_data.best_ask('BTCUSDT'), (11.0, 2.0))
+        self.assertEqual(market_data.mid_price('BTCUSDT'), 10.5)
+
+    def test_order_manager_queries(self):
+        market_data = MarketData()
+        market_data.load_snapshot('BTCUSDT', snapshot(1, [(99, 1)], [(101, 1), (102, 1)]))
+        order_mgr = OrderManager(MockBinanceClient(), market_data)
+        self.assertEqual(order_mgr.best_ask('BTCUSDT'), (101.0, 1.0))
+        self.assertAlmostEqual(order_mgr.estimate_fill_price('BTCUSDT', 'BUY', 2), 101.5)
+        self.assertTrue(order_mgr.check_limit_price('BTCUSDT', 'BUY', 100))
+        with self.assertLogs('bot.orders', 'WARNING'):
+            self.assertFalse(order_mgr.check_limit_price('BTCUSDT', 'BUY', 101))
+        self.assertIsNone(OrderManager(MockBinanceClient()).best_bid('BTCUSDT'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import random
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from bot.client import MockBinanceClient
+from bot.daemon import OrderDaemon
+from bot.metrics import Histogram, Metrics, bucket_bounds, bucket_index
+from bot.orders import OrderManager
+
+
+class HistogramTest(unittest.TestCase):
+    def test_buckets_are_contiguous(self):
+        previous_high = -1
+        for index in range(bucket_index(10 ** 12)):
+            low, high = bucket_bounds(index)
+            self.assertEqual(low, previous_high + 1)
+            self.assertEqual(bucket_index(low), index)
+            self.assertEqual(bucket_index(high), index)
+            previous_high = high
+
+    def test_quantiles_within_a_few_percent(self):
+        rng = random.Random(5)
+        values = [int(rng.lognormvariate(11, 1)) for _ in range(20000)]
+        histogram = Histogram('x')
+        for v in values:
+            histogram.record(v)
+        values.sort()
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * len(values)) - 1]
+            self.assertAlmostEqual(histogram.quantile(q) / exact, 1, delta=0.04)
+        self.assertEqual(histogram.max, values[-1])
+        self.assertEqual(histogram.count, 20000)
+
+
+class OrderPathMetricsTest(unittest.TestCase):
+    def test_order_manager_records_stages(self):
+        metrics = Metrics()
+        order_mgr = OrderManager(MockBinanceClient(), metrics=metrics)
+        for _ in range(10):
+            order_mgr.place_market_order('BTCUSDT', 'BUY', 0.001)
+        order_mgr.place_limit_order('BTCUSDT', 'SELL', 0.001, 30000)
+        with self.assertRaises(Exception):
+            order_mgr.place_market_order('BTCUSDT', 'BUY', 0)
+        order_mgr.place_orders([{'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': 1}])
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['order.total']['count'], 11)
+        self.assertEqual(snapshot['order.submit']['count'], 11)
+        # stages reached before the failure are still recorded
+        self.assertEqual(snapshot['order.log']['count'], 12)
+        self.assertEqual(snapshot['order.error']['count'], 1)
+        self.assertEqual(snapshot['batch.total']['count'], 1)
+
+        text = metrics.prometheus()
+        self.assertIn('# TYPE trading_bot_stage_latency_seconds summary', text)
+        self.assertIn('trading_bot_stage_latency_seconds_count{stage="order.total"} 11', text)
+        self.assertIn('trading_bot_stage_latency_seconds{stage="order.submit",quantile="0.99"} ', text)
+
+    def test_disabled_by_default(self):
+        order_mgr = OrderManager(MockBinanceClient())
+        self.assertIsNone(order_mgr.metrics)
+        order_mgr.place_market_order('BTCUSDT', 'BUY', 0.001)
+
+    def test_daemon_metrics_op(self):
+        metrics = Metrics()
+        daemon = OrderDaemon(OrderManager(MockBinanceClient(), metrics=metrics))
+        daemon.handle({'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': 1})
+        reply = daemon.handle({'op': 'metrics'})
+        self.assertTrue(reply['ok'])
+        self.assertIn('stage="order.total"', reply['metrics'])
+        self.assertFalse(OrderDaemon(OrderManager(MockBinanceClient())).handle({'op': 'metrics'})['ok'])
+
+
+class _TimeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({'serverTime': 1700000000000}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ClientMetricsTest(unittest.TestCase):
+    def test_request_is_split_into_sign_network_decode(self):
+        from bot.pooled_client import PooledClient
+        from bot.session import SessionConfig
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _TimeHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        metrics = Metrics()
+        with mock.patch.object(PooledClient, 'ping'):
+            client = PooledClient('key', 'secret', SessionConfig(), metrics=metrics, testnet=True)
+        client.FUTURES_TESTNET_URL = f"http://127.0.0.1:{server.server_address[1]}/fapi"
+        self.assertEqual(client.futures_time(), {'serverTime': 1700000000000})
+        client.close_connection()
+
+        snapshot = metrics.snapshot()
+        for stage in ('http.sign', 'http.network', 'http.decode', 'http.total'):
+            self.assertEqual(snapshot[stage]['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import unittest
+from decimal import Decimal
+
+from bot.client import MockBinanceClient
+from bot.exchange_info import parse_symbol_rules
+from bot.models import OrderRequest, OrderResult, SymbolRules, parse_order, to_json
+from bot.orders import OrderManager, format_order_response
+
+RESPONSE = {
+    'orderId': 4012345678, 'clientOrderId': 'tb-1', 'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET',
+    'status': 'FILLED', 'origQty': '0.001', 'executedQty': '0.001', 'price': '0', 'avgPrice': '30000.10',
+    'cumQuote': '30.0001', 'updateTime': 1700000000000, 'workingType': 'CONTRACT_PRICE',
+}
+
+
+class OrderResultTest(unittest.TestCase):
+    def test_parse_keeps_strings_and_converts_lazily(self):
+        order = parse_order(json.dumps(RESPONSE).encode())
+        self.assertEqual(order.order_id, 4012345678)
+        self.assertEqual(order.executed_qty_text, '0.001')
+        self.assertEqual(order.executed_qty, Decimal('0.001'))
+        self.assertEqual(order.avg_price, Decimal('30000.10'))
+        self.assertIsNone(order.time_in_force)
+        self.assertFalse(hasattr(order, '__dict__'))
+
+    def test_mapping_view_matches_the_response(self):
+        order = OrderResult.from_response(RESPONSE)
+        self.assertEqual(order['orderId'], 4012345678)
+        self.assertEqual(order.get('avgPrice'), '30000.10')
+        self.assertNotIn('timeInForce', order)
+        self.assertEqual(order.get('timeInForce', 'GTC'), 'GTC')
+        with self.assertRaises(KeyError):
+            order['workingType']
+        expected = {k: v for k, v in RESPONSE.items() if k != 'workingType'}
+        self.assertEqual(order, expected)
+        self.assertEqual(json.loads(json.dumps({'order': order}, default=to_json)), {'order': expected})
+
+    def test_order_manager_returns_models(self):
+        order_mgr = OrderManager(MockBinanceClient())
+        order = order_mgr.place_limit_order('BTCUSDT', 'BUY', 0.01, 30000)
+        self.assertIsInstance(order, OrderResult)
+        self.assertEqual(order.status, 'NEW')
+        self.assertEqual(order.orig_qty, Decimal('0.01'))
+        results = order_mgr.place_orders([{'symbol': 'BTCUSDT', 'side': 'SELL', 'type': 'MARKET', 'quantity': 0.01}])
+        self.assertIsInstance(results[0]['order'], OrderResult)
+        self.assertIn('Limit Price: 30000', format_order_response(order))
+        self.assertEqual(format_order_response(order), format_order_response(order.to_dict()))
+
+
+class OrderRequestTest(unittest.TestCase):
+    def test_params_in_signing_order(self):
+        request = OrderRequest('BTCUSDT', 'BUY', 'LIMIT', '0.001', '30000', 'GTC', 'tb-2')
+        self.assertEqual(list(request.params().items()), [
+            ('symbol', 'BTCUSDT'), ('side', 'BUY'), ('type', 'LIMIT'), ('timeInForce', 'GTC'),
+            ('quantity', '0.001'), ('price', '30000'), ('newClientOrderId', 'tb-2')])
+        self.assertEqual(OrderRequest('BTCUSDT', 'SELL', 'MARKET', 1).params(),
+                         {'symbol': 'BTCUSDT', 'side': 'SELL', 'type': 'MARKET', 'quantity': 1})
+
+
+class SymbolRulesTest(unittest.TestCase):
+    def test_parsed_from_exchange_info(self):
+        rules = parse_symbol_rules({'symbol': 'BTCUSDT', 'filters': [
+            {'filterType': 'PRICE_FILTER', 'tickSize': '0.10', 'minPrice': '556.80', 'maxPrice': '4529764'},
+            {'filterType': 'LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '1000'},
+            {'filterType': 'MIN_NOTIONAL', 'notional': '5'},
+        ]})
+        self.assertIsInstance(rules, SymbolRules)
+        self.assertEqual(rules['tickSize'], '0.10')
+        self.assertEqual(rules.tick_size, Decimal('0.10'))
+        self.assertEqual(rules.min_notional, Decimal('5'))
+        self.assertIsNone(rules.market_step_size)
+        self.assertIsNone(rules.get('marketStepSize'))
+
+
+if __name__ == '__main__':
+    unittest.main()
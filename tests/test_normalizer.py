@@ -0,0 +1,135 @@
+import copy
+import unittest
+
+from bot.client import MockBinanceClient
+from bot.exchange_info import ExchangeInfoCache
+from bot.normalizer import OrderNormalizer
+from bot.orders import OrderManager
+
+RULES = {
+    'BTCUSDT': {'symbol': 'BTCUSDT', 'tickSize': '0.10', 'minPrice': '556.80', 'maxPrice': '4529764',
+                'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '1000', 'marketStepSize': '0.001',
+                'marketMinQty': '0.001', 'marketMaxQty': '120', 'minNotional': '100'},
+    'XUSDT': {'symbol': 'XUSDT', 'tickSize': '0.5', 'minPrice': None, 'maxPrice': None,
+              'stepSize': '1', 'minQty': '1', 'maxQty': None, 'minNotional': '5'},
+    'PEPEUSDT': {'symbol': 'PEPEUSDT', 'tickSize': '0.0000001', 'minPrice': '0.0000001', 'maxPrice': '200',
+                 'stepSize': '1', 'minQty': '1', 'maxQty': '800000000', 'minNotional': '5'},
+}
+
+# (symbol, side, quantity in, price in, quantity sent, price sent)
+CORPUS = [
+    ('BTCUSDT', 'BUY', 0.1 + 0.2, 30000.05, '0.300', '30000.0'),
+    ('BTCUSDT', 'SELL', 0.1 + 0.2, 30000.05, '0.300', '30000.1'),
+    ('BTCUSDT', 'BUY', 1e-3, 1e5, '0.001', '100000.0'),
+    ('BTCUSDT', 'BUY', 0.0029999999999999, 99999.99, '0.002', '99999.9'),
+    ('BTCUSDT', 'BUY', '0.0050', '65000.1000', '0.005', '65000.1'),
+    ('BTCUSDT', 'SELL', 2.675, 1.15e4, '2.675', '11500.0'),
+    ('XUSDT', 'BUY', 7.9, 1.26, '7', '1.0'),
+    ('XUSDT', 'SELL', 7.9, 1.26, '7', '1.5'),
+    ('XUSDT', 'SELL', 10, 2.5, '10', '2.5'),
+    ('PEPEUSDT', 'BUY', 12345678.9, 1.2345e-05, '12345678', '0.0000123'),
+    ('PEPEUSDT', 'SELL', 5e6, 0.00000105, '5000000', '0.0000011'),
+]
+
+
+class OrderNormalizerTest(unittest.TestCase):
+    def setUp(self):
+        self.lookups = []
+
+        def rules(symbol):
+            self.lookups.append(symbol)
+            return RULES.get(symbol)
+
+        self.normalizer = OrderNormalizer(rules)
+
+    def test_corpus_has_no_float_artefacts(self):
+        for symbol, side, qty, price, want_qty, want_price in CORPUS:
+            with self.subTest(symbol=symbol, side=side, qty=qty, price=price):
+                sent_qty, sent_price = self.normalizer.normalize(symbol, side, 'LIMIT', qty, price)
+                self.assertEqual((sent_qty, sent_price), (want_qty, want_price))
+                self.assertNotIn('e', sent_qty.lower() + sent_price.lower())
+        # quantizers are built once per symbol (while its rules stay the same)
+        self.assertEqual(sorted(set(self.lookups)), ['BTCUSDT', 'PEPEUSDT', 'XUSDT'])
+        self.assertIs(self.normalizer.filters('BTCUSDT'), self.normalizer.filters('BTCUSDT'))
+
+    def test_rejections(self):
+        cases = [
+            ('BTCUSDT', 'LIMIT', 0.0004, 50000),      # below minQty after rounding
+            ('BTCUSDT', 'LIMIT', 0.001, 50000),       # notional 50 < 100
+            ('BTCUSDT', 'LIMIT', 0.01, 100),          # below minPrice
+            ('BTCUSDT', 'MARKET', 121, None),         # above market maxQty
+            ('BTCUSDT', 'LIMIT', float('nan'), 1),
+            ('BTCUSDT', 'LIMIT', -1, 50000),
+            ('NOPEUSDT', 'LIMIT', 1, 1),
+        ]
+        for symbol, order_type, qty, price in cases:
+            with self.subTest(symbol=symbol, qty=qty, price=price):
+                with self.assertRaises(ValueError):
+                    self.normalizer.normalize(symbol, 'BUY', order_type, qty, price)
+
+    def test_strict_mode_rejects_off_grid_values(self):
+        strict = OrderNormalizer(RULES.get, strict=True)
+        self.assertEqual(strict.normalize('BTCUSDT', 'BUY', 'LIMIT', '0.005', '65000.1'), ('0.005', '65000.1'))
+        with self.assertRaises(ValueError):
+            strict.normalize('BTCUSDT', 'BUY', 'LIMIT', 0.0055, 65000.1)
+        with self.assertRaises(ValueError):
+            strict.normalize('XUSDT', 'BUY', 'LIMIT', 10, 1.25)
+
+    def test_market_notional_uses_reference_price(self):
+        self.assertEqual(self.normalizer.normalize('BTCUSDT', 'BUY', 'MARKET', 0.0021), ('0.002', None))
+        with self.assertRaises(ValueError):
+            self.normalizer.normalize('BTCUSDT', 'BUY', 'MARKET', 0.001, reference_price=30000)
+
+    def test_bulk(self):
+        self.assertEqual(self.normalizer.normalize_quantities('XUSDT', [1.9, '2', 3.0000001]), ['1', '2', '3'])
+        self.assertEqual(self.normalizer.normalize_prices('XUSDT', [0.74, 1.01], 'SELL'), ['1.0', '1.5'])
+        results = self.normalizer.normalize_specs([
+            {'symbol': 'XUSDT', 'side': 'BUY', 'type': 'LIMIT', 'quantity': 10.4, 'price': 2.2},
+            {'symbol': 'NOPEUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': 1},
+            {'symbol': 'XUSDT', 'side': 'BUY', 'type': 'LIMIT', 'quantity': 1, 'price': 1},
+        ])
+        self.assertEqual(results[0][0]['quantity'], '10')
+        self.assertEqual(results[0][0]['price'], '2.0')
+        self.assertIn('Unknown symbol', results[1][1])
+        self.assertIn('minNotional', results[2][1])
+
+    def test_refreshed_rules_take_effect(self):
+        mock = MockBinanceClient(num_symbols=3)
+        info = mock.futures_exchange_info()
+        now = [1000.0]
+        cache = ExchangeInfoCache(lambda: copy.deepcopy(info), ttl=60, clock=lambda: now[0])
+        normalizer = OrderNormalizer(cache.get_rules)
+        self.assertEqual(normalizer.normalize('C002USDT', 'BUY', 'LIMIT', '10', '1.23456'), ('10.00', '1.234'))
+        for symbol in info['symbols']:
+            for f in symbol['filters']:
+                if f['filterType'] == 'PRICE_FILTER':
+                    f['tickSize'] = '0.01'
+        now[0] += 60
+        self.assertEqual(normalizer.normalize('C002USDT', 'BUY', 'LIMIT', '10', '1.23456'), ('10.00', '1.23'))
+
+    def test_order_manager_rejects_before_sending(self):
+        mock = MockBinanceClient()
+        sent = []
+        fill = mock._fill
+        mock._fill = lambda kwargs: sent.append(kwargs) or fill(kwargs)
+        order_mgr = OrderManager(mock, normalizer=self.normalizer)
+
+        order = order_mgr.place_limit_order('BTCUSDT', 'BUY', 0.1 + 0.2, 30000.05)
+        self.assertEqual(order['origQty'], '0.300')
+        self.assertEqual(sent[0]['price'], '30000.0')
+        with self.assertRaises(ValueError):
+            order_mgr.place_limit_order('BTCUSDT', 'BUY', 0.001, 50000)
+        self.assertEqual(len(sent), 1)
+
+        results = order_mgr.place_orders([
+            {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT', 'quantity': 0.001, 'price': 50000},
+            {'symbol': 'BTCUSDT', 'side': 'SELL', 'type': 'LIMIT', 'quantity': 0.0025, 'price': 65000.04},
+        ])
+        self.assertIn('minNotional', results[0]['error'])
+        self.assertIsNone(results[1]['error'])
+        self.assertEqual(results[1]['order']['price'], '65000.1')
+        self.assertEqual(results[1]['spec']['quantity'], 0.0025)
+
+
+if __name__ == '__main__':
+    unittest.main()
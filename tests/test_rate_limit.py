@@ -0,0 +1,132 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from binance.exceptions import BinanceAPIException
+
+from bot.client import MockBinanceClient
+from bot.orders import OrderManager
+from bot.pooled_client import PooledClient
+from bot.rate_limit import RateLimitGovernor, request_cost
+from bot.session import SessionConfig
+
+
+class FakeTime:
+    """Clock whose sleep() just moves time forward"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RateLimitGovernorTest(unittest.TestCase):
+    def test_burst_stays_under_limits(self):
+        t = FakeTime()
+        governor = RateLimitGovernor(clock=t.clock, sleep=t.sleep)
+        mock = MockBinanceClient(governor=governor, clock=t.clock)
+        mgr = OrderManager(mock)
+        for _ in range(1000):
+            mgr.place_market_order('BTCUSDT', 'BUY', 0.001)
+
+        self.assertEqual(mock.rate_limit_server.rejected, 0)
+        metrics = governor.metrics()
+        self.assertEqual(metrics['requests'], 1000)
+        self.assertGreater(metrics['waits'], 0)
+        self.assertEqual(metrics['limit_hits'], 0)
+
+    def test_without_governor_the_server_rejects(self):
+        t = FakeTime()
+        mock = MockBinanceClient(rate_limits={('ORDERS', '10S'): 300}, clock=t.clock)
+        mgr = OrderManager(mock)
+        with self.assertRaises(BinanceAPIException) as ctx:
+            for _ in range(301):
+                mgr.place_market_order('BTCUSDT', 'BUY', 0.001)
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertEqual(ctx.exception.code, -1003)
+
+    def test_headers_sync_buckets(self):
+        t = FakeTime()
+        governor = RateLimitGovernor(clock=t.clock, sleep=t.sleep)
+        governor.update_from_headers({'x-mbx-used-weight-1m': '2100', 'X-MBX-ORDER-COUNT-10S': '5'})
+        buckets = governor.metrics()['buckets']
+        self.assertAlmostEqual(buckets['REQUEST_WEIGHT_1M']['available'], 2400 * 0.9 - 2100)
+        self.assertEqual(buckets['ORDERS_10S']['reported_used'], 5)
+
+        # 60 weight left: a weight-100 call has to wait for the bucket to refill
+        waited = governor.acquire(100)
+        self.assertGreater(waited, 0)
+
+    def test_backs_off_after_429(self):
+        t = FakeTime()
+        governor = RateLimitGovernor(clock=t.clock, sleep=t.sleep)
+        governor.update_from_headers({'Retry-After': '7'}, status=429)
+        self.assertAlmostEqual(governor.acquire(1), 7.0)
+        self.assertEqual(governor.metrics()['limit_hits'], 1)
+
+    def test_request_cost(self):
+        self.assertEqual(request_cost('POST', '/fapi/v1/order?x=1'), (1, 1))
+        self.assertEqual(request_cost('GET', '/fapi/v2/account'), (5, 0))
+        body = 'batchOrders=%5B%7B%22symbol%22%3A+%22A%22%7D%2C+%7B%22symbol%22%3A+%22B%22%7D%5D'
+        self.assertEqual(request_cost('POST', '/fapi/v1/batchOrders?' + body), (5, 2))
+        self.assertEqual(request_cost('POST', '/fapi/v1/batchOrders', body), (5, 2))
+
+
+class _BatchHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    order_counts = []
+
+    def do_POST(self):
+        from urllib.parse import parse_qs, urlsplit
+        orders = json.loads(parse_qs(urlsplit(self.path).query)['batchOrders'][0])
+        self.order_counts.append(len(orders))
+        body = json.dumps([{'orderId': i, 'symbol': o['symbol']} for i, o in enumerate(orders)]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-MBX-USED-WEIGHT-1M', '5')
+        self.send_header('X-MBX-ORDER-COUNT-10S', str(sum(self.order_counts)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class GovernedAdapterTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _BatchHandler)
+        _BatchHandler.order_counts = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_real_batch_request_counts_every_order(self):
+        t = FakeTime()
+        governor = RateLimitGovernor(clock=t.clock, sleep=t.sleep)
+        with mock.patch.object(PooledClient, 'ping'):
+            client = PooledClient('key', 'secret', SessionConfig(), governor, testnet=True)
+        client.FUTURES_TESTNET_URL = f"http://127.0.0.1:{self.server.server_address[1]}/fapi"
+
+        batch = [{'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': '0.001'}] * 5
+        responses = client.futures_place_batch_order(batchOrders=batch)
+        client.close_connection()
+
+        self.assertEqual(len(responses), 5)
+        self.assertEqual(_BatchHandler.order_counts, [5])
+        buckets = governor.metrics()['buckets']
+        self.assertAlmostEqual(buckets['ORDERS_10S']['available'], 300 * 0.9 - 5)
+        self.assertEqual(buckets['ORDERS_10S']['reported_used'], 5)
+        self.assertAlmostEqual(buckets['REQUEST_WEIGHT_1M']['available'], 2400 * 0.9 - 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from bot.client import MockBinanceClient
+from bot.errors import api_error
+from bot.orders import OrderManager
+from bot.retry import AMBIGUOUS, FATAL, RETRY, ClientOrderIds, RetryPolicy, classify
+
+
+def order_manager(client, attempts=3):
+    delays = []
+    retry = RetryPolicy(attempts=attempts, seed=1, sleep=delays.append)
+    return OrderManager(client, retry=retry, client_ids=ClientOrderIds('t')), delays
+
+
+class ClassifyTest(unittest.TestCase):
+    def test_classification(self):
+        self.assertEqual(classify(TimeoutError('read timed out')), AMBIGUOUS)
+        self.assertEqual(classify(ConnectionResetError()), AMBIGUOUS)
+        self.assertEqual(classify(ConnectionRefusedError()), RETRY)
+        self.assertEqual(classify(api_error(-1007, 'Timeout waiting for response', status=503)), AMBIGUOUS)
+        self.assertEqual(classify(api_error(-4116, 'ClientOrderId is duplicated.')), AMBIGUOUS)
+        self.assertEqual(classify(api_error(-1003, 'Too many requests', status=429)), RETRY)
+        self.assertEqual(classify(api_error(-4003, 'Quantity less than or equal to zero.')), FATAL)
+        self.assertEqual(classify(ValueError('bad')), FATAL)
+
+    def test_client_ids_are_deterministic(self):
+        ids = ClientOrderIds('run7', start=10)
+        self.assertEqual([ids.next(), ids.next()], ['run7-10', 'run7-11'])
+        self.assertLessEqual(len(ClientOrderIds().next()), 36)
+
+    def test_backoff_is_jittered_and_capped(self):
+        retry = RetryPolicy(base_delay=0.1, max_delay=0.3, seed=3)
+        delays = [retry.delay(attempt) for attempt in range(6)]
+        self.assertTrue(all(0 <= d <= 0.3 for d in delays))
+        self.assertEqual(len(set(delays)), 6)
+
+
+class OrderRetryTest(unittest.TestCase):
+    def test_lost_response_is_resolved_by_lookup_not_resent(self):
+        client = MockBinanceClient()
+        client.inject_fault(TimeoutError('read timed out'), after=True)
+        order_mgr, delays = order_manager(client)
+        order = order_mgr.place_limit_order('BTCUSDT', 'BUY', 0.01, 30000)
+        self.assertEqual(order['clientOrderId'], 't-1')
+        self.assertEqual(len(client.exchange.orders), 1)
+        self.assertEqual((order_mgr.retry.retries, order_mgr.retry.resolved, len(delays)), (1, 1, 1))
+
+    def test_request_that_never_arrived_is_resent_with_same_id(self):
+        client = MockBinanceClient()
+        client.inject_fault(TimeoutError('connect timed out'))
+        client.inject_fault(api_error(-1003, 'Too many requests', status=429))
+        order_mgr, delays = order_manager(client)
+        order = order_mgr.place_market_order('BTCUSDT', 'BUY', 0.01)
+        self.assertEqual(order['clientOrderId'], 't-1')
+        self.assertEqual(len(client.exchange.orders), 1)
+        self.assertEqual(order_mgr.retry.retries, 2)
+
+    def test_failed_lookup_is_retried(self):
+        client = MockBinanceClient()
+        client.inject_fault(TimeoutError(), after=True)
+        client.inject_fault(ConnectionResetError(), endpoint='futures_get_order')
+        order_mgr, _ = order_manager(client)
+        order = order_mgr.place_limit_order('BTCUSDT', 'SELL', 0.01, 30000)
+        self.assertEqual(order['status'], 'NEW')
+        self.assertEqual(len(client.exchange.orders), 1)
+
+    def test_fatal_errors_and_exhausted_retries_raise(self):
+        client = MockBinanceClient()
+        order_mgr, delays = order_manager(client, attempts=2)
+        with self.assertRaises(Exception) as ctx:
+            order_mgr.place_market_order('BTCUSDT', 'BUY', -1)
+        self.assertEqual(ctx.exception.code, -4003)
+        self.assertEqual(delays, [])
+
+        client.inject_fault(ConnectionRefusedError(), times=3)
+        with self.assertRaises(ConnectionRefusedError):
+            order_mgr.place_market_order('BTCUSDT', 'BUY', 0.01)
+        self.assertEqual(len(delays), 2)
+        self.assertEqual(len(client.exchange.orders), 0)
+
+    def test_without_policy_errors_propagate(self):
+        client = MockBinanceClient()
+        client.inject_fault(TimeoutError(), after=True)
+        with self.assertRaises(TimeoutError):
+            OrderManager(client).place_market_order('BTCUSDT', 'BUY', 0.01)
+
+    def test_batch_timeout_settles_each_order(self):
+        client = MockBinanceClient()
+        client.inject_fault(TimeoutError(), endpoint='futures_place_batch_order', after=True)
+        order_mgr, _ = order_manager(client)
+        specs = [{'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT', 'quantity': 0.01, 'price': 29000 + i}
+                 for i in range(3)]
+        results = order_mgr.place_orders(specs)
+        self.assertEqual([r['order']['clientOrderId'] for r in results], ['t-1', 't-2', 't-3'])
+        self.assertEqual(len(client.exchange.orders), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
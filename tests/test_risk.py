@@ -0,0 +1,73 @@
+import unittest
+
+from bot.client import MockBinanceClient
+from bot.errors import api_error
+from bot.market_data import MarketData
+from bot.orders import OrderManager
+from bot.risk import RiskEngine, RiskError, RiskLimits
+
+
+class RiskEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.mock = MockBinanceClient()
+        self.risk = RiskEngine(RiskLimits(max_order_qty=5, max_position=2, price_band=0.05),
+                               max_account_notional=1000)
+        self.risk.update_mark_price('BTCUSDT', 100)
+        self.order_mgr = OrderManager(self.mock, risk=self.risk)
+
+    def test_fat_finger_orders_are_not_sent(self):
+        with self.assertRaisesRegex(RiskError, 'order limit'):
+            self.order_mgr.place_market_order('BTCUSDT', 'BUY', '50')
+        with self.assertRaisesRegex(RiskError, 'from the mark price'):
+            self.order_mgr.place_limit_order('BTCUSDT', 'SELL', '1', '80')
+        with self.assertRaisesRegex(RiskError, 'no mark price'):
+            self.order_mgr.place_market_order('ETHUSDT', 'BUY', '1')
+        self.assertEqual(self.mock.exchange.orders, {})
+        self.assertEqual(self.risk.stats()['rejections'], 3)
+
+    def test_open_orders_and_fills_count_towards_the_position(self):
+        self.order_mgr.place_limit_order('BTCUSDT', 'BUY', '1.5', '99')
+        self.assertEqual(self.risk.exposure('BTCUSDT')['open_buy'], 1.5)
+        with self.assertRaisesRegex(RiskError, 'position could reach 2.5'):
+            self.order_mgr.place_market_order('BTCUSDT', 'BUY', '1')
+        # selling only reduces the worst case, so it is allowed
+        self.order_mgr.place_market_order('BTCUSDT', 'SELL', '1')
+        exposure = self.risk.exposure('BTCUSDT')
+        self.assertEqual((exposure['position'], exposure['open_buy'], exposure['open_sell']), (-1.0, 1.5, 0.0))
+        self.assertAlmostEqual(self.risk.account_notional, 100.0)
+
+    def test_duplicate_updates_count_once(self):
+        order = self.order_mgr.place_market_order('BTCUSDT', 'BUY', '1')
+        self.risk.on_order(order)
+        self.risk.on_message({'e': 'ORDER_TRADE_UPDATE', 'o': {
+            'i': order.order_id, 'c': order.client_order_id, 's': 'BTCUSDT', 'S': 'BUY', 'o': 'MARKET',
+            'X': 'FILLED', 'q': '1', 'z': '1', 'ap': '100', 'T': 1}})
+        self.assertEqual(self.risk.exposure('BTCUSDT')['position'], 1.0)
+
+    def test_failed_order_releases_its_reservation(self):
+        self.mock.inject_fault(api_error(-2019, 'Margin is insufficient.'))
+        with self.assertRaises(Exception):
+            self.order_mgr.place_limit_order('BTCUSDT', 'BUY', '2', '99')
+        self.assertEqual(self.risk.exposure('BTCUSDT')['open_buy'], 0.0)
+        self.order_mgr.place_limit_order('BTCUSDT', 'BUY', '2', '99')
+
+    def test_batch_rejects_only_the_orders_over_the_limits(self):
+        specs = [{'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT', 'quantity': '1', 'price': '99'}] * 3
+        results = self.order_mgr.place_orders(specs)
+        self.assertEqual([r['error'] is None for r in results], [True, True, False])
+        self.assertEqual(self.risk.exposure('BTCUSDT')['open_buy'], 2.0)
+
+    def test_stream_updates(self):
+        market_data = MarketData()
+        risk = RiskEngine(RiskLimits(max_notional=500), market_data=market_data)
+        market_data.on_message({'e': 'markPriceUpdate', 'E': 1, 's': 'BTCUSDT', 'p': '200'})
+        risk.check('BTCUSDT', 'BUY', 'MARKET', '2')
+        risk.on_message({'e': 'ACCOUNT_UPDATE', 'E': 2, 'a': {'m': 'ADL', 'P': [
+            {'s': 'BTCUSDT', 'pa': '2', 'ep': '200', 'up': '0', 'ps': 'BOTH'}]}})
+        with self.assertRaisesRegex(RiskError, 'exposure could reach 600.00'):
+            risk.check('BTCUSDT', 'BUY', 'MARKET', '1')
+        risk.check('BTCUSDT', 'SELL', 'MARKET', '1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+from bot import client as client_module
+from bot.session import SessionConfig, configure_session, connection_report
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"serverTime": 1}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class PooledSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/fapi/v1/time"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connection_is_reused(self):
+        session = requests.Session()
+        adapter, stats = configure_session(session, SessionConfig(pool_size=2))
+        for _ in range(5):
+            self.assertEqual(session.get(self.url).json(), {'serverTime': 1})
+
+        report = connection_report(adapter, stats)
+        self.assertEqual(report['requests'], 5)
+        self.assertEqual(report['connections_opened'], 1)
+        self.assertEqual(report['connections_reused'], 4)
+        self.assertIsNotNone(report['avg_ms'])
+        session.close()
+
+
+
+class SharedClientTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(client_module, 'BinanceClient', side_effect=lambda *a, **kw: mock.Mock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(client_module.close_shared_clients)
+
+    def test_same_settings_share_one_client(self):
+        first = client_module.get_shared_client('k', 's', session_config=SessionConfig(pool_size=4))
+        second = client_module.get_shared_client('k', 's', session_config=SessionConfig(pool_size=4))
+        self.assertIs(first, second)
+
+    def test_different_settings_are_rejected(self):
+        client_module.get_shared_client('k', 's', exchange_info_ttl=60)
+        with self.assertRaises(ValueError):
+            client_module.get_shared_client('k', 's', exchange_info_ttl=600)
+        with self.assertRaises(ValueError):
+            client_module.get_shared_client('k', 's', session_config=SessionConfig(pool_size=50))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import hashlib
+import hmac
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+
+from binance.client import Client
+from binance.exceptions import BinanceAPIException
+
+from bot.pooled_client import PooledClient
+from bot.session import SessionConfig
+from bot.signing import RequestSigner
+from bot.time_sync import TimeSync
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    requests = []
+    reject_timestamp = False
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.requests.append(self.path)
+        if _Handler.reject_timestamp:
+            status, payload = 400, {'code': -1021, 'msg': 'Timestamp for this request is outside of the recvWindow.'}
+        else:
+            status, payload = 200, {'orderId': 1, 'status': 'NEW'}
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeClock:
+    def __init__(self, now=1000.0, server_offset_ms=2500, rtts=(0.030, 0.010, 0.050)):
+        self.now = now
+        self.server_offset_ms = server_offset_ms
+        self.rtts = list(rtts)
+
+    def clock(self):
+        return self.now
+
+    def server_time(self):
+        # the server reads its clock half way through the round trip
+        rtt = self.rtts.pop(0)
+        self.now += rtt / 2
+        server = self.now * 1000 + self.server_offset_ms
+        self.now += rtt / 2
+        return server
+
+
+class RequestSignerTest(unittest.TestCase):
+    def test_matches_plain_hmac_and_python_binance(self):
+        signer = RequestSigner('secret')
+        query = 'symbol=BTCUSDT&side=BUY&type=MARKET&quantity=0.001&timestamp=1700000000000'
+        expected = hmac.new(b'secret', query.encode(), hashlib.sha256).hexdigest()
+        self.assertEqual(signer.sign(query), expected)
+        # the key state is reused, not consumed
+        self.assertEqual(signer.sign(query), expected)
+        self.assertEqual(Client._hmac_signature(SimpleNamespace(API_SECRET='secret'), query), expected)
+
+    def test_signed_query(self):
+        signed = RequestSigner('secret').signed_query({'symbol': 'BTCUSDT', 'price': None, 'quantity': 0.5}, 42)
+        query, _, signature = signed.partition('&signature=')
+        self.assertEqual(query, 'symbol=BTCUSDT&quantity=0.5&timestamp=42')
+        self.assertEqual(signature, hmac.new(b'secret', query.encode(), hashlib.sha256).hexdigest())
+
+
+class TimeSyncTest(unittest.TestCase):
+    def test_offset_from_fastest_sample(self):
+        fake = FakeClock()
+        sync = TimeSync(fake.server_time, samples=3, clock=fake.clock)
+        offset, rtt = sync.measure()
+        self.assertAlmostEqual(offset, 2500, places=3)
+        self.assertAlmostEqual(rtt, 10, places=3)
+        self.assertEqual(sync.timestamp(), int(fake.now * 1000 + offset))
+
+    def test_background_refresh(self):
+        sync = TimeSync(lambda: 0, interval=0.01, samples=1)
+        sync.start()
+        try:
+            for _ in range(500):
+                if sync.measurements >= 2:
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            sync.stop()
+        self.assertGreaterEqual(sync.measurements, 2)
+
+
+class SignedRequestTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        _Handler.requests = []
+        _Handler.reject_timestamp = False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.sync = mock.Mock()
+        self.sync.timestamp.return_value = 1700000000123
+        with mock.patch.object(PooledClient, 'ping'):
+            self.client = PooledClient('key', 'secret', SessionConfig(), time_sync=self.sync, testnet=True)
+        self.client.FUTURES_TESTNET_URL = f"http://127.0.0.1:{self.server.server_address[1]}/fapi"
+
+    def tearDown(self):
+        self.client.close_connection()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_order_is_signed_with_synced_timestamp(self):
+        self.client.futures_create_order(symbol='BTCUSDT', side='BUY', type='MARKET', quantity='0.001')
+        # python-binance sends futures params in the query string
+        path, _, signed = _Handler.requests[0].partition('?')
+        self.assertEqual(path, '/fapi/v1/order')
+        query, _, signature = signed.partition('&signature=')
+        self.assertEqual(query, 'symbol=BTCUSDT&side=BUY&type=MARKET&quantity=0.001&timestamp=1700000000123')
+        self.assertEqual(signature, hmac.new(b'secret', query.encode(), hashlib.sha256).hexdigest())
+
+    def test_timestamp_rejection_triggers_resync(self):
+        _Handler.reject_timestamp = True
+        with self.assertRaises(BinanceAPIException) as ctx:
+            self.client.futures_create_order(symbol='BTCUSDT', side='BUY', type='MARKET', quantity='0.001')
+        self.assertEqual(ctx.exception.code, -1021)
+        self.sync.measure.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
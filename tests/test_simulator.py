@@ -0,0 +1,108 @@
+import unittest
+
+from bot.client import MockBinanceClient
+from bot.market_data import MarketData
+from bot.orders import OrderManager
+from bot.simulator import LatencyModel, SimulatedExchange
+
+
+class SimulatedExchangeTest(unittest.TestCase):
+    def setUp(self):
+        self.exchange = SimulatedExchange(clock=lambda: 1700000000.0)
+
+    def test_price_time_priority_and_partial_fills(self):
+        first = self.exchange.submit('BTCUSDT', 'SELL', 'LIMIT', '1', '101')
+        second = self.exchange.submit('BTCUSDT', 'SELL', 'LIMIT', '1', '101')
+        better = self.exchange.submit('BTCUSDT', 'SELL', 'LIMIT', '1', '100.5')
+
+        taker = self.exchange.submit('BTCUSDT', 'BUY', 'LIMIT', '1.5', '101')
+        self.assertEqual(taker.status, 'FILLED')
+        self.assertEqual(better.status, 'FILLED')
+        self.assertEqual(first.status, 'PARTIALLY_FILLED')
+        self.assertEqual(second.status, 'NEW')
+        response = taker.to_response()
+        self.assertEqual(response['executedQty'], '1.5')
+        self.assertEqual(response['avgPrice'], '100.66666667')
+
+        resting = self.exchange.submit('BTCUSDT', 'BUY', 'LIMIT', '2', '101')
+        self.assertEqual(resting.status, 'PARTIALLY_FILLED')
+        self.assertEqual(resting.to_response()['executedQty'], '1.5')
+        self.assertEqual(self.exchange.book('BTCUSDT').best_bid(), 101.0)
+
+    def test_order_ids_are_unique(self):
+        ids = {self.exchange.submit('BTCUSDT', 'BUY', 'MARKET', '0.001').order_id for _ in range(1000)}
+        self.assertEqual(len(ids), 1000)
+
+    def test_market_order_fills_at_default_price_on_empty_book(self):
+        response = self.exchange.submit('BTCUSDT', 'BUY', 'MARKET', 0.001).to_response()
+        self.assertEqual(response['status'], 'FILLED')
+        self.assertEqual(response['avgPrice'], '100')
+        self.assertEqual(response['executedQty'], '0.001')
+
+        thin = SimulatedExchange(fill_empty_book=False)
+        thin.submit('BTCUSDT', 'SELL', 'LIMIT', '1', '100')
+        order = thin.submit('BTCUSDT', 'BUY', 'MARKET', '3')
+        self.assertEqual((order.status, order.executed), ('EXPIRED', 1.0))
+
+    def test_time_in_force(self):
+        self.exchange.submit('BTCUSDT', 'SELL', 'LIMIT', '1', '100')
+        self.assertEqual(self.exchange.submit('BTCUSDT', 'BUY', 'LIMIT', '1', '100', 'GTX').status, 'EXPIRED')
+        self.assertEqual(self.exchange.submit('BTCUSDT', 'BUY', 'LIMIT', '2', '100', 'FOK').status, 'EXPIRED')
+        ioc = self.exchange.submit('BTCUSDT', 'BUY', 'LIMIT', '2', '100', 'IOC')
+        self.assertEqual((ioc.status, ioc.executed), ('EXPIRED', 1.0))
+        self.assertEqual(self.exchange.open_orders('BTCUSDT'), [])
+
+    def test_cancel(self):
+        order = self.exchange.submit('BTCUSDT', 'BUY', 'LIMIT', '1', '99', client_order_id='ladder-1')
+        self.assertIs(self.exchange.cancel(client_order_id='ladder-1'), order)
+        self.assertEqual(order.status, 'CANCELED')
+        self.assertIsNone(self.exchange.cancel(order.order_id))
+        self.assertIsNone(self.exchange.book('BTCUSDT').best_bid())
+
+    def test_trade_replay_fills_resting_orders(self):
+        bid = self.exchange.submit('BTCUSDT', 'BUY', 'LIMIT', '2', '99')
+        trades = [{'p': '99.5', 'q': '3', 'm': True}, {'p': '99', 'q': '1.5', 'm': True},
+                  {'p': '98', 'q': '5', 'm': False}]
+        filled = self.exchange.replay_trades('BTCUSDT', trades)
+        self.assertEqual(filled, 1.5)
+        self.assertEqual(bid.status, 'PARTIALLY_FILLED')
+        self.assertEqual(self.exchange.book('BTCUSDT').last_price, 98.0)
+
+    def test_latency_model_is_reproducible(self):
+        a = LatencyModel(0.001, 0.002, seed=3)
+        b = LatencyModel(0.001, 0.002, seed=3)
+        samples = [a.sample() for _ in range(5)]
+        self.assertEqual(samples, [b.sample() for _ in range(5)])
+        self.assertTrue(all(s >= 0.001 for s in samples))
+
+
+class MockClientTest(unittest.TestCase):
+    def test_order_manager_against_simulated_book(self):
+        client = MockBinanceClient(latency=LatencyModel(0, seed=1))
+        order_mgr = OrderManager(client)
+        resting = order_mgr.place_limit_order('BTCUSDT', 'SELL', 0.5, 30000.5)
+        self.assertEqual(resting['status'], 'NEW')
+        fill = order_mgr.place_market_order('BTCUSDT', 'BUY', 0.2)
+        self.assertEqual(fill['avgPrice'], '30000.5')
+
+        self.assertEqual(client.futures_get_order(symbol='BTCUSDT', orderId=resting['orderId'])['executedQty'],
+                         '0.2')
+        self.assertEqual(len(client.futures_get_open_orders(symbol='BTCUSDT')), 1)
+        client.futures_cancel_order(symbol='BTCUSDT', orderId=resting['orderId'])
+        self.assertEqual(client.futures_get_open_orders(), [])
+        with self.assertRaises(Exception) as ctx:
+            client.futures_cancel_order(symbol='BTCUSDT', orderId=resting['orderId'])
+        self.assertEqual(ctx.exception.code, -2011)
+
+    def test_depth_snapshot_feeds_market_data(self):
+        client = MockBinanceClient()
+        client.futures_create_order(symbol='ETHUSDT', side='BUY', type='LIMIT', quantity='1', price='1999.5')
+        client.futures_create_order(symbol='ETHUSDT', side='SELL', type='LIMIT', quantity='2', price='2000')
+        market_data = MarketData.for_client(client)
+        market_data.load_snapshot('ETHUSDT', market_data.snapshot_fetcher('ETHUSDT'))
+        self.assertEqual(market_data.best_bid('ETHUSDT'), (1999.5, 1.0))
+        self.assertEqual(market_data.best_ask('ETHUSDT'), (2000.0, 2.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+from bot.client import MockBinanceClient
+from bot.user_data import UserDataStore, UserDataStream
+
+
+def order_update(order_id, status, filled='0', update_time=1, symbol='BTCUSDT', execution='NEW'):
+    return {'e': 'ORDER_TRADE_UPDATE', 'E': update_time, 'T': update_time,
+            'o': {'s': symbol, 'c': f'c-{order_id}', 'S': 'BUY', 'o': 'LIMIT', 'f': 'GTC', 'q': '0.010',
+                  'p': '30000', 'ap': '0', 'x': execution, 'X': status, 'i': order_id, 'l': '0',
+                  'z': filled, 'T': update_time}}
+
+
+def account_update(event_time, wallet, position_amt, symbol='BTCUSDT'):
+    return {'e': 'ACCOUNT_UPDATE', 'E': event_time, 'T': event_time,
+            'a': {'m': 'ORDER',
+                  'B': [{'a': 'USDT', 'wb': wallet, 'cw': wallet, 'bc': '0'}],
+                  'P': [{'s': symbol, 'pa': position_amt, 'ep': '30000', 'cr': '0', 'up': '0',
+                         'mt': 'cross', 'iw': '0', 'ps': 'BOTH'}]}}
+
+
+class LocalUserStream:
+    """
+    Websocket stand-in: each connection replays the next recorded batch and
+    closes; the last batch's connection stays open
+    """
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.paths = []
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._stop.set_result, None)
+        self._thread.join(5)
+
+    def _run(self):
+        import websockets
+
+        async def handler(connection):
+            self.paths.append(connection.request.path)
+            for event in self.batches.pop(0) if self.batches else []:
+                await connection.send(json.dumps(event))
+            if not self.batches:
+                await connection.wait_closed()
+
+        async def main():
+            self._stop = asyncio.get_running_loop().create_future()
+            async with websockets.serve(handler, '127.0.0.1', 0) as server:
+                self.url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}/ws"
+                self._ready.set()
+                await self._stop
+
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(main())
+        self._loop.close()
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class UserDataStoreTest(unittest.TestCase):
+    def test_order_lifecycle_and_stale_events(self):
+        store = UserDataStore()
+        store.on_message(order_update(1, 'NEW', update_time=10))
+        store.on_message(order_update(1, 'PARTIALLY_FILLED', '0.004', 20, execution='TRADE'))
+        # a late duplicate of the first event must not roll the order back
+        store.on_message(order_update(1, 'NEW', update_time=10))
+        self.assertEqual(store.get_order(1)['status'], 'PARTIALLY_FILLED')
+        self.assertEqual(store.get_order(client_order_id='c-1')['executedQty'], '0.004')
+        self.assertEqual(len(store.open_orders('BTCUSDT')), 1)
+
+        store.on_message(json.dumps(order_update(1, 'FILLED', '0.010', 30, execution='TRADE')))
+        self.assertEqual(store.open_orders(), [])
+        self.assertEqual(store.fills, 2)
+
+        store.on_message(account_update(40, '1000.5', '0.010'))
+        store.on_message(account_update(35, '999', '0'))
+        self.assertEqual(store.balance('USDT')['walletBalance'], '1000.5')
+        self.assertEqual(store.position('BTCUSDT')['positionAmt'], '0.010')
+
+    def test_finished_orders_are_bounded(self):
+        store = UserDataStore(max_closed=2)
+        for order_id in range(5):
+            store.on_message(order_update(order_id, 'FILLED', '0.010', order_id + 1))
+        self.assertEqual(sorted(store.orders), [3, 4])
+        self.assertIsNone(store.get_order(client_order_id='c-0'))
+
+    def test_snapshot_drops_orders_that_closed_while_offline(self):
+        store = UserDataStore()
+        store.on_message(order_update(1, 'NEW'))
+        store.on_message(order_update(2, 'NEW'))
+        store.load_snapshot({'assets': [{'asset': 'USDT', 'walletBalance': '50', 'crossWalletBalance': '50'}],
+                             'positions': []},
+                            [{'orderId': 2, 'clientOrderId': 'c-2', 'symbol': 'BTCUSDT', 'status': 'NEW'}])
+        self.assertIsNone(store.get_order(1))
+        self.assertEqual([o['orderId'] for o in store.open_orders()], [2])
+        self.assertEqual(store.account_info()['assets'][0]['walletBalance'], '50')
+        self.assertTrue(store.synced)
+
+
+class UserDataStreamTest(unittest.TestCase):
+    def test_stream_resyncs_after_disconnect_and_expiry(self):
+        client = MockBinanceClient()
+        resting = client.futures_create_order(symbol='BTCUSDT', side='BUY', type='LIMIT', timeInForce='GTC',
+                                              quantity='0.01', price='30000')
+        batches = [
+            [order_update(resting['orderId'], 'PARTIALLY_FILLED', '0.004', 10 ** 13, execution='TRADE')],
+            [{'e': 'listenKeyExpired', 'E': 1}],
+            [account_update(10 ** 13, '900', '0.004')],
+        ]
+        with LocalUserStream(batches) as server:
+            stream = UserDataStream(client, url=server.url, keepalive_interval=0.05, reconnect_delay=0.01)
+            stream.start()
+            try:
+                self.assertTrue(wait_for(lambda: stream.store.position('BTCUSDT') is not None))
+                # the third connection stays open: keepalives go out on its listen key
+                self.assertTrue(wait_for(lambda: stream.keepalives >= 1))
+            finally:
+                stream.stop()
+
+        self.assertEqual(server.paths, ['/ws/mock-listen-key-1', '/ws/mock-listen-key-2',
+                                        '/ws/mock-listen-key-3'])
+        store = stream.store
+        # the reconnects reloaded open orders from REST, so the mock's view wins over the replayed fill
+        self.assertEqual(store.get_order(resting['orderId'])['status'], 'NEW')
+        self.assertEqual(store.position('BTCUSDT')['positionAmt'], '0.004')
+        self.assertEqual(store.balance('USDT')['walletBalance'], '900')
+        self.assertIsNone(stream.listen_key)
+
+
+if __name__ == '__main__':
+    unittest.main()